@@ -52,7 +52,14 @@ from ._backends import (
     VISADevice,
     Win32ComDevice,
 )
-from ._data import CSVLogger, HDFLogger, SQLiteLogger, read, read_relational
+from ._data import (
+    CSVLogger,
+    HDFLogger,
+    ParquetLogger,
+    SQLiteLogger,
+    read,
+    read_relational,
+)
 from ._device import Device, list_devices, trait_info
 from ._host import Email
 from ._rack import (
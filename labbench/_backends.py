@@ -1027,6 +1027,7 @@ class VISADevice(Device):
         to be invoked.
         """
         self._opc = False
+        self._deferred = None
 
         self.backend = self._get_rm().open_resource(
             self.resource,
@@ -1077,6 +1078,9 @@ class VISADevice(Device):
         Returns:
             None
         """
+        if self._deferred:
+            # send any pending deferred writes first, in the same message
+            msg = ";".join(self._pop_deferred() + [msg])
         if self._opc:
             msg = msg + ";*OPC"
         msg_out = repr(msg) if len(msg) < 1024 else f"({len(msg)} bytes)"
@@ -1092,6 +1096,9 @@ class VISADevice(Device):
         Arguments:
             msg: the SCPI message to send
         """
+        if self._deferred:
+            self._send_deferred()
+
         if timeout is not None:
             _to, self.backend.timeout = self.backend.timeout, timeout
 
@@ -1112,6 +1119,9 @@ class VISADevice(Device):
     def query_ascii_values(
         self, msg: str, type_, separator=",", container=list, delay=None, timeout=None
     ):
+        if self._deferred:
+            self._send_deferred()
+
         # pre debug
         if timeout is not None:
             _to, self.backend.timeout = self.backend.timeout, timeout
@@ -1174,9 +1184,73 @@ class VISADevice(Device):
         Arguments:
             scpi_key (str): the name of the parameter to set
             value (str): value to assign
-            name (str, None): name of the trait setting the key (or None to indicate no trait) (ignored)
+            name (str, None): name of the trait setting the key (or None to indicate no trait)
+        """
+        if self._deferred is not None:
+            # queue in a deferred_writes block; the last value for each key wins
+            self._deferred.pop(scpi_key, None)
+            self._deferred[scpi_key] = value, name
+        else:
+            self.write(f"{scpi_key} {value}")
+
+    def get_keys(self, scpi_keys, names=None):
+        """queries several parameters in one compound SCPI message.
+
+        The command message string is formatted as ';'.join(f'{scpi_key}?'), and the
+        reply is split on ';'. This is called automatically by `get_many` to query
+        property traits that are defined with 'key='.
+
+        Replies that themselves contain ';' cannot be split, and raise ValueError.
+
+        Arguments:
+            scpi_keys (list of str): the names of the parameters to query
+            names (list of str, None): names of the corresponding traits (or None)
+
+        Returns:
+            list of responses (str)
         """
-        self.write(f"{scpi_key} {value}")
+        if names is None:
+            names = [None] * len(scpi_keys)
+
+        if len(scpi_keys) == 1:
+            return [self.get_key(scpi_keys[0], names[0])]
+
+        for name in names:
+            if name is None:
+                continue
+            if not all(isinstance(v, str) for v in self._traits[name].remap.values()):
+                raise TypeError("VISADevice requires remap values to have type str")
+
+        msg = ";".join(f"{key}?" for key in scpi_keys)
+        replies = self.query(msg).rstrip().split(";")
+
+        if len(replies) != len(scpi_keys):
+            raise ValueError(
+                f"expected {len(scpi_keys)} replies separated by ';' to {repr(msg)}, "
+                f"but received {len(replies)}"
+            )
+
+        return [reply.strip() for reply in replies]
+
+    def set_keys(self, scpi_keys, values, names=None):
+        """writes one compound SCPI message to set several parameters.
+
+        The command message string is formatted as
+        ';'.join(f'{scpi_key} {value}'). This is called automatically by
+        `set_many` to set property traits that are defined with 'key='.
+
+        Arguments:
+            scpi_keys (list of str): the names of the parameters to set
+            values (list of str): the corresponding values
+            names (list of str, None): names of the corresponding traits (or None)
+        """
+        if self._deferred is not None:
+            if names is None:
+                names = [None] * len(scpi_keys)
+            for key, value, name in zip(scpi_keys, values, names):
+                self.set_key(key, value, name)
+        else:
+            self.write(";".join(f"{k} {v}" for k, v in zip(scpi_keys, values)))
 
     def wait(self):
         """sends '*WAI' to wait for all commands to complete before continuing"""
@@ -1214,6 +1288,64 @@ class VISADevice(Device):
         self._opc = False
         self.query("*OPC?", timeout=timeout)
 
+    @contextlib.contextmanager
+    def deferred_writes(self, opc=False, timeout=None):
+        """context manager that queues parameter writes by `set_key`, and sends
+        them together in one SCPI message on exit.
+
+        If the same key is set more than once, only the last value is sent.
+        The queued writes are sent early, in order, before any `query` or `write`
+        inside the block. They are discarded if the block raises an exception,
+        together with the cached values of the traits that set them.
+
+        Example::
+
+            with inst.deferred_writes(opc=True):
+                inst.center_frequency = 2.4e9
+                inst.span = 10e6
+                inst.center_frequency = 2.45e9
+
+            # sends 'FREQ:SPAN 10000000.0;FREQ:CENT 2450000000.0;*OPC', then '*OPC?'
+
+        Arguments:
+            opc: if True, send the queued writes in an `overlap_and_block` context
+            timeout: maximum time to wait for the '*OPC?' reply (if `opc` is True), or None to use `self.backend.timeout`
+        """
+        if self._deferred is not None:
+            # already deferred by an outer block
+            yield
+            return
+
+        self._deferred = {}
+
+        try:
+            yield
+        except BaseException:
+            if self._deferred:
+                count = len(self._deferred)
+                names = {name for _, name in self._deferred.values() if name is not None}
+                self._deferred.clear()
+                # the traits already cached the values that were never sent
+                self.invalidate_cache(*names)
+                self._logger.warning(f"discarded {count} deferred writes on exception")
+            raise
+        else:
+            if self._deferred and opc:
+                with self.overlap_and_block(timeout=timeout):
+                    self._send_deferred()
+            elif self._deferred:
+                self._send_deferred()
+        finally:
+            self._deferred = None
+
+    def _pop_deferred(self):
+        msgs = [f"{key} {value}" for key, (value, _) in self._deferred.items()]
+        self._deferred.clear()
+        return msgs
+
+    def _send_deferred(self):
+        self.write(";".join(self._pop_deferred()))
+
     class suppress_timeout(contextlib.suppress):
         """context manager that suppresses timeout exceptions on `write` or `query`.
 
@@ -167,8 +167,11 @@ class VISADevice(Device):
     ): ...
     def get_key(self, scpi_key, name: Any | None = ...): ...
     def set_key(self, scpi_key, value, name: Any | None = ...) -> None: ...
+    def get_keys(self, scpi_keys, names: Any | None = ...): ...
+    def set_keys(self, scpi_keys, values, names: Any | None = ...) -> None: ...
     def wait(self) -> None: ...
     def preset(self) -> None: ...
+    def deferred_writes(self, opc: bool = ..., timeout: Any | None = ...) -> None: ...
     def overlap_and_block(
         self, timeout: Any | None = ..., quiet: bool = ...
     ) -> Generator[(None, None, None,)]: ...
@@ -24,7 +24,9 @@
 # legally bundled with the code in compliance with the conditions of those
 # licenses.
 
-from contextlib import suppress, ExitStack, contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress, ExitStack, contextmanager, nullcontext
+from functools import partial
 from re import L
 from . import _device, _traits, _rack
 from ._device import Device
@@ -35,9 +37,15 @@ from . import _device as core
 from . import value
 from . import util
 import copy
+import bz2
+import csv
+import gzip
+import hashlib
 import inspect
 import io
+import itertools
 import json
+import lzma
 from numbers import Number
 import numpy as np
 import os
@@ -45,14 +53,148 @@ import pandas as pd
 from pathlib import Path
 import pickle
 import shutil
+import sqlite3
+import sys
 import tarfile
+import tempfile
+import time
+import uuid
+from threading import Lock, Thread
+from queue import Queue
 import warnings
+import zlib
 
 EMPTY = inspect._empty
 
 INSPECT_SKIP_FILES = _device.__file__, _traits.__file__, _rack.__file__, __file__
 
 
+# file name suffixes of the compression codecs supported for relational files
+COMPRESSION_SUFFIXES = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "xz": ".xz",
+    "zstd": ".zst",
+    "lz4": ".lz4",
+}
+
+
+def _import_codec(compression):
+    """import the optional package that implements `compression`"""
+    packages = dict(zstd=("zstandard", "zstandard"), lz4=("lz4.frame", "lz4"))
+    module_name, package_name = packages[compression]
+
+    try:
+        return __import__(module_name, fromlist=["_"])
+    except ImportError as e:
+        raise ImportError(
+            f"compression={repr(compression)} requires the '{package_name}' package"
+        ) from e
+
+
+class _LZ4Compressor:
+    """adapt the lz4 frame compressor to the compress()/flush() interface of zlib.compressobj"""
+
+    def __init__(self, level):
+        lz4_frame = _import_codec("lz4")
+        self._compressor = lz4_frame.LZ4FrameCompressor(compression_level=level or 0)
+        self._header = self._compressor.begin()
+
+    def compress(self, data):
+        out = self._header + self._compressor.compress(data)
+        self._header = b""
+        return out
+
+    def flush(self):
+        return self._header + self._compressor.flush()
+
+
+def _compressor(compression, level=None):
+    """Return a streaming compressor object with `compress(data)` and `flush()` methods.
+
+    Arguments:
+        compression: one of the keys of `COMPRESSION_SUFFIXES`
+        level: the compression level, or None for the default of the codec
+    """
+    if compression == "gzip":
+        return zlib.compressobj(-1 if level is None else level, wbits=31)
+    elif compression == "bz2":
+        return bz2.BZ2Compressor(9 if level is None else level)
+    elif compression == "xz":
+        return lzma.LZMACompressor(preset=level)
+    elif compression == "zstd":
+        zstandard = _import_codec("zstd")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+    elif compression == "lz4":
+        return _LZ4Compressor(level)
+    else:
+        raise ValueError(
+            f"compression must be one of {tuple(COMPRESSION_SUFFIXES)}, not {repr(compression)}"
+        )
+
+
+def _decompress(data, compression):
+    """Decompress the complete contents `data` of a file compressed with `compression`"""
+    if compression == "gzip":
+        return gzip.decompress(data)
+    elif compression == "bz2":
+        return bz2.decompress(data)
+    elif compression == "xz":
+        return lzma.decompress(data)
+    elif compression == "zstd":
+        # streamed frames do not record their content size, which ZstdDecompressor.decompress requires
+        return _import_codec("zstd").ZstdDecompressor().decompressobj().decompress(data)
+    elif compression == "lz4":
+        return _import_codec("lz4").decompress(data)
+    else:
+        raise ValueError(
+            f"compression must be one of {tuple(COMPRESSION_SUFFIXES)}, not {repr(compression)}"
+        )
+
+
+class CompressedFileIO(io.BufferedIOBase):
+    """Compress data on the fly as it is written into another binary stream.
+
+    Text is encoded as UTF-8. The underlying stream is closed after the
+    compressor is flushed on `close()`.
+    """
+
+    def __init__(self, raw, compression, level=None):
+        self.raw = raw
+        self.name = raw.name
+        self.mode = "wb"
+        self._compressor = _compressor(compression, level)
+        # number of uncompressed bytes written
+        self._pos = 0
+        super(CompressedFileIO, self).__init__()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        out = self._compressor.compress(data)
+        if out:
+            self.raw.write(out)
+        count = memoryview(data).nbytes
+        self._pos += count
+        return count
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        if self.closed:
+            return
+
+        try:
+            self.raw.write(self._compressor.flush())
+        finally:
+            self.raw.close()
+            super(CompressedFileIO, self).close()
+
+
 class MungerBase(core.Device):
     """Organize file output with a key in the root database.
 
@@ -66,10 +208,26 @@ class MungerBase(core.Device):
        text file;
     3. 1- or 2-D data is converted to a pandas Series or DataFrame, and
        dumped into a relational file defined by the extension set by
-       `nonscalar_file_type`
+       `nonscalar_file_type`. The binary formats 'npy' and 'arrow' are
+       instead written directly from the array data.
+
+    When `workers` is greater than 1, :meth:`batch` writes the relational
+    files for a list of rows concurrently in a pool of threads.
 
+    When `compression` is set, relational files written from arrays, text, and
+    sequences are compressed as they are written, and the codec suffix
+    (such as '.zst') is appended to the file name.
+
+    When `dedup` is True, relational data in rows are instead stored once
+    for each unique value, in a content-addressed store named by a hash of
+    the value in the `dedup_dirname` subdirectory. Each row that repeats
+    the value refers to the same file. The index of hashes to files is
+    saved on close, and reused by later runs that append to the same data.
     """
 
+    # name of the file that indexes the content-addressed store by hash
+    dedup_index_name = "index.json"
+
     resource = value.Path(help="base directory for all data")
     text_relational_min = value.int(
         1024,
@@ -87,6 +245,45 @@ class MungerBase(core.Device):
         "csv", help="file format for non-scalar numerical data"
     )
     metadata_dirname = value.str("metadata", help="subdirectory name for metadata")
+    workers = value.int(
+        1, min=1, help="number of threads used to write relational files in each batch of rows"
+    )
+    dedup = value.bool(
+        False, help="store each unique relational value once in a content-addressed store"
+    )
+    dedup_dirname = value.str(
+        "objects", help="subdirectory name for the content-addressed store"
+    )
+    compression = value.str(
+        None,
+        allow_none=True,
+        only=tuple(COMPRESSION_SUFFIXES.keys()),
+        help="codec used to compress relational files as they are written, or None",
+    )
+    compression_level = value.int(
+        None, allow_none=True, help="compression level, or None for the default of the codec"
+    )
+
+    def open(self):
+        if self.compression is not None:
+            # fail early if the codec is not installed
+            _compressor(self.compression, self.compression_level)
+
+        self._dedup_lock = Lock()
+        # {hash: relational key}, loaded on the first deduplicated write
+        self._dedup_index = None
+
+    def close(self):
+        if getattr(self, "_dedup_index", None) is None:
+            return
+
+        index = {k: v for k, v in self._dedup_index.items() if isinstance(v, str)}
+
+        path = self._dedup_index_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump(index, f)
+        os.replace(path + ".tmp", path)
 
     def __call__(self, index, row):
         """
@@ -100,6 +297,53 @@ class MungerBase(core.Device):
             the row dictionary, replacing special entries with the relative path to the saved data file
         """
 
+        for name, value in row.items():
+            write = self._relational_writer(name, value)
+            if write is not None:
+                row[name] = write(name, value, index, row)
+
+        return row
+
+    def batch(self, index, rows):
+        """Munge a list of rows, in which the first row has index `index`.
+
+        The relational files for all rows are written concurrently in up to
+        `self.workers` threads. Each relational path is determined from a copy of its row
+        taken before munging, so the keys do not depend on the order of writes.
+
+        Arguments:
+            index: the index of the first row
+            rows: list of row dictionaries
+        Returns:
+            the list of munged row dictionaries
+        """
+        if self.workers <= 1:
+            return [self(index + i, row) for i, row in enumerate(rows)]
+
+        calls = {}
+        for i, row in enumerate(rows):
+            snapshot = dict(row)
+            for name, value in row.items():
+                write = self._relational_writer(name, value)
+                if write is not None:
+                    calls[i, name] = (write, name, value, index + i, snapshot)
+
+        if len(calls) == 0:
+            return rows
+
+        with ThreadPoolExecutor(min(self.workers, len(calls))) as executor:
+            futures = {key: executor.submit(*call) for key, call in calls.items()}
+
+        for (i, name), future in futures.items():
+            rows[i][name] = future.result()
+
+        return rows
+
+    def _relational_writer(self, name, value):
+        """Return the method that stores `value` in a relational file, or None
+        if it should be stored directly in the root table.
+        """
+
         def is_path(v):
             if not isinstance(v, str):
                 return False
@@ -108,29 +352,149 @@ class MungerBase(core.Device):
             except ValueError:
                 return False
 
-        for name, value in row.items():
-            if is_path(value):
-                # Path to a datafile to move into the dataset
-                row[name] = self._from_external_file(name, value, index, row)
+        if is_path(value):
+            # Path to a datafile to move into the dataset
+            return self._from_external_file
 
-            elif isinstance(value, (str, bytes)):
-                # A long string that should be written to a text file
-                if (
-                    len(value) > self.text_relational_min
-                    or name in self.force_relational
-                    or isinstance(value, bytes)
-                ):
-                    row[name] = self._from_text(name, value, index, row)
+        elif isinstance(value, (str, bytes)):
+            # A long string that should be written to a text file
+            if (
+                len(value) > self.text_relational_min
+                or name in self.force_relational
+                or isinstance(value, bytes)
+            ):
+                write = self._from_text
+            else:
+                return None
 
-            elif isinstance(value, (np.ndarray, pd.Series, pd.DataFrame)):
-                # vector, table, matrix, etc.
-                row[name] = self._from_ndarraylike(name, value, index, row)
+        elif isinstance(value, (np.ndarray, pd.Series, pd.DataFrame)):
+            # vector, table, matrix, etc.
+            write = self._from_ndarraylike
 
-            elif hasattr(value, "__len__") or hasattr(value, "__iter__"):
-                # tuple, list, or other iterable
-                row[name] = self._from_sequence(name, value, index, row)
+        elif isinstance(value, _host.LogRecords):
+            # host log records
+            write = self._from_log_records
 
-        return row
+        elif hasattr(value, "__len__") or hasattr(value, "__iter__"):
+            # tuple, list, or other iterable
+            write = self._from_sequence
+
+        else:
+            return None
+
+        if self.dedup:
+            return partial(self._from_deduplicated, write)
+        else:
+            return write
+
+    def _content_digest(self, write, value):
+        """Return a hex digest that identifies the file that `write` would produce
+        from `value`, or None if the value cannot be hashed.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(
+            f"{write.__name__} {self.nonscalar_file_type} {self.compression} {type(value).__name__}".encode()
+        )
+
+        if isinstance(value, np.ndarray):
+            if value.dtype.hasobject:
+                return None
+            h.update(f"{value.dtype.str} {value.shape}".encode())
+            h.update(np.ascontiguousarray(value).data)
+
+        elif isinstance(value, (pd.Series, pd.DataFrame)):
+            try:
+                hashed = pd.util.hash_pandas_object(value, index=True)
+            except TypeError:
+                # unhashable python objects
+                return None
+
+            if isinstance(value, pd.Series):
+                labels = value.name, value.dtype, value.index.names, value.index.dtype
+            else:
+                labels = (
+                    list(value.columns),
+                    list(value.dtypes),
+                    value.index.names,
+                    value.index.dtype,
+                )
+            h.update(repr(labels).encode())
+            h.update(hashed.values.tobytes())
+
+        elif isinstance(value, str):
+            h.update(value.encode("utf-8", "surrogatepass"))
+
+        elif isinstance(value, bytes):
+            h.update(value)
+
+        else:
+            try:
+                h.update(json.dumps(value).encode())
+            except (TypeError, ValueError):
+                return None
+
+        return h.hexdigest()
+
+    def _load_dedup_index(self):
+        """read the index of the content-addressed store saved by previous runs, keeping
+        only the entries with files that still exist
+        """
+        try:
+            with open(self._dedup_index_path(), "r") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            self._logger.warning("ignoring corrupted index of content-addressed data")
+            return {}
+
+        return {k: v for k, v in index.items() if self._has_object(v)}
+
+    def _from_deduplicated(self, write, name, value, index=0, row=None):
+        """Write `value` with `write` into the content-addressed store, unless the
+        same value has already been stored.
+
+        Returns:
+            the key to the file in the content-addressed store
+        """
+        digest = self._content_digest(write, value)
+        if digest is None:
+            return write(name, value, index, row)
+
+        with self._dedup_lock:
+            if self._dedup_index is None:
+                self._dedup_index = self._load_dedup_index()
+
+            entry = self._dedup_index.get(digest)
+            if entry is None:
+                # placeholder for other threads that write the same value while this one does
+                entry = self._dedup_index[digest] = Future()
+                owner = True
+            else:
+                owner = False
+
+        if isinstance(entry, str):
+            return entry
+        elif not owner:
+            return entry.result()
+
+        try:
+            key = write(name, value, index, row, digest=digest)
+        except BaseException as ex:
+            with self._dedup_lock:
+                del self._dedup_index[digest]
+            entry.set_exception(ex)
+            raise
+
+        with self._dedup_lock:
+            self._dedup_index[digest] = key
+        entry.set_result(key)
+
+        return key
+
+    def _object_relpath(self, filename):
+        """path to a file in the content-addressed store, relative to the root database"""
+        return os.path.join(self.dedup_dirname, filename[:2], filename)
 
     def save_metadata(self, name, key_func, **extra):
         def process_value(value, key_name):
@@ -164,7 +528,7 @@ class MungerBase(core.Device):
     def _write_metadata(self, metadata):
         raise NotImplementedError
 
-    def _from_ndarraylike(self, name, value, index=0, row=None):
+    def _from_ndarraylike(self, name, value, index=0, row=None, digest=None):
         """Write nonscalar (potentially array-like, or a python object) data
         to a file, and return a path to the file
 
@@ -172,6 +536,7 @@ class MungerBase(core.Device):
             name: name of the entry to write, used as the filename
             value: the object containing array-like data
             row: row dictionary, or None (the default) to write to the metadata folder
+            digest: if not None, write to the content-addressed store with this hash as the filename
         Returns:
             the path to the file, relative to the directory that contains the root database
         """
@@ -185,6 +550,10 @@ class MungerBase(core.Device):
                 pickle.dump(value, stream, 2)
             elif ext == "feather":
                 to_feather(value, stream)
+            elif ext == "npy":
+                np.save(stream, value, allow_pickle=False)
+            elif ext == "arrow":
+                to_arrow(value, stream)
             elif ext == "db":
                 raise Exception("sqlite not implemented for relational files")
             else:
@@ -198,29 +567,55 @@ class MungerBase(core.Device):
         else:
             ext = self.nonscalar_file_type
 
-        try:
-            value = pd.DataFrame(value)
-            if value.shape[0] == 0:
-                value = pd.DataFrame([value])
-        except BaseException:
-            # We couldn't make a DataFrame
-            self._logger.error(
-                f"Failed to form DataFrame from {repr(name)}; pickling object instead"
-            )
-            ext = "pickle"
-        finally:
-            if row is None:
-                stream = self._open_metadata(name + "." + ext, "wb")
-            else:
-                stream = self._open_relational(name + "." + ext, index, row, mode="wb")
+        if ext == "npy" and isinstance(value, (pd.Series, pd.DataFrame)):
+            # npy has no place for the index and column labels
+            ext = "arrow"
 
-            # Workaround for bytes/str encoding quirk underlying pandas 0.23.1
+        if ext == "npy":
+            value = np.asarray(value)
+            if value.dtype.hasobject:
+                self._logger.error(
+                    f"{repr(name)} is not a numerical array; pickling object instead"
+                )
+                ext = "pickle"
+
+        elif ext == "arrow":
             try:
-                write(stream, ext, value)
-            except TypeError:
-                with io.TextIOWrapper(stream, newline="\n") as buf:
-                    write(buf, ext, value)
-            return self._get_key(stream)
+                value = _arrow_table(value)
+            except BaseException:
+                self._logger.error(
+                    f"Failed to form an arrow table from {repr(name)}; pickling object instead"
+                )
+                ext = "pickle"
+
+        else:
+            try:
+                value = pd.DataFrame(value)
+                if value.shape[0] == 0:
+                    value = pd.DataFrame([value])
+            except BaseException:
+                # We couldn't make a DataFrame
+                self._logger.error(
+                    f"Failed to form DataFrame from {repr(name)}; pickling object instead"
+                )
+                ext = "pickle"
+
+        if row is None:
+            stream = self._open_metadata(name + "." + ext, "wb")
+        else:
+            stream = self._open_data(name + "." + ext, index, row, "wb", digest)
+
+        # Workaround for bytes/str encoding quirk underlying pandas 0.23.1
+        try:
+            write(stream, ext, value)
+        except TypeError:
+            with io.TextIOWrapper(stream, newline="\n") as buf:
+                write(buf, ext, value)
+
+        if not stream.closed:
+            stream.close()
+
+        return self._get_key(stream)
 
     def _from_external_file(self, name, old_path, index=0, row=None, ntries=10):
         basename = os.path.basename(old_path)
@@ -231,7 +626,7 @@ class MungerBase(core.Device):
 
         return self._get_key(new_path)
 
-    def _from_text(self, name, value, index=0, row=None, ext=".txt"):
+    def _from_text(self, name, value, index=0, row=None, ext=".txt", digest=None):
         """Write a string data to a file
 
         Arguments:
@@ -239,14 +634,15 @@ class MungerBase(core.Device):
             value: the string to write to file
             row: the row to infer timestamp, or None to write to metadata
             ext: file extension
+            digest: if not None, write to the content-addressed store with this hash as the filename
         Returns:
             the path to the file, relative to the directory that contains the root database
         """
-        with self._open_relational(name + ext, index, row, "w") as f:
+        with self._open_data(name + ext, index, row, "w", digest) as f:
             f.write(value)
         return self._get_key(f)
 
-    def _from_sequence(self, name, value, index=0, row=None, ext=".json"):
+    def _from_sequence(self, name, value, index=0, row=None, ext=".json", digest=None):
         """Write a string data to a file
 
         Arguments:
@@ -254,13 +650,54 @@ class MungerBase(core.Device):
             value: the string to write to file
             row: the row to infer timestamp, or None to write to metadata
             ext: file extension
+            digest: if not None, write to the content-addressed store with this hash as the filename
         Returns:
             the path to the file, relative to the directory that contains the root database
         """
-        with self._open_relational(name + ext, index, row, mode="w") as f:
+        with self._open_data(name + ext, index, row, "w", digest) as f:
             json.dump(value, f, indent=True)  # f.write(bytes(value, encoding='utf-8'))
         return self._get_key(f)
 
+    def _from_log_records(self, name, value, index=0, row=None, ext=".ndjson", digest=None):
+        """Write host log records to a newline-delimited JSON file
+
+        Arguments:
+            name: name of the parameter (helps to determine file path)
+            value: the `LogRecords` to write to file
+            row: the row to infer timestamp, or None to write to metadata
+            ext: file extension
+            digest: if not None, write to the content-addressed store with this hash as the filename
+        Returns:
+            the path to the file, relative to the directory that contains the root database
+        """
+        if len(value) == 0:
+            return ""
+
+        with self._open_data(name + ext, index, row, "w", digest) as f:
+            f.write(value.to_ndjson())
+        return self._get_key(f)
+
+    def _open_data(self, filename, index, row, mode, digest=None):
+        """Open a relational file for a row, or a file in the content-addressed store if
+        `digest` is not None, applying compression if it is configured.
+        """
+        if digest is not None:
+            filename = digest + filename[filename.rfind(".") :]
+
+        if self.compression is None:
+            if digest is None:
+                return self._open_relational(filename, index, row, mode)
+            else:
+                return self._open_object(filename, mode)
+
+        filename += COMPRESSION_SUFFIXES[self.compression]
+        if digest is None:
+            raw = self._open_relational(filename, index, row, "wb")
+        else:
+            raw = self._open_object(filename, "wb")
+
+        return CompressedFileIO(raw, self.compression, self.compression_level)
+
     # The following methods need to be implemented in subclasses.
     def _get_key(self, buf):
         """Key to use for the relative data in the root database?
@@ -298,6 +735,23 @@ class MungerBase(core.Device):
 
         raise NotImplementedError
 
+    def _open_object(self, filename, mode):
+        """Open a stream / IO buffer for writing a file in the content-addressed store.
+
+        Returns:
+
+            an open buffer object for writing data
+        """
+        raise NotImplementedError
+
+    def _has_object(self, key):
+        """Whether the file with the relational `key` exists in the content-addressed store"""
+        raise NotImplementedError
+
+    def _dedup_index_path(self):
+        """Path on disk to the index of the content-addressed store"""
+        raise NotImplementedError
+
     def _import_from_file(self, old_path, dest):
         raise NotImplementedError
 
@@ -312,8 +766,7 @@ class MungeToDirectory(MungerBase):
             )
 
         relpath = self._make_path_heirarchy(index, row)
-        if not os.path.exists(relpath):
-            os.makedirs(relpath)
+        os.makedirs(relpath, exist_ok=True)
 
         return open(os.path.join(relpath, name), mode)
 
@@ -323,6 +776,17 @@ class MungeToDirectory(MungerBase):
             os.makedirs(dirpath)
         return open(os.path.join(dirpath, name), mode)
 
+    def _open_object(self, filename, mode):
+        path = os.path.join(self.resource, self._object_relpath(filename))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return open(path, mode)
+
+    def _has_object(self, key):
+        return os.path.exists(os.path.join(self.resource, key))
+
+    def _dedup_index_path(self):
+        return os.path.join(self.resource, self.dedup_dirname, self.dedup_index_name)
+
     def _get_key(self, stream):
         """Key to use for the relative data in the root database?
 
@@ -385,50 +849,87 @@ class MungeToDirectory(MungerBase):
             json.dump(v, stream, indent=True, sort_keys=True)
 
 
-class TarFileIO(io.BytesIO):
-    """For appending data into new files in a tarfile"""
+def _tar_data_offset(open_tarfile, tarinfo):
+    """returns the offset in the archive of the data of `tarinfo`, if it is added next
+    to `open_tarfile` with `addfile`"""
+    header = tarinfo.tobuf(open_tarfile.format, open_tarfile.encoding, open_tarfile.errors)
+    return open_tarfile.offset + len(header)
+
+
+class TarFileIO(io.BufferedIOBase):
+    """For appending data into new files in a tarfile.
+
+    Data are spooled in memory up to `max_size` bytes, and then in an anonymous
+    temporary file, so that large members do not need to be held in memory
+    before they are copied into the archive on `close()`.
+    """
 
-    def __init__(self, open_tarfile, relname, mode="w", overwrite=False):
-        #        self.tarbase = tarbase
-        #        self.tarname = tarname
+    def __init__(
+        self,
+        open_tarfile,
+        relname,
+        mode="w",
+        overwrite=False,
+        lock=None,
+        names=None,
+        max_size=1 << 20,
+        members=None,
+    ):
         self.tarfile = open_tarfile
-        self.overwrite = False
+        self.overwrite = overwrite
         self.name = relname
         self.mode = mode
+        # serializes appends to the tarfile when several threads are writing
+        self.lock = nullcontext() if lock is None else lock
+        # index of member names already in the tarfile
+        self.names = set(open_tarfile.getnames()) if names is None else names
+        # {name: (offset, size)} of the data of each member added to the tarfile, or None
+        self.members = members
+        self._spool = tempfile.SpooledTemporaryFile(max_size=max_size)
         super(TarFileIO, self).__init__()
 
     def __del__(self):
         try:
-            super(TarFileIO, self).close()
-        except ValueError:
+            self._spool.close()
+        except (ValueError, AttributeError):
             pass
 
         super(TarFileIO, self).__del__()
 
-    #    def write(self, data, encoding='ascii'):
-    #        if isinstance(data, str):
-    #            data = bytes(data, encoding=encoding)
-    #        super(TarFileIO,self).write(data)
-    #
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        return self._spool.write(data)
+
+    def tell(self):
+        return self._spool.tell()
 
     def close(self):
-        # First: dump the data into the tar file
-        #        tarpath = os.path.join(self.tarbase, self.tarname)
-        #        f = tarfile.open(tarpath, 'a')
+        if self.closed:
+            return
 
         try:
-            if not self.overwrite and self.name in self.tarfile.getnames():
-                raise IOError(f"{self.name} already exists in {self.tarfile.name}")
-
             tarinfo = tarfile.TarInfo(self.name)
-            tarinfo.size = self.tell()
+            tarinfo.size = self._spool.tell()
+            tarinfo.mtime = time.time()
+            self._spool.seek(0)
 
-            self.seek(0)
+            with self.lock:
+                if not self.overwrite and self.name in self.names:
+                    raise IOError(f"{self.name} already exists in {self.tarfile.name}")
 
-            self.tarfile.addfile(tarinfo, self)
+                offset = _tar_data_offset(self.tarfile, tarinfo)
+                self.tarfile.addfile(tarinfo, self._spool)
+                self.names.add(self.name)
+                if self.members is not None:
+                    self.members[self.name] = offset, tarinfo.size
 
         # Then make sure to close everything
         finally:
+            self._spool.close()
             super(TarFileIO, self).close()
 
 
@@ -439,19 +940,50 @@ class MungeToTar(MungerBase):
 
     tarname = "data.tar"
 
+    # suffix of the sidecar file that indexes member data (offset, size) in the tar file
+    index_suffix = ".index.json"
+
+    # relational files larger than this (in bytes) are spooled to disk before they are added to the tarfile
+    spool_size = 1 << 20
+
     def _open_relational(self, name, index, row, mode):
+        return self._open_member(self._relational_path(name, index, row), mode)
+
+    def _open_metadata(self, name, mode):
+        dirpath = os.path.join(self.metadata_dirname, name)
+        # metadata replaces that of previous runs, as in MungeToDirectory
+        return self._open_member(dirpath, mode, overwrite=True)
+
+    def _open_object(self, filename, mode):
+        # overwrite in case the index of the store was not saved by an interrupted run
+        return self._open_member(self._object_relpath(filename), mode, overwrite=True)
+
+    def _has_object(self, key):
+        return key in self._names
+
+    def _dedup_index_path(self):
+        # beside the tarfile, like the index of its members
+        return os.path.join(self.resource, f"{self.tarname}.{self.dedup_dirname}.json")
+
+    def _open_member(self, relpath, mode, overwrite=False):
+        return TarFileIO(
+            self.tarfile,
+            relpath,
+            mode=mode,
+            overwrite=overwrite,
+            lock=self._lock,
+            names=self._names,
+            max_size=self.spool_size,
+            members=self._members,
+        )
+
+    def _relational_path(self, name, index, row):
         if "host_time" not in row:
             self._logger.error(
                 "no timestamp yet from host yet; this shouldn't happen :("
             )
 
-        relpath = os.path.join(self.dirname_fmt.format(id=index, **row), name)
-
-        return TarFileIO(self.tarfile, relpath, mode=mode)
-
-    def _open_metadata(self, name, mode):
-        dirpath = os.path.join(self.metadata_dirname, name)
-        return TarFileIO(self.tarfile, dirpath, mode=mode)
+        return os.path.join(self.dirname_fmt.format(id=index, **row), name)
 
     def open(self):
 
@@ -459,10 +991,48 @@ class MungeToTar(MungerBase):
             with suppress(FileExistsError):
                 os.makedirs(self.resource)
         self.tarfile = tarfile.open(os.path.join(self.resource, self.tarname), "a")
+        self._lock = Lock()
+
+        # the index of member names is read once here, then updated as members are added
+        self._names = set(self.tarfile.getnames())
+        self._members = self._read_index()
 
     def close(self):
-        util.logger.warning("MungeToTar cleanup()")
         self.tarfile.close()
+        self._write_index()
+
+    def _read_index(self):
+        """returns the {name: (offset, size)} index of the existing members in the tarfile"""
+        tarpath = os.path.join(self.resource, self.tarname)
+
+        try:
+            with open(tarpath + self.index_suffix, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = None
+
+        if index is not None and index["tar_size"] == os.path.getsize(tarpath):
+            return {k: tuple(v) for k, v in index["members"].items()}
+
+        # a missing or out-of-date index is rebuilt from the headers that tarfile
+        # read on open; repeated names resolve to the last member, as in tarfile
+        return {
+            info.name: (info.offset_data, info.size)
+            for info in self.tarfile.getmembers()
+            if info.isfile()
+        }
+
+    def _write_index(self):
+        """write a sidecar json file that maps each file member name in the tarfile to its
+        (offset, size), so that readers can access members without scanning the archive.
+        The offsets of new members are recorded as they are added.
+        """
+        tarpath = os.path.join(self.resource, self.tarname)
+
+        index = dict(tar_size=os.path.getsize(tarpath), members=self._members)
+
+        with open(tarpath + self.index_suffix, "w") as f:
+            json.dump(index, f)
 
     def _get_key(self, buf):
         """Where is the file relative to the root database?
@@ -474,10 +1044,28 @@ class MungeToTar(MungerBase):
         """
         return buf.name
 
+    def _from_external_file(self, name, old_path, index=0, row=None, ntries=10):
+        dest = self._relational_path(os.path.basename(old_path), index, row)
+
+        self._import_from_file(old_path, dest)
+
+        return dest
+
     def _import_from_file(self, old_path, dest):
-        info = self.tar.gettarinfo(old_path)
-        info.name = dest
-        self.tar.addfile(old_path, info)
+        with self._lock:
+            if dest in self._names:
+                raise IOError(f"{dest} already exists in {self.tarfile.name}")
+
+            def index_member(tarinfo):
+                # called just before each member is added
+                self._names.add(tarinfo.name)
+                if tarinfo.isfile():
+                    offset = _tar_data_offset(self.tarfile, tarinfo)
+                    self._members[tarinfo.name] = offset, tarinfo.size
+                return tarinfo
+
+            # tarfile.add copies file contents in blocks, and recurses into directories
+            self.tarfile.add(old_path, arcname=dest, filter=index_member)
 
         @util.until_timeout(PermissionError, 5, delay=0.5)
         def remove():
@@ -510,14 +1098,21 @@ class MungeToTar(MungerBase):
 
 
 class Aggregator(util.Ownable):
-    """Passive aggregation of data from Device property trait and value traits traits, and from calls to methods in Rack instances"""
+    """Passive aggregation of data from Device property trait and value traits traits, and from calls to methods in Rack instances
+
+    Arguments:
+        concurrent_gets: if True, the "always" traits of each device are polled in a separate thread
+        with :func:`util.concurrently` on each call to `get()` (devices with `concurrency=False`
+        are polled sequentially in the calling thread)
+    """
 
     PERSISTENT_TRAIT_ROLES = (_traits.Trait.ROLE_VALUE,)
 
-    def __init__(self):
+    def __init__(self, concurrent_gets=False):
         # registry of names to use for trait owners
         self.name_map = {}
         self.trait_rules = dict(always={}, never={})
+        self.concurrent_gets = concurrent_gets
 
         # pending data
         self._pending_traits_volatile = (
@@ -571,18 +1166,24 @@ class Aggregator(util.Ownable):
             dictionary keyed on :func:`key` (defaults '{device name}_{state name}')
         """
 
+        if self.concurrent_gets:
+            polled = self._poll_concurrently()
+        else:
+            polled = {}
+
         for device, name in list(self.name_map.items()):
             # Perform gets for each property trait called out in self.trait_rules['always']
             if device in self.trait_rules["always"].keys():
-                for attr in self.trait_rules["always"][device]:
+                if device in polled:
+                    values = polled[device]
+                else:
+                    values = self._poll_device(device)
+
+                for attr, value in values.items():
                     if self.is_persistent_trait(device, attr):
-                        self._pending_traits_persistent[self.key(name, attr)] = getattr(
-                            device, attr
-                        )
+                        self._pending_traits_persistent[self.key(name, attr)] = value
                     else:
-                        self._pending_traits_volatile[self.key(name, attr)] = getattr(
-                            device, attr
-                        )
+                        self._pending_traits_volatile[self.key(name, attr)] = value
 
             # Remove keys corresponding with self.trait_rules['never']
             if device in self.trait_rules["never"].keys():
@@ -618,6 +1219,55 @@ class Aggregator(util.Ownable):
 
         return aggregated_output, aggregated_input
 
+    def _poll_device(self, device) -> dict:
+        """get each "always" trait of `device`, in the order they were observed"""
+        return {attr: getattr(device, attr) for attr in self.trait_rules["always"][device]}
+
+    def _poll_concurrently(self) -> dict:
+        """poll the "always" traits of each device that supports concurrency in
+        its own thread.
+
+        Returns:
+            dictionary of `{device: {attr: value}}`; devices that were not polled
+            here (`concurrency=False`, or no "always" traits) are omitted
+        """
+        calls = {}
+        for device, name in self.name_map.items():
+            if device not in self.trait_rules["always"]:
+                continue
+            if not getattr(device, "concurrency", True):
+                continue
+            calls[device] = util.Call(self._poll_device, device)
+
+        if len(calls) < 2:
+            # no threads needed
+            return {}
+
+        pending = self._pending_traits_persistent, self._pending_traits_volatile
+        prior_keys = [set(d) for d in pending]
+
+        # name each call with its index, since device names are not guaranteed to be identifiers
+        ret = util.concurrently(
+            **{f"poll_{i}": call for i, call in enumerate(calls.values())},
+            flatten=False,
+            nones=True,
+        )
+        polled = {device: ret[f"poll_{i}"] for i, device in enumerate(calls.keys())}
+
+        # change notifications from the polling threads arrive in the order that the threads
+        # finish. drop the new keys that get() is about to set, so that they are inserted in
+        # the same order as sequential gets
+        polled_keys = {
+            self.key(self.name_map[device], attr)
+            for device, values in polled.items()
+            for attr in values
+        }
+        for d, prior in zip(pending, prior_keys):
+            for k in (polled_keys & set(d)) - prior:
+                del d[k]
+
+        return polled
+
     def key(self, device_name, state_name):
         """Generate a name for a trait based on the names of
         a device and one of its states or value traits.
@@ -878,6 +1528,45 @@ class Aggregator(util.Ownable):
         return ret
 
 
+def _snapshot(value):
+    """return a version of `value` that is isolated from later changes made through `value`
+    itself, avoiding copies of array data where possible.
+
+    Arrays that own their data are frozen in place, which does not protect them from writes
+    through views of them that already exist.
+    """
+    if isinstance(value, np.ndarray):
+        if not value.flags.owndata:
+            # freezing a view would not protect it from writes through its base
+            value = value.copy()
+        value.flags.writeable = False
+        return value
+    elif isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.copy(deep=True)
+    elif value is None or isinstance(value, (str, bytes, Number, np.generic)):
+        # immutable
+        return value
+    else:
+        return copy.deepcopy(value)
+
+
+def _snapshot_dict(d):
+    return {k: _snapshot(v) for k, v in d.items()}
+
+
+def _row_nbytes(row):
+    """estimate the memory used by the array, table, and text data in a row dictionary"""
+    nbytes = 0
+    for value in row.values():
+        if isinstance(value, np.ndarray):
+            nbytes += value.nbytes
+        elif isinstance(value, (pd.Series, pd.DataFrame)):
+            nbytes += np.sum(value.memory_usage(index=False))
+        elif isinstance(value, (str, bytes)):
+            nbytes += len(value)
+    return int(nbytes)
+
+
 class RelationalTableLogger(
     Owner, util.Ownable, entry_order=(_host.Email, MungerBase, _host.Host)
 ):
@@ -900,12 +1589,25 @@ class RelationalTableLogger(
         metadata_dirname: The name of the subdirectory that should be used to store metadata (device connection parameters, etc.)
 
         tar: Whether to store the relational data within directories in a tar file, instead of subdirectories
+        relational_workers: the number of threads used to write relational files in each call to `write()`
         git_commit_in: perform a git commit on open() if the current
         directory is inside a git repo with this branch name
+        background: if True, `write()` queues each batch of rows to a dedicated writer thread instead of
+        munging and writing it in the calling thread
+        flush_rows: if not None, call `write()` automatically when this many rows are pending
+        flush_bytes: if not None, call `write()` automatically when the array, table, and text data in the pending rows reach this many bytes
+        flush_seconds: if not None, call `write()` automatically when a new row is added this many seconds after the oldest pending row
+        concurrent_gets: if True, poll the "always" traits of different devices concurrently in each new row
+        dedup: if True, store each unique relational value once in a content-addressed store, which is shared by the rows that repeat it
+        relational_compression: codec used to compress relational files as they are written ('gzip', 'bz2', 'xz', 'zstd', or 'lz4'), or None
+        relational_compression_level: compression level of `relational_compression`, or None for the default of the codec
     """
 
     index_label = "id"
 
+    # maximum number of batches queued for the background writer before write() blocks
+    BACKGROUND_QUEUE_SIZE = 8
+
     def __init__(
         self,
         path=None,
@@ -917,11 +1619,20 @@ class RelationalTableLogger(
         nonscalar_file_type="csv",
         metadata_dirname="metadata",
         tar=False,
+        relational_workers=1,
         git_commit_in=None,
+        background=False,
+        flush_rows=None,
+        flush_bytes=None,
+        flush_seconds=None,
+        concurrent_gets=False,
+        dedup=False,
+        relational_compression=None,
+        relational_compression_level=None,
         # **metadata
     ):
 
-        self.aggregator = Aggregator()
+        self.aggregator = Aggregator(concurrent_gets=concurrent_gets)
 
         super().__init__()
 
@@ -938,14 +1649,27 @@ class RelationalTableLogger(
             dirname_fmt=dirname_fmt,
             nonscalar_file_type=nonscalar_file_type,
             metadata_dirname=metadata_dirname,
+            workers=relational_workers,
+            dedup=dedup,
+            compression=relational_compression,
+            compression_level=relational_compression_level,
             # **metadata
         )
 
         self.last_row = 0
-        self.pending_output = []
-        self.pending_input = []
         self.path = Path(path)
         self._append = append
+        self._background = background
+        self._writer_thread = None
+        self._writer_exc_info = None
+        self._flush_thresholds = dict(
+            rows=flush_rows, bytes=flush_bytes, seconds=flush_seconds
+        )
+
+        # the number of automatic writes triggered by each flush threshold
+        self.flush_counts = dict(rows=0, bytes=0, seconds=0)
+
+        self.clear()
         self.set_row_preprocessor(None)
 
     def __copy__(self):
@@ -1022,73 +1746,154 @@ class RelationalTableLogger(
         in a separate file (as defined in :func:`set_path_format`), and the path
         to this file is stored in the table.
 
-        In order to write `self.pending_output` to disk, use :func:`self.write`.
+        In order to write `self.pending_output` to disk, use :func:`self.write`. This
+        is called automatically if the new row crosses a threshold set by the `flush_rows`,
+        `flush_bytes`, or `flush_seconds` arguments of the logger.
 
         :param bool copy=True: When `True` (the default), use a deep copy of `data` to avoid
         problems with overwriting references to data if `data` is reused during test. This takes some extra time; set to `False` to skip this copy operation.
+        Set to `'snapshot'` to avoid copying large arrays: numpy arrays that own their data are
+        frozen in place (`writeable=False`) and referenced instead, so that later attempts to modify them raise
+        an exception. Views of arrays and pandas objects are copied, and only containers like lists and
+        dicts are deep-copied. Freezing only protects an array from writes through that array object:
+        views of it that were created before `new_row` remain writeable, and writes through them
+        change the logged row.
 
         Returns:
             the dictionary representation of the row added to `self.pending_output`.
         """
         do_copy = kwargs.pop("copy", None)
 
+        if do_copy == "snapshot":
+            duplicate = _snapshot_dict
+        elif do_copy:
+            duplicate = copy.deepcopy
+        else:
+            duplicate = dict
+
         # Start with input arguments
         if len(args) == 1:
             #            if not isinstance(args[0], dict):
             #                raise TypeError('argument to append must be a dictionary')
-            row = copy.deepcopy(dict(args[0])) if do_copy else dict(args[0])
+            row = duplicate(dict(args[0]))
         elif len(args) == 0:
             row = {}
 
         # Pull in observed states
         aggregated_output, aggregated_input = self.aggregator.get()
         if do_copy:
-            aggregated_output = copy.deepcopy(aggregated_output)
+            aggregated_output = duplicate(aggregated_output)
         row.update(aggregated_output)
 
         # Pull in keyword arguments
-        if do_copy:
-            kwargs = copy.deepcopy(dict(kwargs))
-        else:
-            kwargs = dict(kwargs)
-        row.update(kwargs)
+        row.update(duplicate(dict(kwargs)))
 
         self._logger.debug(f"new data row has {len(row)} columns")
 
+        if len(self.pending_output) == 0:
+            self._pending_since = time.monotonic()
         self.pending_output.append(row)
         self.pending_input.append(aggregated_input)
+        self._pending_bytes += _row_nbytes(row)
+
+        self._auto_flush()
+
+    def _auto_flush(self):
+        """call `write()` if the pending rows cross any of the flush thresholds"""
+        thresholds = self._flush_thresholds
+
+        if thresholds["rows"] is not None and len(self.pending_output) >= thresholds["rows"]:
+            reason = "rows"
+        elif thresholds["bytes"] is not None and self._pending_bytes >= thresholds["bytes"]:
+            reason = "bytes"
+        elif (
+            thresholds["seconds"] is not None
+            and time.monotonic() - self._pending_since >= thresholds["seconds"]
+        ):
+            reason = "seconds"
+        else:
+            return
+
+        self._logger.debug(f"automatic write triggered by pending {reason}")
+        self.flush_counts[reason] += 1
+        self.write()
 
     def write(self):
         """Commit any pending rows to the root database, converting
         non-scalar data to data files, and replacing their dictionary value
         with the relative path to the data file.
 
+        If the logger was created with `background=True`, the rows are
+        instead queued for the writer thread, and this blocks only if the
+        queue is full. An exception raised by the writer thread since the
+        last call is raised here.
+
         Returns:
 
             None
         """
+        self._raise_writer_exception()
+
         if len(self.pending_output) != len(self.pending_input):
             util.logger.warning('the input and output have mismatched length')
 
         count = max(len(self.pending_output), len(self.pending_input))
 
-        if count > 0:
-            proc = self._row_preprocessor
-
-            self.pending_output = [
-                self.munge(self.output_index + i, proc(row))
-                for i, row in enumerate(self.pending_output)
-            ]
-
+        if count == 0:
+            return
 
-            self.pending_input = [
-                self.munge(self.output_index + i, proc(row))
-                for i, row in enumerate(self.pending_input)
-            ]
+        batch = self.output_index, self.pending_output, self.pending_input
 
-            self.output_index += len(self.pending_output) - 1
-            self._write_root()
+        if self._writer_thread is None:
+            self._write_batch(*batch)
+            self.output_index += count
             self.clear()
+        else:
+            self.output_index += count
+            self.clear()
+            self._writer_queue.put(batch)
+
+    def _write_batch(self, index, outputs, inputs):
+        """munge a batch of rows starting at row `index`, and write them to the root database"""
+        proc = self._row_preprocessor
+
+        outputs = self.munge.batch(index, [proc(row) for row in outputs])
+        inputs = self.munge.batch(index, [proc(row) for row in inputs])
+
+        self._write_root(index, outputs, inputs)
+
+    def _background_writer(self):
+        """target of the writer thread: write each queued batch until receiving None"""
+        while True:
+            batch = self._writer_queue.get()
+
+            try:
+                if batch is None:
+                    return
+                self._write_batch(*batch)
+            except BaseException:
+                self._logger.error("background write failed", exc_info=True)
+                if self._writer_exc_info is None:
+                    # keep the first exception until it is raised in the caller
+                    self._writer_exc_info = sys.exc_info()
+            finally:
+                self._writer_queue.task_done()
+
+    def _raise_writer_exception(self):
+        exc_info, self._writer_exc_info = self._writer_exc_info, None
+        if exc_info is not None:
+            raise exc_info[1].with_traceback(exc_info[2])
+
+    def _flush(self):
+        """write any pending rows, and wait until the background writer has finished writing
+        them (if it is running)
+        """
+        self.write()
+
+        if self._writer_thread is not None:
+            self._writer_queue.join()
+
+        self._raise_writer_exception()
 
     @contextmanager
     @util.hide_in_traceback
@@ -1105,8 +1910,13 @@ class RelationalTableLogger(
             self.new_row(*args, **kws)
             self.write()
 
-    def _write_root(self):
-        """Write pending data. This must be implemented by inheriting classes.
+    def _write_root(self, index, outputs, inputs):
+        """Write a batch of munged rows. This must be implemented by inheriting classes.
+
+        Arguments:
+            index: the row index of the first row in the batch
+            outputs: list of output row dictionaries
+            inputs: list of input row dictionaries
 
         Returns:
             None
@@ -1117,19 +1927,21 @@ class RelationalTableLogger(
         """Remove any queued data that has been added by append."""
         self.pending_output = []
         self.pending_input = []
+        self._pending_bytes = 0
+        self._pending_since = None
 
     def set_relational_file_format(self, format):
         """Set the format to use for relational data files.
 
         Arguments:
-            format (str): one of 'csv', 'json', 'feather', or 'pickle'
+            format (str): one of 'csv', 'json', 'feather', 'pickle', 'npy', or 'arrow'
         """
         warnings.warn(
             """set_nonscalar_file_type is deprecated; set when creating
                          the database object instead with the nonscalar_output flag"""
         )
 
-        if format not in ("csv", "json", "feather", "pickle", "db"):
+        if format not in ("csv", "json", "feather", "pickle", "npy", "arrow", "db"):
             raise Exception(f"relational file data format {format} not supported")
         self.munge.nonscalar_file_type = format
 
@@ -1181,13 +1993,29 @@ class RelationalTableLogger(
         self.clear()
 
         self.output_index = 0
+
+        if self._background:
+            self._writer_exc_info = None
+            self._writer_queue = Queue(self.BACKGROUND_QUEUE_SIZE)
+            self._writer_thread = Thread(
+                target=self._background_writer, name=f"{self} writer", daemon=True
+            )
+            self._writer_thread.start()
+
         self._logger.debug(f"{self} is open")
         return self
 
     def close(self):
         self.aggregator.disable()
-        # try:
-        self.write()
+
+        try:
+            self._flush()
+        finally:
+            if self._writer_thread is not None:
+                self._writer_queue.put(None)
+                self._writer_thread.join()
+                self._writer_thread = None
+
         if self.output_index > 0:
             self.munge.save_metadata(
                 self.aggregator.name_map,
@@ -1215,12 +2043,16 @@ class CSVLogger(RelationalTableLogger):
         nonscalar_file_type: The data type to use in non-scalar (tabular, vector, etc.) relational data
         metadata_dirname: The name of the subdirectory that should be used to store metadata (device connection parameters, etc.)
         tar: Whether to store the relational data within directories in a tar file, instead of subdirectories
+        background: Whether to munge and write rows in a dedicated writer thread
+        flush_rows, flush_bytes, flush_seconds: thresholds on the pending rows that trigger `write()` automatically
+        concurrent_gets: Whether to poll the "always" traits of different devices concurrently
+        dedup: Whether to store each unique relational value once in a content-addressed store
+        relational_compression, relational_compression_level: codec and level used to compress relational files as they are written
     """
 
     ROOT_FILE_NAME = OUTPUT_FILE_NAME = "outputs.csv"
     INPUT_FILE_NAME = "inputs.csv"
     output_index = 0
-    tables = {}
 
     nonscalar_file_type = "csv"
 
@@ -1239,9 +2071,12 @@ class CSVLogger(RelationalTableLogger):
         the file is closed when exiting the `with` block, even if there
         is an exception.
         """
-        self.tables = {}
+        # the root tables are streamed: each file stays open for appending,
+        # and only the column names (the schema) are kept in memory
+        self._streams = {}
+        self._columns = {}
 
-        self.path.mkdir(parents=True, exist_ok=self._append)
+        self.path.mkdir(parents=True, exist_ok=True)
 
         for file_name in self.OUTPUT_FILE_NAME, self.INPUT_FILE_NAME:
             file_path = self.path / file_name
@@ -1255,46 +2090,141 @@ class CSVLogger(RelationalTableLogger):
 
             if self._append and file_path.stat().st_size > 0:
                 # there's something here and we plan to append
-                self.tables[file_name] = pd.read_csv(file_path, nrows=1)
-                self.tables[file_name].index.name = self.index_label
-                self.output_index = len(self.tables[file_name])
+                with open(file_path, "r", newline="") as f:
+                    reader = csv.reader(f)
+                    self._columns[file_name] = next(reader)
+                    row_count = sum(1 for _ in reader)
+
+                if file_name == self.OUTPUT_FILE_NAME:
+                    self.output_index = row_count
             else:
-                self.tables[file_name] = None
-                self.output_index = 0
+                self._columns[file_name] = []
+
+            self._streams[file_name] = open(file_path, "a", newline="")
 
     def close(self):
-        self._write_root()
+        try:
+            # munge and write any pending rows while the streams are still open
+            self._flush()
+        finally:
+            for stream in self._streams.values():
+                stream.close()
+            self._streams = {}
 
-    def _write_root(self):
-        """Write queued rows of data to csv. This is called automatically on :func:`close`, or when
+    def _write_root(self, index, outputs, inputs):
+        """Append queued rows of data to the csv files. This is called automatically on :func:`close`, or when
         exiting a `with` block.
 
-        If the class was created with overwrite=True, then the first call to _write_root() will overwrite
-        the preexisting file; subsequent calls append.
+        Only the pending rows are written on each call. When the pending rows
+        introduce new columns, the header of the existing file is rewritten to
+        include them; previously written rows are left with empty values in
+        the new columns.
         """
 
-        def append_csv(path_to_csv, df):
-            if len(df) == 0:
+        def append_csv(file_name, rows):
+            if len(rows) == 0:
                 return
-            isfirst = self.tables.get(path_to_csv.name,None) is None
-            pending = pd.DataFrame(df)
-            pending.index.name = self.index_label
-            pending.index = pending.index + self.output_index
 
-            if isfirst:
-                self.tables[path_to_csv.name] = pending
-            else:
-                self.tables[path_to_csv.name] = self.tables[path_to_csv.name].append(pending).loc[self.output_index :]
-            self.tables[path_to_csv.name].sort_index(inplace=True)
-            self.output_index = self.tables[path_to_csv.name].index[-1]
+            columns = self._columns[file_name]
+            known = set(columns)
+            new_columns = []
+            for row in rows:
+                for k in row.keys():
+                    if k not in known:
+                        known.add(k)
+                        new_columns.append(k)
+
+            stream = self._streams[file_name]
+
+            if len(columns) == 0:
+                columns.extend(new_columns)
+                csv.writer(stream).writerow(columns)
+            elif len(new_columns) > 0:
+                self._logger.debug(
+                    f"adding columns {new_columns} to {repr(file_name)}"
+                )
+                columns.extend(new_columns)
+                stream = self._rewrite_header(file_name)
+
+            writer = csv.DictWriter(stream, fieldnames=columns, restval="")
+            writer.writerows(rows)
+            stream.flush()
+
+        append_csv(self.OUTPUT_FILE_NAME, outputs)
+        append_csv(self.INPUT_FILE_NAME, inputs)
+
+    def _rewrite_header(self, file_name):
+        """Replace the header line of the csv file with the current list of
+        columns, and return the reopened stream for appending.
+        """
+        file_path = self.path / file_name
+        tmp_path = file_path.with_name(file_path.name + ".tmp")
+
+        self._streams[file_name].close()
+
+        with open(file_path, "r", newline="") as fin, open(
+            tmp_path, "w", newline=""
+        ) as fout:
+            # skip the old header, then copy the body without parsing it
+            fin.readline()
+            csv.writer(fout).writerow(self._columns[file_name])
+            shutil.copyfileobj(fin, fout)
 
-            self.path.mkdir(exist_ok=True, parents=True)
+        os.replace(tmp_path, file_path)
 
-            with open(path_to_csv, "a") as f:
-                self.tables[path_to_csv.name].to_csv(f, header=isfirst, index=False)
+        self._streams[file_name] = open(file_path, "a", newline="")
+        return self._streams[file_name]
+
+
+def _hdf_field_dtype(values):
+    """the numpy dtype for a field of the HDF root table that contains `values`"""
+    import h5py
+
+    present = [v for v in values if v is not None]
+    missing = len(present) < len(values)
+
+    if len(present) == 0:
+        return np.dtype("f8")
+    elif all(isinstance(v, (bool, np.bool_)) for v in present):
+        return np.dtype("f8" if missing else "?")
+    elif all(
+        isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_))
+        for v in present
+    ):
+        return np.dtype("f8" if missing else "i8")
+    elif all(
+        isinstance(v, (Number, np.number)) and not isinstance(v, (complex, np.complexfloating))
+        for v in present
+    ):
+        return np.dtype("f8")
+    else:
+        return h5py.string_dtype()
+
+
+def _promote_hdf_dtype(a, b):
+    """the dtype of a field of the HDF root table that can hold values of dtypes `a` and `b`"""
+    import h5py
+
+    if a == b:
+        return a
+    elif h5py.check_string_dtype(a) or h5py.check_string_dtype(b):
+        return h5py.string_dtype()
+    elif np.dtype("f8") in (a, b):
+        return np.dtype("f8")
+    else:
+        # bool and int
+        return np.dtype("i8")
 
-        append_csv(self.path / self.OUTPUT_FILE_NAME, self.pending_output)
-        append_csv(self.path / self.INPUT_FILE_NAME, self.pending_input)
+
+def _hdf_fill_value(dtype):
+    import h5py
+
+    if h5py.check_string_dtype(dtype):
+        return ""
+    elif dtype.kind == "f":
+        return np.nan
+    else:
+        return 0
 
 
 class MungeToHDF(Device):
@@ -1307,12 +2237,12 @@ class MungeToHDF(Device):
     1. Text containing a valid file or directory *outside* of the root data
        directory is made relational by moving the file or directory into
        the current row. The text is replaced with the updated relative path;
-    2. Text longer than `text_relational_min` is dumped into a relational
-       text file;
-    3. 1- or 2-D data is converted to a pandas Series or DataFrame, and
-       dumped into a relational file defined by the extension set by
-       `nonscalar_file_type`
+    2. If `stack_arrays` is True, 1-D numerical arrays are appended as a row
+       of a resizable 2-D dataset named for the column, as long as their length
+       matches the previous arrays;
+    3. Other non-scalar data is stored in a chunked dataset with its own key.
 
+    All data are written through a single `h5py.File` that stays open until `close()`.
     """
 
     resource = value.Path(help="hdf file location")
@@ -1320,11 +2250,31 @@ class MungeToHDF(Device):
         "{id} {host_time}",
         help="format for linked data in the root database (keyed on column)",
     )
+    compression = value.str(
+        None, allow_none=True, help="h5py compression filter for array datasets, like 'gzip' or 'lzf'"
+    )
+    stack_arrays = value.bool(
+        True,
+        help="whether to append 1-D arrays of matching length to one resizable 2-D dataset per column",
+    )
+
+    # HDF group that contains the resizable datasets of stacked arrays
+    STACK_GROUP = "arrays"
+
+    # number of rows in each chunk of resizable datasets
+    CHUNK_ROWS = 64
 
     def open(self):
         import h5py
 
-        self.backend = h5 = h5py.File(self.resource, "a")
+        os.makedirs(os.path.dirname(os.path.abspath(self.resource)), exist_ok=True)
+
+        try:
+            # without file locking, readers can open the file while the run is in progress
+            self.backend = h5py.File(self.resource, "a", locking=False)
+        except TypeError:
+            # h5py < 3.5
+            self.backend = h5py.File(self.resource, "a")
 
     def close(self):
         self.backend.close()
@@ -1371,60 +2321,147 @@ class MungeToHDF(Device):
 
         return row
 
+    def batch(self, index, rows):
+        """Munge a list of rows, in which the first row has index `index`.
+
+        Arguments:
+            index: the index of the first row
+            rows: list of row dictionaries
+        Returns:
+            the list of munged row dictionaries
+        """
+        return [self(index + i, row) for i, row in enumerate(rows)]
+
     def save_metadata(self, name, key_func, **extra):
         def process_value(value, key_name):
-            if isinstance(value, (str, bytes)):
+            if isinstance(value, (str, bytes, Number)):
                 return value
+            elif value is None:
+                return ""
             elif hasattr(value, "__len__") or hasattr(value, "__iter__"):
                 if not hasattr(value, "__len__") or len(value) > 0:
-                    self._from_nonscalar(key_name, value)
+                    return self._from_nonscalar(key_name, value)
                 else:
                     return ""
             else:
-                return value
+                return str(value)
 
         summary = dict(extra)
         for owner, owner_name in name.items():
-            if owner_name.endswith("_values"):
-                for trait in owner:
-                    summary[key_func(owner_name, trait.name)] = getattr(
-                        owner, trait.name
+            for trait_name, trait in owner._traits.items():
+                if trait.role == _traits.Trait.ROLE_VALUE or trait.cache:
+                    summary[key_func(owner_name, trait_name)] = getattr(
+                        owner, trait_name
                     )
-        summary = {k: process_value(v, k) for k, v in summary.items()}
 
-        metadata = pd.DataFrame([summary], index=["Value"]).T
-        metadata.astype(str).to_hdf(self.resource, key="metadata", append=True)
+        # the summary is stored as attributes of the metadata group
+        group = self.backend.require_group("metadata")
+        for k, v in summary.items():
+            v = process_value(v, k)
+            group.attrs[k] = str(v) if isinstance(v, Path) else v
 
     def _from_nonscalar(self, name, value, index=0, row=None):
         """Write nonscalar (potentially array-like, or a python object) data
-        to a file, and return a path to the file
+        to a dataset, and return its key
 
         Arguments:
             name: name of the entry to write, used as the filename
             value: the object containing array-like data
-            row: row dictionary, or None (the default) to write to the metadata folder
+            row: row dictionary, or None (the default) to write to the metadata group
         Returns:
-            the path to the file, relative to the directory that contains the root database
+            the key of the dataset in the hdf file
         """
 
-        key = self._get_key(name, index, row)
+        if hasattr(value, "__len__") and len(value) == 0:
+            return ""
 
-        try:
-            df = pd.DataFrame(value)
-            if df.shape[0] == 0:
-                df = pd.DataFrame([df])
-        except BaseException:
-            # We couldn't make a DataFrame
-            self._logger.error(
-                f"Failed to form DataFrame from {repr(name)}; pickling object instead"
-            )
-            self.backend[key] = pickle.dumps(value)
+        if isinstance(value, _host.LogRecords):
+            key = self._get_key(name, index, row)
+            self.backend[key] = value.to_ndjson()
+            return key
 
+        if row is not None and self.stack_arrays:
+            key = self._stack_array(name, value)
+            if key is not None:
+                return key
+
+        key = self._get_key(name, index, row)
+
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            data = value.to_numpy()
         else:
-            df.to_hdf(self.resource, key=key)
+            try:
+                data = np.asarray(value)
+            except ValueError:
+                # ragged sequences
+                data = np.empty(0, dtype=object)
+
+        if data.dtype.kind not in "biuf":
+            # other tables and sequences are stored as json text
+            try:
+                if isinstance(value, (pd.Series, pd.DataFrame)):
+                    self.backend[key] = value.to_json()
+                else:
+                    self.backend[key] = json.dumps(value)
+            except (TypeError, ValueError):
+                self._logger.error(
+                    f"{repr(name)} is not numerical or json serializable; pickling object instead"
+                )
+                self.backend[key] = np.void(pickle.dumps(value))
+            return key
+
+        dataset = self.backend.create_dataset(
+            key, data=data, chunks=True, compression=self.compression
+        )
+
+        # keep the labels of pandas objects
+        if isinstance(value, pd.DataFrame):
+            dataset.attrs["columns"] = [str(c) for c in value.columns]
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            index_values = value.index.to_numpy()
+            if index_values.dtype.kind in "biuf":
+                dataset.attrs["index"] = index_values
+            else:
+                dataset.attrs["index"] = [str(i) for i in index_values]
 
         return key
 
+    def _stack_array(self, name, value):
+        """Append a 1-D numerical array as a new row in the 2-D dataset for column `name`.
+
+        Returns:
+            key of the row in the form '/arrays/<name>[<row>]', or None if the array is
+            not compatible with the dataset
+        """
+        if not isinstance(value, np.ndarray) or value.ndim != 1:
+            return None
+        if value.dtype.kind not in "biuf" or value.size == 0:
+            return None
+
+        group = self.backend.require_group(self.STACK_GROUP)
+
+        if name in group:
+            dataset = group[name]
+            if dataset.shape[1] != value.size or not np.can_cast(
+                value.dtype, dataset.dtype
+            ):
+                return None
+        else:
+            dataset = group.create_dataset(
+                name,
+                shape=(0, value.size),
+                maxshape=(None, value.size),
+                dtype=value.dtype,
+                chunks=(self.CHUNK_ROWS, value.size),
+                compression=self.compression,
+            )
+
+        i = dataset.shape[0]
+        dataset.resize(i + 1, axis=0)
+        dataset[i] = value
+
+        return f"{dataset.name}[{i}]"
+
     def _from_external_file(self, name, old_path, index=0, row=None, ntries=10):
 
         with open(old_path, "rb") as f:
@@ -1437,7 +2474,9 @@ class MungeToHDF(Device):
             return "/" + self.key_fmt.format(id=index, **row) + " " + name
 
 
-class HDFLogger(RelationalTableLogger):
+class HDFLogger(
+    RelationalTableLogger, entry_order=(_host.Email, MungeToHDF, _host.Host)
+):
     """Store data and activity from value and property sets and gets to disk
     into a root database formatted as an HDF file.
 
@@ -1447,16 +2486,28 @@ class HDFLogger(RelationalTableLogger):
     #. custom metadata in each queued aggregate property trait entry; and
     #. custom response to non-scalar data (such as relational databasing).
 
+    The root tables are resizable compound datasets that are extended in place on each `write()`,
+    and the file is flushed after each write so that it can be read while the run is in progress.
+
     Arguments:
         path (str): Base path to use for the root database
         append (bool): Whether to append to the root database if it already exists (otherwise, raise IOError)
         key_fmt (str): format to use for keys in the h5
-
+        compression (str): h5py compression filter for array datasets, like 'gzip' or 'lzf', or None
+        stack_arrays (bool): Whether to store 1-D arrays of matching length as rows of one 2-D dataset per column
+        background: Whether to munge and write rows in a dedicated writer thread
+        flush_rows: if not None, call `write()` automatically when this many rows are pending
+        flush_bytes: if not None, call `write()` automatically when the data in the pending rows reach this many bytes
+        flush_seconds: if not None, call `write()` automatically when a new row is added this many seconds after the oldest pending row
+        concurrent_gets: Whether to poll the "always" traits of different devices concurrently
     """
 
     KEY_OUTPUT = 'output'
     KEY_INPUT = 'input'
 
+    # number of rows in each chunk of the root datasets
+    CHUNK_ROWS = 1024
+
     nonscalar_file_type = "csv"
 
     def __init__(
@@ -1465,7 +2516,14 @@ class HDFLogger(RelationalTableLogger):
         *,
         append=False,
         key_fmt="{id} {host_time}",
+        compression=None,
+        stack_arrays=True,
         git_commit_in=None,
+        background=False,
+        flush_rows=None,
+        flush_bytes=None,
+        flush_seconds=None,
+        concurrent_gets=False,
         # **metadata
     ):
         if str(path).endswith(".h5"):
@@ -1474,11 +2532,20 @@ class HDFLogger(RelationalTableLogger):
             path = Path(str(path) + ".h5")
 
         super().__init__(
-            path=path, append=append, git_commit_in=git_commit_in,
+            path=path,
+            append=append,
+            git_commit_in=git_commit_in,
+            background=background,
+            flush_rows=flush_rows,
+            flush_bytes=flush_bytes,
+            flush_seconds=flush_seconds,
+            concurrent_gets=concurrent_gets,
         )
 
         # Switch to the HDF munger
-        self.munge = MungeToHDF(path, key_fmt=key_fmt)
+        self.munge = MungeToHDF(
+            path, key_fmt=key_fmt, compression=compression, stack_arrays=stack_arrays
+        )
 
     def open(self):
         """Instead of calling `open` directly, consider using
@@ -1495,40 +2562,102 @@ class HDFLogger(RelationalTableLogger):
         the file is closed when exiting the `with` block, even if there
         is an exception.
         """
-        self.df = None
+        h5 = self.munge.backend
+
+        if self.KEY_OUTPUT in h5:
+            if not self._append:
+                raise IOError(
+                    f"root table already exists in '{self.path}', while append=False"
+                )
+            self.output_index = h5[self.KEY_OUTPUT].shape[0]
 
     def close(self):
-        self._write_root()
+        self._flush()
 
-    def _write_root(self):
-        """Write queued rows of data to csv. This is called automatically on :func:`close`, or when
+    def _write_root(self, index, outputs, inputs):
+        """Append queued rows of data to the root tables. This is called automatically on :func:`close`, or when
         exiting a `with` block.
 
-        If the class was created with overwrite=True, then the first call to _write_root() will overwrite
-        the preexisting file; subsequent calls append.
+        Only the new rows are written. New columns (or values that need a wider type)
+        rewrite the table once with the new fields.
         """
+        self._append_rows(self.KEY_OUTPUT, index, outputs)
+        self._append_rows(self.KEY_INPUT, index, inputs)
+        self.munge.backend.flush()
 
-        def write_table(key, data):
-            print('write table! ', key, data)
-            if len(data) == 0:
-                return
-            isfirst = self.df is None
-            pending = pd.DataFrame(data)
-            pending.index.name = self.index_label
-            pending.index += self.output_index
-            if isfirst:
-                print('first!')
-                self.df = pending
-            else:
-                print(self.df.columns, pending.columns)
-                self.df = self.df.append(pending).loc[self.output_index :]
-            self.df.sort_index(inplace=True)
-            self.output_index = self.df.index[-1]
+    def _append_rows(self, key, index, rows):
+        if len(rows) == 0:
+            return
+
+        h5 = self.munge.backend
+
+        names = list(dict.fromkeys(itertools.chain.from_iterable(rows)))
+        names = [n for n in names if n != self.index_label]
+        values = {n: [row.get(n, None) for row in rows] for n in names}
+        values[self.index_label] = list(range(index, index + len(rows)))
 
-            self.df.to_hdf(self.path, key=key, append=self._append)
+        batch_dtypes = {n: _hdf_field_dtype(v) for n, v in values.items()}
+        dataset = h5.get(key, None)
 
-        write_table(self.KEY_OUTPUT, self.pending_output)
-        write_table(self.KEY_INPUT, self.pending_input)
+        if dataset is None:
+            dataset = h5.create_dataset(
+                key,
+                shape=(0,),
+                maxshape=(None,),
+                dtype=np.dtype(list(batch_dtypes.items())),
+                chunks=(self.CHUNK_ROWS,),
+            )
+        else:
+            fields = {n: dataset.dtype.fields[n][0] for n in dataset.dtype.names}
+            for n, dt in batch_dtypes.items():
+                if n in fields:
+                    fields[n] = _promote_hdf_dtype(fields[n], dt)
+                elif dataset.shape[0] > 0 and dt.kind in "?i":
+                    # the rows already in the table need a missing value
+                    fields[n] = np.dtype("f8")
+                else:
+                    fields[n] = dt
+
+            if list(fields.items()) != [
+                (n, dataset.dtype.fields[n][0]) for n in dataset.dtype.names
+            ]:
+                self._logger.debug(f"adding or promoting fields in {repr(key)}")
+                dataset = self._rebuild_table(key, np.dtype(list(fields.items())))
+
+        data = np.empty(len(rows), dtype=dataset.dtype)
+        for n in dataset.dtype.names:
+            dt = dataset.dtype.fields[n][0]
+            fill = _hdf_fill_value(dt)
+            if n not in values:
+                data[n] = fill
+            elif dt.kind == "O":
+                data[n] = [fill if v is None else str(v) for v in values[n]]
+            else:
+                data[n] = [fill if v is None else v for v in values[n]]
+
+        start = dataset.shape[0]
+        dataset.resize(start + len(rows), axis=0)
+        dataset[start:] = data
+
+    def _rebuild_table(self, key, dtype):
+        """replace the root table at `key` with a copy that has the fields in `dtype`"""
+        h5 = self.munge.backend
+        old = h5[key][()]
+
+        new = np.empty(len(old), dtype=dtype)
+        for n in dtype.names:
+            dt = dtype.fields[n][0]
+            if n not in old.dtype.names:
+                new[n] = _hdf_fill_value(dt)
+            elif dt.kind == "O" and old.dtype.fields[n][0].kind != "O":
+                new[n] = old[n].astype(str)
+            else:
+                new[n] = old[n]
+
+        del h5[key]
+        return h5.create_dataset(
+            key, data=new, maxshape=(None,), chunks=(self.CHUNK_ROWS,)
+        )
 
 
 class SQLiteLogger(RelationalTableLogger):
@@ -1554,10 +2683,8 @@ class SQLiteLogger(RelationalTableLogger):
     ROOT_FILE_NAME = "root.db"
     OUTPUT_TABLE_NAME = "output"
     _columns = None
-    inprogress = {}
-    committed = {}
     output_index = 0
-    _engine = None
+    _connection = None
 
     def open(self):
         """Instead of calling `open` directly, consider using
@@ -1593,94 +2720,130 @@ class SQLiteLogger(RelationalTableLogger):
             if ex:
                 raise ex
 
-        #        if not self.path.lower().endswith('.db'):
-        #            self.path += '.db'
         os.makedirs(self.path, exist_ok=True)
         path = os.path.join(self.path, self.ROOT_FILE_NAME)
 
-        # Create an engine via sqlalchemy
-        from sqlalchemy import create_engine  # database connection
-
-        self._engine = create_engine("sqlite:///{}".format(path))
-
-        if os.path.exists(path):
-            if self._append:
-                # read the last row to 1) list the columns and 2) get index
-                query = f"select * from {self.OUTPUT_TABLE_NAME} order by {self.index_label} desc limit 1"
-
-                df = pd.read_sql_query(query, self._engine, index_col=self.index_label)
-                self._columns = df.columns
-                self.output_index = df.index[-1] + 1
-            else:
-                raise IOError(
-                    f"root table already exists at '{path}', but append=False"
-                )
+        if os.path.exists(path) and not self._append:
+            raise IOError(f"root table already exists at '{path}', but append=False")
+
+        # a single connection is held open for the duration of the run. WAL
+        # journaling with synchronous=NORMAL avoids an fsync on every commit
+        # while keeping the database consistent if the process dies.
+        # the background writer thread (if any) is the only user of the
+        # connection until close()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("pragma journal_mode=WAL")
+        self._connection.execute("pragma synchronous=NORMAL")
+
+        # {column name: sql type name} for the columns already in the table
+        self._columns = {}
+
+        table_info = self._connection.execute(
+            f'pragma table_info("{self.OUTPUT_TABLE_NAME}")'
+        ).fetchall()
+
+        if len(table_info) > 0:
+            # columns are (cid, name, type, notnull, default, pk)
+            self._columns = {c[1]: c[2] for c in table_info}
+            self._columns.pop(self.index_label, None)
+
+            last = self._connection.execute(
+                f'select max("{self.index_label}") from "{self.OUTPUT_TABLE_NAME}"'
+            ).fetchone()[0]
+            self.output_index = 0 if last is None else last + 1
         else:
             self._columns = None
-        self.inprogress = {}
-        self.committed = {}
 
     def close(self):
         try:
-            self._write_root()
+            # munge and write any pending rows while the connection is still open
+            self._flush()
         finally:
-            self._engine.dispose()
+            self._connection.close()
+            self._connection = None
 
-    def _write_root(self):
+    def _write_root(self, index, outputs, inputs):
         """Write queued rows of data to the database. This also is called automatically on :func:`close`, or when
         exiting a `with` block.
 
-        If the class was created with overwrite=True, then the first call to _write_root() will overwrite
-        the preexisting file; subsequent calls append.
+        The pending rows are inserted with a single `executemany` in one
+        transaction. The SQL types of the columns are inferred only when
+        a column first appears, and cached after that.
         """
 
-        if len(self.pending_output) == 0:
+        if len(outputs) == 0:
             return
 
-        # Put together a DataFrame from self.pending that is guaranteed
-        # to include the columns defined in self._columns
-        traits = pd.DataFrame(self.pending_output)
-        traits.index = traits.index + self.output_index
-        blank = pd.DataFrame(columns=self._columns)
-
-        # Check for new columns, and insert into the database
-        if self._columns is None:
-            new_columns = []
-        else:
-            trait_cols = [c.lower() for c in traits.columns]
-            blank_cols = [c.lower() for c in blank.columns]
-            new_columns = list(set(trait_cols).difference(blank_cols))
-
-        for c in new_columns:
-            self._logger.debug(f"inserting new column '{c}'")
-            column_type = self._sql_type_name(traits[c])
-            with self._engine.connect() as con:
-                query = f"alter table {self.OUTPUT_TABLE_NAME} add column {c} {column_type} default NULL"
-                con.execute(query)
+        # sqlite column names are case insensitive: store each value in the
+        # column under the first spelling of its name
+        canonical = {c.lower(): c for c in (self._columns or {})}
+        new_columns = []
+        rows = []
+        for row in outputs:
+            mapped = {}
+            for c, value in row.items():
+                if c.lower() not in canonical:
+                    canonical[c.lower()] = c
+                    new_columns.append(c)
+                name = canonical[c.lower()]
+                if name in mapped:
+                    raise ValueError(
+                        f"columns '{name}' and '{c}' in the same row differ only in case, "
+                        f"which sqlite does not distinguish"
+                    )
+                mapped[name] = value
+            rows.append(mapped)
+        outputs = rows
+
+        new_types = {
+            c: self._sql_type_name(pd.Series([row.get(c) for row in outputs]))
+            for c in new_columns
+        }
+
+        with self._connection:
+            # one transaction for the schema changes and the insert
+            if self._columns is None:
+                column_defs = [f'"{self.index_label}" INTEGER PRIMARY KEY'] + [
+                    f'"{c}" {t}' for c, t in new_types.items()
+                ]
+                self._connection.execute(
+                    f'create table "{self.OUTPUT_TABLE_NAME}" ({", ".join(column_defs)})'
+                )
+                self._columns = {}
+            else:
+                for c, t in new_types.items():
+                    self._logger.debug(f"inserting new column '{c}'")
+                    self._connection.execute(
+                        f'alter table "{self.OUTPUT_TABLE_NAME}" add column "{c}" {t} default NULL'
+                    )
 
-        # Form the new database row
-        df = blank.append(traits, sort=True)
-        df.sort_index(inplace=True)
-        self._columns = df.columns
+            self._columns.update(new_types)
 
-        from sqlalchemy.exc import ArgumentError
+            # only insert the columns present in this batch of rows
+            present = set().union(*(row.keys() for row in outputs))
+            columns = [c for c in self._columns if c in present]
+            names = ", ".join([f'"{self.index_label}"'] + [f'"{c}"' for c in columns])
+            placeholders = ", ".join(["?"] * (len(columns) + 1))
+            query = f'insert into "{self.OUTPUT_TABLE_NAME}" ({names}) values ({placeholders})'
 
-        # Append to db
-        try:
-            df.to_sql(
-                self.OUTPUT_TABLE_NAME,
-                self._engine,
-                if_exists="append",
-                index=True,
-                index_label=self.index_label,
+            values = (
+                [index + i] + [self._sql_value(row.get(c)) for c in columns]
+                for i, row in enumerate(outputs)
             )
-        except ArgumentError:
-            self._logger.error(f"failed to convert index label {self.index_label}")
-            raise ArgumentError
-        except BaseException as e:
-            raise e
 
-        self.output_index += 1
+            self._connection.executemany(query, values)
+
+    @staticmethod
+    def _sql_value(value):
+        """convert a value to a type supported by the sqlite3 module"""
+        if value is None or isinstance(value, (str, bytes, int, float)):
+            return value
+        elif isinstance(value, np.generic):
+            return value.item()
+        elif isinstance(value, pd.Timestamp):
+            return value.isoformat(sep=" ")
+        else:
+            return str(value)
 
     def key(self, name, attr):
         """The key determines the SQL column name. df.to_sql does not seem
@@ -1730,6 +2893,220 @@ class SQLiteLogger(RelationalTableLogger):
         return pd.api.types.infer_dtype(col_for_inference)
 
 
+class ParquetLogger(RelationalTableLogger):
+    """Store data, value traits, and property traits to disk into a root database formatted
+    as partitioned parquet datasets.
+
+    This extends :class:`Aggregator` to support
+
+    #. queuing aggregate property trait of devices by lists of dictionaries;
+    #. custom metadata in each queued aggregate property trait entry; and
+    #. custom response to non-scalar data (such as relational databasing).
+
+    Each call to `write()` appends a row group to a parquet file in each partition of the
+    root dataset, which stays open until `close()`. The file is rolled over to a new one
+    if new columns or incompatible types appear. 1-D numerical arrays are stored inline
+    as list columns, instead of in relational files.
+
+    Arguments:
+        path (str): Base path to use for the root database
+        append (bool): Whether to append to the root database if it already exists (otherwise, raise IOError)
+        partition_cols: a column name (or list of column names) to partition the root dataset into hive-style subdirectories (for example 'dut=DUT15'), or None to write a single partition
+        compression (str): parquet compression codec
+        text_relational_min: Text with at least this many characters is stored as a relational text file instead of directly in the database
+        force_relational: A list of columns that should always be stored as relational data instead of directly in the database
+        nonscalar_file_type: The data type to use in relational data that is not stored inline
+        metadata_dirname: The name of the subdirectory that should be used to store metadata (device connection parameters, etc.)
+        tar: Whether to store the relational data within directories in a tar file, instead of subdirectories
+        background: Whether to munge and write rows in a dedicated writer thread
+        flush_rows, flush_bytes, flush_seconds: thresholds on the pending rows that trigger `write()` automatically
+        concurrent_gets: Whether to poll the "always" traits of different devices concurrently
+        dedup: Whether to store each unique relational value once in a content-addressed store
+        relational_compression, relational_compression_level: codec and level used to compress relational files as they are written
+    """
+
+    ROOT_FILE_NAME = OUTPUT_FILE_NAME = "outputs.parquet"
+    INPUT_FILE_NAME = "inputs.parquet"
+    output_index = 0
+
+    def __init__(self, path=None, *, partition_cols=None, compression="snappy", **kws):
+        super().__init__(path, **kws)
+
+        if isinstance(partition_cols, str):
+            partition_cols = [partition_cols]
+        self._partition_cols = list(partition_cols or [])
+        self._compression = compression
+
+    def open(self):
+        """Instead of calling `open` directly, consider using
+        `with` statements to guarantee proper disconnection
+        if there is an error. For example, the following
+        sets up a connected instance::
+
+            with ParquetLogger('my_dataset', partition_cols='dut') as db:
+                ### do the data acquisition here
+                pass
+
+        would instantiate a `ParquetLogger` instance, and also guarantee
+        a final attempt to write unwritten data is written, and that
+        the file is closed when exiting the `with` block, even if there
+        is an exception.
+        """
+        # {(file_name, partition subdirectory): (ParquetWriter, part number)}
+        self._writers = {}
+        # unique to this run, so that appending does not replace existing files
+        self._file_prefix = f"part-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        root_path = self.path / self.OUTPUT_FILE_NAME
+        if root_path.exists():
+            if not self._append:
+                raise IOError(
+                    f"root dataset already exists at '{root_path}', while append=False"
+                )
+
+            ids = read_parquet(root_path, columns=[self.index_label])
+            if len(ids) > 0:
+                self.output_index = int(ids[self.index_label].max()) + 1
+
+    def close(self):
+        try:
+            self._flush()
+        finally:
+            for writer, _ in self._writers.values():
+                writer.close()
+            self._writers = {}
+
+    def _write_batch(self, index, outputs, inputs):
+        """munge a batch of rows starting at row `index`, keeping values that are stored
+        inline, and write them to the root database
+        """
+        proc = self._row_preprocessor
+
+        def munge(rows):
+            rows = [proc(row) for row in rows]
+            inline = [
+                {k: v for k, v in row.items() if self._is_inline(k, v)} for row in rows
+            ]
+            munged = self.munge.batch(
+                index,
+                [
+                    {k: v for k, v in row.items() if k not in keep}
+                    for row, keep in zip(rows, inline)
+                ],
+            )
+
+            # restore the inline values in their original column order
+            return [
+                {k: keep[k] if k in keep else m[k] for k in row}
+                for row, keep, m in zip(rows, inline, munged)
+            ]
+
+        self._write_root(index, munge(outputs), munge(inputs))
+
+    def _is_inline(self, name, value):
+        """whether a row value is stored as a list column, instead of a relational file"""
+        return (
+            isinstance(value, np.ndarray)
+            and value.ndim == 1
+            and value.dtype.kind in "biuf"
+            and name not in self.munge.force_relational
+        )
+
+    def _write_root(self, index, outputs, inputs):
+        """Append queued rows of data as a row group in the parquet file of each partition.
+        This is called automatically on :func:`close`, or when exiting a `with` block.
+        """
+
+        def append_parquet(file_name, rows):
+            if len(rows) == 0:
+                return
+
+            partitions = {}
+            for i, row in enumerate(rows):
+                row = dict(row)
+                row[self.index_label] = index + i
+
+                # hive-style partition subdirectories, like 'dut=DUT15'
+                subdirs = [
+                    f"{c}={self._partition_value(row.pop(c, None))}"
+                    for c in self._partition_cols
+                ]
+                partitions.setdefault(os.path.join("", *subdirs), []).append(row)
+
+            for subdir, partition_rows in partitions.items():
+                self._write_row_group(
+                    file_name, subdir, self._arrow_table(partition_rows)
+                )
+
+        append_parquet(self.OUTPUT_FILE_NAME, outputs)
+        append_parquet(self.INPUT_FILE_NAME, inputs)
+
+    def _write_row_group(self, file_name, subdir, table):
+        import pyarrow.parquet as pq
+
+        key = file_name, subdir
+        writer, part = self._writers.get(key, (None, -1))
+
+        if writer is not None:
+            aligned = _align_arrow_table(table, writer.schema)
+            if aligned is not None:
+                writer.write_table(aligned)
+                return
+
+            # the file schema is fixed: roll over to a new file that includes the new columns
+            self._logger.debug(f"new columns or types in {repr(file_name)}; starting a new file")
+            schema = _unify_arrow_schemas([writer.schema, table.schema])
+            if schema is not None:
+                aligned = _align_arrow_table(table, schema)
+                if aligned is not None:
+                    table = aligned
+            writer.close()
+
+        dir_path = self.path / file_name / subdir
+        dir_path.mkdir(parents=True, exist_ok=True)
+
+        part += 1
+        writer = pq.ParquetWriter(
+            dir_path / f"{self._file_prefix}-{part:03d}.parquet",
+            table.schema,
+            compression=self._compression,
+        )
+        writer.write_table(table)
+        self._writers[key] = writer, part
+
+    def _arrow_table(self, rows):
+        """build a pyarrow Table from a list of row dictionaries"""
+        import pyarrow as pa
+
+        names = list(dict.fromkeys(itertools.chain.from_iterable(rows)))
+
+        columns = {}
+        for name in names:
+            values = [row.get(name, None) for row in rows]
+            try:
+                columns[name] = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                self._logger.warning(
+                    f"column {repr(name)} has mixed or unsupported types; storing as str"
+                )
+                columns[name] = pa.array(
+                    [None if v is None else str(v) for v in values], pa.string()
+                )
+
+        return pa.table(columns)
+
+    @staticmethod
+    def _partition_value(value):
+        from urllib.parse import quote
+
+        if value is None:
+            return "__HIVE_DEFAULT_PARTITION__"
+        else:
+            return quote(str(value), safe="")
+
+
 def to_feather(data, path):
     """
     Write a dataframe to a feather file on disk. Any index will be moved
@@ -1761,6 +3138,271 @@ def to_feather(data, path):
         data.columns.name = cname
 
 
+def to_arrow(data, stream):
+    """
+    Write array-like data to a stream in the Arrow IPC file format. The file is not
+    compressed, so that it can be memory-mapped when it is read.
+
+    Each column of a 1- or 2-D array becomes a column named by its (str) index.
+    The index of a pandas Series or DataFrame is kept.
+
+    Arguments:
+        data: numpy array, pandas Series or DataFrame, or pyarrow Table to write
+        stream: open binary stream or path of the file to write
+    Returns:
+        None
+    """
+    import pyarrow as pa
+
+    table = _arrow_table(data)
+
+    with pa.ipc.new_file(stream, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _arrow_table(data):
+    """convert a 1- or 2-D numpy array or a pandas Series or DataFrame to a pyarrow Table"""
+    import pyarrow as pa
+
+    if isinstance(data, pa.Table):
+        return data
+
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+
+    if isinstance(data, pd.DataFrame):
+        data = data.rename(columns=str)
+        return pa.Table.from_pandas(data, preserve_index=True)
+
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+    elif data.ndim != 2:
+        raise ValueError(f"arrow files support 1- or 2-D arrays, not {data.ndim}-D")
+    if data.dtype.hasobject:
+        raise TypeError("arrow files do not support arrays of python objects")
+
+    return pa.table(
+        {str(i): np.ascontiguousarray(data[:, i]) for i in range(data.shape[1])}
+    )
+
+
+def read_npy(path_or_buf, columns=None, nrows=None, mmap_mode="r"):
+    """Load a 1- or 2-D array from an npy file as a DataFrame. If `path_or_buf`
+    is a path, the file is memory-mapped, and the DataFrame is a view of the
+    file data instead of a copy.
+
+    Arguments:
+        path_or_buf: path to the file, or a file-like object
+        columns: column (or iterable of columns) to return, or None (default) to return all columns
+        nrows: number of rows of data to read, or None (default) to return all rows
+        mmap_mode: mode passed to `numpy.load` for a memory-mapped file, or None to load into memory
+    Returns:
+        pandas.DataFrame instance with columns named by their (str) index
+    """
+    if isinstance(path_or_buf, (str, Path)):
+        data = np.load(path_or_buf, mmap_mode=mmap_mode, allow_pickle=False)
+    else:
+        # some streams (like tarfile members) lack the fileno() that numpy probes for
+        data = np.load(io.BytesIO(path_or_buf.read()), allow_pickle=False)
+
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+
+    df = pd.DataFrame(data[:nrows], copy=False)
+    df.columns = df.columns.astype(str)
+
+    if columns is not None:
+        df = df[columns]
+
+    return df
+
+
+def read_arrow(path_or_buf, columns=None, nrows=None, memory_map=True):
+    """Load a table from an Arrow IPC file as a DataFrame. If `path_or_buf`
+    is a path, the file is memory-mapped, and the numerical columns of the
+    DataFrame refer to the file data instead of a copy.
+
+    Arguments:
+        path_or_buf: path to the file, or a file-like object
+        columns: column (or iterable of columns) to return, or None (default) to return all columns
+        nrows: number of rows of data to read, or None (default) to return all rows
+        memory_map: whether to memory-map the file when `path_or_buf` is a path
+    Returns:
+        pandas.DataFrame instance
+    """
+    import pyarrow as pa
+
+    if isinstance(path_or_buf, (str, Path)) and memory_map:
+        source = pa.memory_map(str(path_or_buf), "r")
+    else:
+        source = path_or_buf
+
+    table = pa.ipc.open_file(source).read_all()
+
+    if columns is not None:
+        if isinstance(columns, str):
+            columns = [columns]
+        pandas_meta = table.schema.pandas_metadata or {}
+        index_columns = [
+            c for c in pandas_meta.get("index_columns", []) if isinstance(c, str)
+        ]
+        table = table.select(list(columns) + index_columns)
+
+    if nrows is not None:
+        table = table.slice(0, nrows)
+
+    return table.to_pandas(split_blocks=True)
+
+
+def _align_arrow_table(table, schema):
+    """cast `table` to `schema`, filling null values in missing columns. Returns None if
+    `table` has columns that are not in `schema`, or types that cannot be cast safely.
+    """
+    import pyarrow as pa
+
+    if not set(table.column_names).issubset(schema.names):
+        return None
+
+    columns = []
+    for field in schema:
+        if field.name not in table.column_names:
+            columns.append(pa.nulls(len(table), field.type))
+            continue
+
+        column = table[field.name]
+        if column.type != field.type:
+            try:
+                column = column.cast(field.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                return None
+        columns.append(column)
+
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _unify_arrow_schemas(schemas):
+    """merge the fields of several pyarrow schemas, promoting types when needed (for
+    example, int64 and double to double). Returns None if the types cannot be reconciled.
+    """
+    import pyarrow as pa
+
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except TypeError:
+        # pyarrow < 14 does not promote types
+        pass
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+    try:
+        return pa.unify_schemas(schemas)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def read_parquet(path_or_buf, columns=None, nrows=None, filters=None):
+    """Load a parquet file or a partitioned parquet dataset directory (like those written
+    by :class:`ParquetLogger`) as a DataFrame. Only the requested columns are read, and
+    `filters` are pushed down to skip row groups and partitions that do not match.
+
+    Arguments:
+        path_or_buf: path to the parquet file or dataset directory, or a file-like object
+        columns: column (or iterable of columns) to return, or None (default) to return all columns
+        nrows: number of rows of data to read, or None (default) to return all rows
+        filters: None (the default) to read all rows, a `pyarrow.dataset.Expression`, or filters
+                 in the list-of-tuples form of `pyarrow.parquet.read_table`, like [('dut', '=', 'DUT15')]
+    Returns:
+        pandas.DataFrame instance
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    if isinstance(columns, str):
+        columns = [columns]
+    elif columns is not None:
+        columns = list(columns)
+
+    if filters is not None and not isinstance(filters, ds.Expression):
+        filters = pq.filters_to_expression(filters)
+
+    if not isinstance(path_or_buf, (str, Path)):
+        table = pq.read_table(path_or_buf, columns=columns, filters=filters)
+        return table.slice(0, nrows).to_pandas()
+
+    try:
+        partitioning = "hive"
+        dataset = ds.dataset(path_or_buf, format="parquet", partitioning=partitioning)
+    except pa.ArrowInvalid:
+        # the type of a partition column with only null ('__HIVE_DEFAULT_PARTITION__')
+        # values can't be inferred; read the partition values as str instead
+        first = ds.dataset(path_or_buf, format="parquet").files[0]
+        names = [
+            d.split("=", 1)[0]
+            for d in Path(os.path.relpath(first, path_or_buf)).parent.parts
+        ]
+        partitioning = ds.partitioning(
+            pa.schema([(n, pa.string()) for n in names]), flavor="hive"
+        )
+        dataset = ds.dataset(path_or_buf, format="parquet", partitioning=partitioning)
+
+    # files in the dataset may have different columns, or types that need promotion
+    schema = _unify_arrow_schemas(
+        [dataset.schema] + [f.physical_schema for f in dataset.get_fragments()]
+    )
+    if schema is not None and schema != dataset.schema:
+        dataset = ds.dataset(
+            path_or_buf, format="parquet", partitioning=partitioning, schema=schema
+        )
+
+    if nrows is None:
+        table = dataset.to_table(columns=columns, filter=filters)
+    else:
+        table = dataset.head(nrows, columns=columns, filter=filters)
+
+    return table.to_pandas()
+
+
+def read_hdf(path_or_buf, columns=None, nrows=None, key="output"):
+    """Load a root table written by :class:`HDFLogger`. The file is opened without
+    locking, so that it can be read while a logger is writing to it.
+
+    Arguments:
+        path_or_buf: path to the hdf file, or a file-like object
+        columns: column (or iterable of columns) to return, or None (default) to return all columns
+        nrows: number of rows of data to read, or None (default) to return all rows
+        key: the key of the root table in the hdf file ('output' or 'input')
+    Returns:
+        pandas.DataFrame instance
+    """
+    import h5py
+
+    if isinstance(columns, str):
+        columns = [columns]
+
+    try:
+        f = h5py.File(path_or_buf, "r", locking=False)
+    except TypeError:
+        # h5py < 3.5
+        f = h5py.File(path_or_buf, "r")
+
+    with f:
+        dataset = f[key]
+        if columns is not None:
+            dataset = dataset.fields(list(columns))
+        data = dataset[:nrows]
+
+    df = pd.DataFrame(data)
+
+    # variable-length strings are read as bytes
+    for name in df.columns:
+        if df[name].dtype == object:
+            df[name] = df[name].str.decode("utf-8")
+
+    return df
+
+
 def read_sqlite(
     path,
     table_name=SQLiteLogger.OUTPUT_TABLE_NAME,
@@ -1790,7 +3432,22 @@ def read_sqlite(
     return df
 
 
-def read(path_or_buf, columns=None, nrows=None, format="auto", **kws):
+def _split_compression_ext(path):
+    """Return the (format, compression) of a file guessed from the extensions in `path`, as
+    in ('csv', 'zstd') for 'trace.csv.zst', or ('csv', None) for 'trace.csv'
+    """
+    root, ext = os.path.splitext(str(path))
+
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if ext == suffix:
+            return os.path.splitext(root)[1][1:], compression
+
+    return ext[1:], None
+
+
+def read(
+    path_or_buf, columns=None, nrows=None, format="auto", compression="infer", **kws
+):
     """Read tabular data from a file in one of various formats
     using pandas.
 
@@ -1798,7 +3455,8 @@ def read(path_or_buf, columns=None, nrows=None, format="auto", **kws):
         path (str): path to the  data file.
         columns: a column or iterable of multiple columns to return from the data file, or None (the default) to return all columns
         nrows: number of rows to read at the beginning of the table, or None (the default) to read all rows
-        format (str): data file format, one of ['pickle','feather','csv','json','csv'], or 'auto' (the default) to guess from the file extension
+        format (str): data file format, one of ['pickle','feather','csv','json','ndjson','npy','arrow','parquet','h5'], or 'auto' (the default) to guess from the file extension
+        compression (str): codec of a compressed file, one of ['gzip','bz2','xz','zstd','lz4'], None for an uncompressed file, or 'infer' (the default) to guess from the extension of a path
         kws: additional keyword arguments to pass to the pandas read_<ext> function matching the file extension
     Returns:
         pandas.DataFrame instance containing data read from file
@@ -1812,7 +3470,13 @@ def read(path_or_buf, columns=None, nrows=None, format="auto", **kws):
         "db": read_sqlite,
         "sqlite": read_sqlite,
         "json": pd.read_json,
+        "ndjson": partial(pd.read_json, lines=True),
         "csv": pd.read_csv,
+        "npy": read_npy,
+        "arrow": read_arrow,
+        "parquet": read_parquet,
+        "h5": read_hdf,
+        "hdf": read_hdf,
     }
 
     try:
@@ -1827,20 +3491,33 @@ def read(path_or_buf, columns=None, nrows=None, format="auto", **kws):
         if os.path.getsize(path_or_buf) == 0:
             raise IOError("file is empty")
 
+        guessed_format, guessed_compression = _split_compression_ext(path_or_buf)
         if format == "auto":
-            format = os.path.splitext(path_or_buf)[-1][1:]
+            format = guessed_format
+        if compression == "infer":
+            compression = guessed_compression
     else:
         if format == "auto":
             raise ValueError(
                 "can only guess format for string path - specify extension"
             )
+        if compression == "infer":
+            compression = None
+
+    if compression is not None:
+        if isinstance(path_or_buf, str):
+            with open(path_or_buf, "rb") as f:
+                data = f.read()
+        else:
+            data = path_or_buf.read()
+        path_or_buf = io.BytesIO(_decompress(data, compression))
 
     try:
         reader = reader_guess[format]
     except KeyError as e:
         raise Exception(f"couldn't guess a reader from extension of file {path_or_buf}")
 
-    if reader == read_sqlite:
+    if reader in (read_sqlite, read_npy, read_arrow, read_parquet, read_hdf):
         return reader(path_or_buf, columns=columns, nrows=nrows, **kws)
     elif reader == pd.read_csv:
         return reader(path_or_buf, usecols=columns, nrows=nrows, **kws)
@@ -1851,26 +3528,89 @@ def read(path_or_buf, columns=None, nrows=None, format="auto", **kws):
 
 
 class MungeTarReader:
+    """Read relational data from a tar file.
+
+    If the tar file is uncompressed and has an up-to-date sidecar index written by
+    `MungeToTar`, members are read from a memory-mapped view of the file at the
+    indexed offsets, without scanning the archive. Otherwise, members are extracted
+    through `tarfile`.
+    """
+
     tarnames = "data.tar", "data.tar.gz", "data.tar.bz2", "data.tar.lz4"
 
     def __init__(self, path, tarname="data.tar"):
-        import tarfile
+        self.path = os.path.join(path, tarname)
+        self.members = self._load_index()
+        self._tarfile = None
+
+        if self.members is None:
+            self._mmap = None
+        else:
+            import mmap
+
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._tarfile is not None:
+            self._tarfile.close()
+            self._tarfile = None
+
+    def __enter__(self):
+        return self
 
-        self.tarfile = tarfile.open(os.path.join(path, tarname), "r")
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def tarfile(self):
+        # the fallback for members that are not in the index
+        if self._tarfile is None:
+            self._tarfile = tarfile.open(self.path, "r")
+        return self._tarfile
+
+    def _load_index(self):
+        index_path = self.path + MungeToTar.index_suffix
+
+        if not os.path.exists(index_path):
+            return None
+
+        with open(index_path, "r") as f:
+            index = json.load(f)
+
+        if index["tar_size"] != os.path.getsize(self.path):
+            util.logger.warning(
+                f"ignoring out-of-date tar index {repr(index_path)}"
+            )
+            return None
+
+        return index["members"]
 
     def __call__(self, key, *args, **kws):
         key = key.replace("\\\\", "\\")
 
         for k in key, key.replace("\\", "/").replace("//", "/"):
-            try:
+            ext, compression = _split_compression_ext(key)
+
+            if self.members is not None and k in self.members:
+                offset, size = self.members[k]
+                buf = io.BytesIO(self._mmap[offset : offset + size])
+                return read(buf, format=ext, compression=compression, *args, **kws)
 
-                ext = os.path.splitext(key)[1][1:]
-                return read(self.tarfile.extractfile(k), format=ext, *args, **kws)
+            try:
+                return read(
+                    self.tarfile.extractfile(k),
+                    format=ext,
+                    compression=compression,
+                    *args,
+                    **kws,
+                )
             except KeyError as e:
                 ex = e
                 continue
-            else:
-                break
         else:
             raise ex
 
@@ -1879,6 +3619,15 @@ class MungeDirectoryReader:
     def __init__(self, path):
         self.path = Path(path)
 
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def __call__(self, key, *args, **kws):
         return read(os.path.join(self.path, key), *args, **kws)
 
@@ -1902,6 +3651,17 @@ class MungeReader:
         return MungeDirectoryReader(dirname)
 
 
+# readers cached in each worker process of read_relational(..., pool="process")
+_process_readers = {}
+
+
+def _read_relational_file(path, key, columns):
+    reader = _process_readers.get(path, None)
+    if reader is None:
+        reader = _process_readers[path] = MungeReader(path)
+    return reader(key, columns=columns)
+
+
 def read_relational(
     path,
     expand_col,
@@ -1910,6 +3670,9 @@ def read_relational(
     root_nrows=None,
     root_format="auto",
     prepend_column_name=True,
+    workers=1,
+    pool="thread",
+    chunksize=None,
 ):
     """Flatten a relational database table by loading the table located each row of
     `root[expand_col]`. The value of each column in this row
@@ -1919,7 +3682,8 @@ def read_relational(
     is concatenated and returned.
 
     The expanded dataframe may be very large, making downselecting a practical
-    necessity in some scenarios.
+    necessity in some scenarios. Alternatively, set `chunksize` to iterate through
+    the expanded dataframe in blocks.
 
     TODO: Support for a list of expand_col?
 
@@ -1929,8 +3693,11 @@ def read_relational(
         target_cols: a column (or array-like iterable of multiple columns) listing the root columns to include in the expanded dataframe, or None (the default) to pass all columns loaded from each root[expand_col]
         root_path: a string containing the full path to the root database (to help find the relational files)
         prepend_column_name (bool): whether to prepend the name of the expanded column from the root database
+        workers (int): the number of threads or processes used to load the relational files
+        pool (str): 'thread' to load in a pool of threads, or 'process' to load in a pool of processes, which avoids contention for the GIL when parsing text formats like csv
+        chunksize (int): if specified, return a generator that yields the expanded dataframe in blocks of `chunksize` root rows instead
     Returns:
-        the expanded dataframe
+        the expanded dataframe, or a generator of expanded dataframes if `chunksize` is specified
 
     """
 
@@ -1943,32 +3710,72 @@ def read_relational(
     if root_cols is not None:
         root_cols = list(root_cols) + [expand_col]
     root = read(path, columns=root_cols, nrows=root_nrows, format=root_format)
-    reader = MungeReader(path)
 
-    def generate():
-        for i, row in root.iterrows():
-            if row[expand_col] is None or len(row[expand_col]) == 0:
-                continue
+    # skip rows with no file to expand ('', None, or NaN)
+    keys = root[expand_col]
+    root = root[keys.map(lambda k: isinstance(k, str) and len(k) > 0)]
 
-            sub = reader(row[expand_col], columns=target_cols)
+    if prepend_column_name:
+        prepend = expand_col + "_"
+    else:
+        prepend = ""
+
+    def expand(rows, reader, executor):
+        def load(key):
+            return reader(key, columns=target_cols)
+
+        if executor is None:
+            subs = [load(k) for k in rows[expand_col]]
+        elif pool == "process":
+            subs = list(
+                executor.map(
+                    _read_relational_file,
+                    itertools.repeat(path),
+                    rows[expand_col],
+                    itertools.repeat(target_cols),
+                    chunksize=max(1, len(rows) // (4 * workers)),
+                )
+            )
+        else:
+            subs = list(executor.map(load, rows[expand_col]))
 
-            if prepend_column_name:
-                prepend = expand_col + "_"
-            else:
-                prepend = ""
+        block = pd.concat(subs, sort=True)
+
+        # Rename columns
+        block.columns = [prepend + str(c) for c in block.columns]
+        block[prepend + "id"] = block.index
 
-            # Rename columns
-            sub.columns = [prepend + c for c in sub.columns]
-            sub[prepend + "id"] = sub.index
+        # Add in columns from the root, broadcast to the length of each table
+        repeats = np.repeat(np.arange(len(subs)), [len(sub) for sub in subs])
+        broadcast = rows.iloc[repeats].reset_index(drop=True)
+        block = block.drop(columns=broadcast.columns, errors="ignore")
+        block = pd.concat([block.reset_index(drop=True), broadcast], axis=1)
 
-            # # Downselect root columns
-            # if root_cols is not None:
-            #     row = row[root_cols]
+        return block.sort_index(axis=1)
 
-            # Add in columns from the root
-            for c, v in row.iteritems():
-                sub[c] = v
+    if pool not in ("thread", "process"):
+        raise ValueError(f"pool must be 'thread' or 'process', not {repr(pool)}")
 
-            yield sub
+    def generate(chunksize):
+        with ExitStack() as stack:
+            # closed after the executor finishes
+            reader = stack.enter_context(MungeReader(path))
 
-    return pd.concat(generate(), ignore_index=True, sort=True)
+            if workers <= 1:
+                executor = None
+            elif pool == "process":
+                executor = stack.enter_context(ProcessPoolExecutor(workers))
+            else:
+                executor = stack.enter_context(ThreadPoolExecutor(workers))
+
+            for start in range(0, len(root), chunksize):
+                yield expand(root.iloc[start : start + chunksize], reader, executor)
+
+    if chunksize is not None:
+        return generate(chunksize)
+
+    blocks = list(generate(max(len(root), 1)))
+    if len(blocks) == 1:
+        return blocks[0]
+    else:
+        return pd.concat(blocks, ignore_index=True, sort=True)
@@ -11,6 +11,18 @@ from typing import Any
 EMPTY: Any
 INSPECT_SKIP_FILES: Any
 
+COMPRESSION_SUFFIXES: Any
+
+class CompressedFileIO(io.BufferedIOBase):
+    raw: Any
+    name: Any
+    mode: str
+    def __init__(self, raw, compression, level: Any | None = ...) -> None: ...
+    def writable(self): ...
+    def write(self, data): ...
+    def tell(self): ...
+    def close(self) -> None: ...
+
 class MungerBase(core.Device):
     def __init__(
         self,
@@ -20,6 +32,11 @@ class MungerBase(core.Device):
         dirname_fmt: str = "str",
         nonscalar_file_type: str = "str",
         metadata_dirname: str = "str",
+        workers: str = "int",
+        dedup: str = "bool",
+        dedup_dirname: str = "str",
+        compression: str = "str",
+        compression_level: str = "int",
     ): ...
     resource: Any
     text_relational_min: Any
@@ -27,7 +44,16 @@ class MungerBase(core.Device):
     dirname_fmt: Any
     nonscalar_file_type: Any
     metadata_dirname: Any
+    workers: Any
+    dedup: Any
+    dedup_dirname: Any
+    dedup_index_name: str
+    compression: Any
+    compression_level: Any
+    def open(self) -> None: ...
+    def close(self) -> None: ...
     def __call__(self, index, row): ...
+    def batch(self, index, rows): ...
     def save_metadata(self, name, key_func, **extra): ...
 
 class MungeToDirectory(MungerBase):
@@ -39,18 +65,35 @@ class MungeToDirectory(MungerBase):
         dirname_fmt: str = "str",
         nonscalar_file_type: str = "str",
         metadata_dirname: str = "str",
+        workers: str = "int",
+        dedup: str = "bool",
+        dedup_dirname: str = "str",
+        compression: str = "str",
+        compression_level: str = "int",
     ): ...
     ...
 
-class TarFileIO(io.BytesIO):
+class TarFileIO(io.BufferedIOBase):
     tarfile: Any
     overwrite: bool
     name: Any
     mode: Any
+    lock: Any
+    names: Any
     def __init__(
-        self, open_tarfile, relname, mode: str = ..., overwrite: bool = ...
+        self,
+        open_tarfile,
+        relname,
+        mode: str = ...,
+        overwrite: bool = ...,
+        lock: Any = ...,
+        names: Any = ...,
+        max_size: int = ...,
     ) -> None: ...
     def __del__(self) -> None: ...
+    def writable(self): ...
+    def write(self, data): ...
+    def tell(self): ...
     def close(self) -> None: ...
 
 class MungeToTar(MungerBase):
@@ -62,8 +105,15 @@ class MungeToTar(MungerBase):
         dirname_fmt: str = "str",
         nonscalar_file_type: str = "str",
         metadata_dirname: str = "str",
+        workers: str = "int",
+        dedup: str = "bool",
+        dedup_dirname: str = "str",
+        compression: str = "str",
+        compression_level: str = "int",
     ): ...
     tarname: str
+    index_suffix: str
+    spool_size: int
     tarfile: Any
     def open(self) -> None: ...
     def close(self) -> None: ...
@@ -72,7 +122,8 @@ class Aggregator(util.Ownable):
     name_map: Any
     trait_rules: Any
     metadata: Any
-    def __init__(self, persistent_state: bool = ...) -> None: ...
+    concurrent_gets: bool
+    def __init__(self, concurrent_gets: bool = ...) -> None: ...
     def enable(self) -> None: ...
     def disable(self) -> None: ...
     def get(self) -> dict: ...
@@ -98,9 +149,18 @@ class RelationalTableLogger(Owner, util.Ownable):
         nonscalar_file_type: str = ...,
         metadata_dirname: str = ...,
         tar: bool = ...,
+        relational_workers: int = ...,
         git_commit_in: Any | None = ...,
-        persistent_state: bool = ...
+        background: bool = ...,
+        flush_rows: Any | None = ...,
+        flush_bytes: Any | None = ...,
+        flush_seconds: Any | None = ...,
+        concurrent_gets: bool = ...,
+        dedup: bool = ...,
+        relational_compression: Any | None = ...,
+        relational_compression_level: Any | None = ...,
     ) -> None: ...
+    flush_counts: Any
     def __copy__(self): ...
     def __owner_init__(self, owner) -> None: ...
     def observe(self, devices, changes: bool = ..., always=..., never=...) -> None: ...
@@ -123,16 +183,30 @@ class CSVLogger(RelationalTableLogger):
     def close(self) -> None: ...
 
 class MungeToHDF(Device):
-    def __init__(self, resource: str = "WindowsPath", key_fmt: str = "str"): ...
+    def __init__(
+        self,
+        resource: str = "WindowsPath",
+        key_fmt: str = "str",
+        compression: str = "str",
+        stack_arrays: str = "bool",
+    ): ...
     resource: Any
     key_fmt: Any
+    compression: Any
+    stack_arrays: Any
+    STACK_GROUP: str
+    CHUNK_ROWS: int
     backend: Any
     def open(self) -> None: ...
     def close(self) -> None: ...
     def __call__(self, index, row): ...
+    def batch(self, index, rows): ...
     def save_metadata(self, name, key_func, **extra): ...
 
 class HDFLogger(RelationalTableLogger):
+    KEY_OUTPUT: str
+    KEY_INPUT: str
+    CHUNK_ROWS: int
     nonscalar_file_type: str
     munge: Any
     def __init__(
@@ -141,10 +215,15 @@ class HDFLogger(RelationalTableLogger):
         *,
         append: bool = ...,
         key_fmt: str = ...,
+        compression: Any | None = ...,
+        stack_arrays: bool = ...,
         git_commit_in: Any | None = ...,
-        persistent_state: bool = ...
+        background: bool = ...,
+        flush_rows: Any | None = ...,
+        flush_bytes: Any | None = ...,
+        flush_seconds: Any | None = ...,
+        concurrent_gets: bool = ...
     ) -> None: ...
-    df: Any
     def open(self) -> None: ...
     def close(self) -> None: ...
 
@@ -159,7 +238,35 @@ class SQLiteLogger(RelationalTableLogger):
     def close(self) -> None: ...
     def key(self, name, attr): ...
 
+class ParquetLogger(RelationalTableLogger):
+    ROOT_FILE_NAME: str
+    OUTPUT_FILE_NAME: str
+    INPUT_FILE_NAME: str
+    output_index: int
+    def __init__(
+        self,
+        path: Any | None = ...,
+        *,
+        partition_cols: Any | None = ...,
+        compression: str = ...,
+        **kws
+    ) -> None: ...
+    def open(self) -> None: ...
+    def close(self) -> None: ...
+
 def to_feather(data, path) -> None: ...
+def read_parquet(
+    path_or_buf,
+    columns: Any | None = ...,
+    nrows: Any | None = ...,
+    filters: Any | None = ...,
+): ...
+def read_hdf(
+    path_or_buf,
+    columns: Any | None = ...,
+    nrows: Any | None = ...,
+    key: str = ...,
+): ...
 def read_sqlite(
     path,
     table_name: str = ...,
@@ -172,13 +279,17 @@ def read(
     columns: Any | None = ...,
     nrows: Any | None = ...,
     format: str = ...,
+    compression: Any | None = ...,
     **kws
 ): ...
 
 class MungeTarReader:
     tarnames: Any
-    tarfile: Any
+    path: Any
+    members: Any
     def __init__(self, path, tarname: str = ...) -> None: ...
+    @property
+    def tarfile(self): ...
     def __call__(self, key, *args, **kws): ...
 
 class MungeDirectoryReader:
@@ -197,4 +308,7 @@ def read_relational(
     root_nrows: Any | None = ...,
     root_format: str = ...,
     prepend_column_name: bool = ...,
+    workers: int = ...,
+    pool: str = ...,
+    chunksize: Any | None = ...,
 ) -> Generator[(None, None, Any)]: ...
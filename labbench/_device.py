@@ -47,6 +47,7 @@ from ._traits import (
     BoundedNumber,
     observe,
     unobserve,
+    debug_handler,
     hold_trait_notifications,
 )
 
@@ -130,15 +131,17 @@ class DisconnectedBackend(object):
     __deepcopy__ = __copy__
 
 
+@debug_handler
 def log_trait_activity(msg):
     """emit debug messages for trait values"""
 
     # print('logger debug!', msg)
 
-    if msg['name'] == 'isopen':
+    # called only while owner._logger is enabled for DEBUG
+    if msg.name == 'isopen':
         return
 
-    owner = msg["owner"]
+    owner = msg.owner
     trait_name = msg["name"]
 
     if msg["type"] == "set":
@@ -150,7 +153,13 @@ def log_trait_activity(msg):
             value = f'<data of type {type(msg["new"]).__qualname__}>'
         owner._logger.debug(f'set trait "{trait_name}" → {value}{label}')
     elif msg["type"] == "get":
-        if msg['new'] != msg['old']:
+        try:
+            changed = bool(msg['new'] != msg['old'])
+        except ValueError:
+            # array-like values
+            changed = True
+
+        if changed:
             label = owner._traits[trait_name].label
             if label:
                 label = f" {label} "
@@ -24,6 +24,7 @@
 # legally bundled with the code in compliance with the conditions of those
 # licenses.
 
+import collections
 import datetime
 import io
 import json
@@ -41,20 +42,128 @@ from . import util, value
 __all__ = ["Host", "Email"]
 
 
-class LogStreamBuffer:
-    def __init__(self):
-        self._value = ""
+LogRecordFields = collections.namedtuple(
+    "LogRecordFields",
+    [
+        "message",
+        "time",
+        "elapsed_seconds",
+        "level",
+        "object",
+        "object_log_name",
+        "source_file",
+        "source_line",
+        "process",
+        "thread",
+        "exception",
+        "traceback",
+    ],
+)
+
+
+class LogRecords(list):
+    """A list of `LogRecordFields` captured from the labbench logger.
+
+    The records hold the raw fields of each log record, and are only serialized
+    (as newline-delimited JSON) when they are written to a file.
+    """
+
+    def to_dicts(self):
+        """Return a list of one dictionary for each record, omitting empty exception fields"""
+        ret = []
+        for rec in self:
+            d = rec._asdict()
+            d["time"] = datetime.datetime.fromtimestamp(d["time"]).isoformat()
+            if d["exception"] is None:
+                del d["exception"], d["traceback"]
+            ret.append(d)
+        return ret
+
+    def to_ndjson(self):
+        """Serialize the records as compact JSON, with one line for each record"""
+        lines = [
+            json.dumps(d, separators=(",", ":"), default=repr) for d in self.to_dicts()
+        ]
+        return "".join(line + "\n" for line in lines)
+
+
+class LogRecordRing(logging.Handler):
+    """A logging handler that keeps the most recent `maxlen` records in a ring buffer.
+
+    When the ring is full, the oldest records are discarded, and a warning record
+    that counts them is included in the next `read()`.
+    """
+
+    def __init__(self, maxlen=10000, level=logging.DEBUG):
+        super().__init__(level)
+        self.records = collections.deque(maxlen=maxlen)
+        self.dropped = 0
+        self.t0 = time.time()
 
-    def write(self, msg):
-        self._value = self._value + msg
-        return len(msg)
+    def emit(self, rec):
+        exception = tb_lines = None
+
+        etype, einst, exc_tb = rec.exc_info or sys.exc_info()
+        if etype is not None:
+            from traceback import format_exception_only, format_tb
+
+            exception = format_exception_only(etype, einst)[0].rstrip()
+            tb_lines = "".join(format_tb(exc_tb)).splitlines()
+
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+
+        self.records.append(
+            LogRecordFields(
+                message=rec.getMessage(),
+                time=rec.created,
+                elapsed_seconds=rec.created - self.t0,
+                level=rec.levelname,
+                object=getattr(rec, "object", None),
+                object_log_name=getattr(rec, "owned_name", None),
+                source_file=rec.pathname,
+                source_line=rec.lineno,
+                process=rec.process,
+                thread=rec.threadName,
+                exception=exception,
+                traceback=tb_lines,
+            )
+        )
 
     def read(self):
-        ret, self._value = self._value, ""
+        """Remove and return the records captured since the last call.
+
+        Returns:
+            LogRecords instance
+        """
+        with self.lock:
+            ret = LogRecords(self.records)
+            self.records.clear()
+            dropped, self.dropped = self.dropped, 0
+
+        if dropped > 0:
+            now = time.time()
+            warning = LogRecordFields(
+                message=f"discarded {dropped} log records that overflowed the host log buffer",
+                time=now,
+                elapsed_seconds=now - self.t0,
+                level="WARNING",
+                object=None,
+                object_log_name=None,
+                source_file=__file__,
+                source_line=None,
+                process=os.getpid(),
+                thread=None,
+                exception=None,
+                traceback=None,
+            )
+            ret.insert(0, warning)
+
         return ret
 
-    def flush(self):
-        pass
+
+class log_records(property_.list, type=LogRecords):
+    """property trait for a `LogRecords` list"""
 
 
 class LogStderr(core.Device):
@@ -178,59 +287,6 @@ class Email(core.Device):
         return subject, message
 
 
-class JSONFormatter(logging.Formatter):
-    _last = []
-
-    def __init__(self, *args, **kws):
-        super().__init__(*args, **kws)
-        self.t0 = time.time()
-
-    @staticmethod
-    def json_serialize_dates(obj):
-        """JSON serializer for objects not serializable by default json code"""
-
-        if isinstance(obj, (datetime.datetime, datetime.date)):
-            return obj.isoformat()
-        raise TypeError(f"Type {type(obj).__qualname__} not serializable")
-
-    def format(self, rec):
-        """Return a YAML string for each logger record"""
-
-        # if isinstance(rec, core.Device):
-        #     log_prefix = rec._owned_name.replace(".", ",")
-        # else:
-        #     log_prefix = ''
-
-        # object = getattr(rec, 'object', None)
-
-        msg = dict(
-            message=rec.msg,
-            time=datetime.datetime.fromtimestamp(rec.created),
-            elapsed_seconds=rec.created - self.t0,
-            level=rec.levelname,
-            object=getattr(rec, "object", None),
-            object_log_name=getattr(rec, "owned_name", None),
-            source_file=rec.pathname,
-            source_line=rec.lineno,
-            process=rec.process,
-            thread=rec.threadName,
-        )
-
-        if rec.threadName != "MainThread":
-            msg["thread"] = rec.threadName
-
-        etype, einst, exc_tb = sys.exc_info()
-        if etype is not None:
-            from traceback import format_exception_only, format_tb
-
-            msg["exception"] = format_exception_only(etype, einst)[0].rstrip()
-            msg["traceback"] = "".join(format_tb(exc_tb)).splitlines()
-
-        self._last.append((rec, msg))
-
-        return json.dumps(msg, indent=True, default=self.json_serialize_dates) + ","
-
-
 class Host(core.Device):
     # Settings
     git_commit_in = value.str(
@@ -239,20 +295,22 @@ class Host(core.Device):
         help="git commit on open() if run inside a git repo with this branch name",
     )
 
+    log_max_records = value.int(
+        10000,
+        min=1,
+        help="maximum number of log records held between reads of the host log",
+    )
+
     time_format = "%Y-%m-%d %H:%M:%S"
 
     def open(self):
         """The host setup method tries to commit current changes to the tree"""
-        log_formatter = JSONFormatter()
-        stream = LogStreamBuffer()
-        sh = logging.StreamHandler(stream)
-        sh.setFormatter(log_formatter)
-        sh.setLevel(logging.DEBUG)
+        handler = LogRecordRing(maxlen=self.log_max_records)
 
         # Add to the labbench logger handler
         logger = logging.getLogger("labbench")
         logger.setLevel(logging.DEBUG)
-        logger.addHandler(sh)
+        logger.addHandler(handler)
 
         # git repository information
         try:
@@ -267,9 +325,7 @@ class Host(core.Device):
 
         self.backend = {
             "logger": logger,
-            "log_stream": stream,
-            "log_handler": sh,
-            "log_formatter": log_formatter,
+            "log_handler": handler,
             "repo": repo,
         }
 
@@ -289,10 +345,6 @@ class Host(core.Device):
             self.backend["logger"].removeHandler(self.backend["log_handler"])
         except (AttributeError, TypeError):
             pass
-        try:
-            self.backend["log_stream"].close()
-        except (AttributeError, TypeError):
-            pass
 
     def metadata(self):
         """Generate the metadata associated with the host and python distribution"""
@@ -320,20 +372,10 @@ class Host(core.Device):
         now = datetime.datetime.now()
         return f"{now.strftime(self.time_format)}.{now.microsecond}"
 
-    @property_.list()
+    @log_records()
     def log(self):
-        """Get the current host log contents."""
-        self.backend["log_handler"].flush()
-        txt = self.backend["log_stream"].read()
-        if len(txt) > 1:
-            self._txt = txt
-            self._serialized = "[" + txt[:-2] + "]"
-            self._ret = json.loads(
-                self._serialized
-            )  # self.backend['log_stream'].read().replace('\n', '\r\n')
-            return self._ret
-        else:
-            return {}
+        """Get the host log records captured since the last get."""
+        return self.backend["log_handler"].read()
 
     @property_.str(cache=True)
     def git_commit_id(self):
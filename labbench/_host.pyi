@@ -2,11 +2,19 @@ import logging
 from . import _device as core
 from typing import Any
 
-class LogStreamBuffer:
-    def __init__(self) -> None: ...
-    def write(self, msg): ...
+LogRecordFields: Any
+
+class LogRecords(list):
+    def to_dicts(self): ...
+    def to_ndjson(self): ...
+
+class LogRecordRing(logging.Handler):
+    records: Any
+    dropped: int
+    t0: Any
+    def __init__(self, maxlen: int = ..., level=...) -> None: ...
+    def emit(self, rec) -> None: ...
     def read(self): ...
-    def flush(self) -> None: ...
 
 class LogStderr(core.Device):
     def __init__(self, resource: str = "str"): ...
@@ -37,16 +45,15 @@ class Email(core.Device):
     def close(self) -> None: ...
     def send_summary(self): ...
 
-class JSONFormatter(logging.Formatter):
-    t0: Any
-    def __init__(self, *args, **kws) -> None: ...
-    @staticmethod
-    def json_serialize_dates(obj): ...
-    def format(self, rec): ...
-
 class Host(core.Device):
-    def __init__(self, resource: str = "str", git_commit_in: str = "NoneType"): ...
+    def __init__(
+        self,
+        resource: str = "str",
+        git_commit_in: str = "NoneType",
+        log_max_records: str = "int",
+    ): ...
     git_commit_in: Any
+    log_max_records: Any
     time_format: str
     backend: Any
     def open(self) -> None: ...
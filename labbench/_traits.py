@@ -32,15 +32,22 @@ the objects in an interpreter instead of reverse-engineering this code.
 from . import util
 
 import typing
+from collections.abc import Mapping
 from warnings import warn
 from functools import wraps
 import validators as _val
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 
 from inspect import isclass
 import inspect
+import bisect
+import logging
+import collections
 import numbers
+import os
 import re
+import threading
+import time
 
 # for common types
 from pathlib import Path
@@ -105,6 +112,10 @@ class Trait:
         gets: True if the trait supports reads
 
         cache: if True, interact with the device only once, then return copies (state traits only)
+        ttl: if not None, cache the value, and interact with the device again after this many seconds (property traits only)
+        invalidated_by: names of traits (on set) or methods (on call) that discard the cached value (property traits only)
+        calibration: a trait from `calibrate_from_table` that calibrates each returned value (data return traits only)
+        calibration_axis: name of the owner attribute with the table index of each returned value, or None to use the index of returned pandas objects (data return traits only)
         only: value allowlist; others raise ValueError
 
     Arguments:
@@ -132,6 +143,10 @@ class Trait:
     sets: bool = True
     gets: bool = True
     cache: bool = False
+    ttl: float = None
+    invalidated_by: tuple = tuple()
+    calibration: Undefined = None
+    calibration_axis: str = None
     only: tuple = tuple()
     allow_none: bool = False
     remap: dict = {}
@@ -143,6 +158,32 @@ class Trait:
     _returner = None
     _decorated_funcs = []
 
+    # owner classes that hold this trait under its name, which skip the recursion check in __get__
+    _owner_classes = frozenset()
+
+    # parameters that are compiled into the accessor closures; setting
+    # any of these discards the closures so that they are rebuilt
+    _ACCESSOR_PARAMS = frozenset(
+        (
+            "name",
+            "type",
+            "sets",
+            "gets",
+            "cache",
+            "ttl",
+            "calibration",
+            "calibration_axis",
+            "only",
+            "allow_none",
+            "remap",
+            "remap_inbound",
+            "key",
+            "_getter",
+            "_setter",
+            "_returner",
+        )
+    )
+
     # __decorator_action__ = None
 
     def __init__(self, *args, **kws):
@@ -171,11 +212,19 @@ class Trait:
 
         # check role and related parameter dependencies
         if self.role == self.ROLE_VALUE:
-            invalid_args = ("remap", "key", "func")
+            invalid_args = (
+                "remap",
+                "key",
+                "func",
+                "ttl",
+                "invalidated_by",
+                "calibration",
+                "calibration_axis",
+            )
         elif self.role == self.ROLE_PROPERTY:
-            invalid_args = ("default", "func")
+            invalid_args = ("default", "func", "calibration", "calibration_axis")
         elif self.role == self.ROLE_DATARETURN:
-            invalid_args = "default", "key", "sets", "gets"
+            invalid_args = "default", "key", "sets", "gets", "ttl", "invalidated_by"
         else:
             clsname = self.__class__.__qualname__
             raise ValueError(
@@ -213,6 +262,12 @@ class Trait:
         if len(kws["remap"]) != len(self.remap_inbound):
             raise ValueError(f"'remap' has duplicate values")
 
+        if kws.get("ttl", None) is not None and not kws["ttl"] > 0:
+            raise ValueError(f"'ttl' must be a positive number of seconds")
+
+        if isinstance(kws.get("invalidated_by", None), str):
+            kws["invalidated_by"] = (kws["invalidated_by"],)
+
         # set value traits
         for k, v in kws.items():
             setattr(self, k, v)
@@ -294,6 +349,10 @@ class Trait:
         This is also where we finalize selecting decorator behavior; is it a property or a method?
         """
 
+        # resolve the recursion check in __get__ once for this owner class
+        if owner_cls.__dict__.get(self.name, None) is self:
+            self._owner_classes = self._owner_classes | {owner_cls}
+
         if self.role == self.ROLE_VALUE and len(self._decorated_funcs) > 0:
             raise AttributeError(
                 f"tried to combine a default value and a decorator implementation in {self}"
@@ -301,6 +360,7 @@ class Trait:
         elif self.role == self.ROLE_DATARETURN and len(self._decorated_funcs) == 0:
             raise AttributeError(f"decorate a method to tag its return data")
         elif len(self._decorated_funcs) == 0:
+            self._compile_accessors()
             return
 
         positional_argcounts = [
@@ -309,6 +369,13 @@ class Trait:
         ]
 
         if self.role == self.ROLE_DATARETURN:
+            if self.calibration is not None and not isinstance(
+                self.calibration, TableCorrectionMixIn
+            ):
+                raise TypeError(
+                    f"calibration argument of {self} must be a trait from calibrate_from_table"
+                )
+
             for func, argcount in zip(self._decorated_funcs, positional_argcounts):
                 if len(self.help.rstrip().strip()) == 0:
                     # take func docstring as default self.help
@@ -333,67 +400,15 @@ class Trait:
                 else:
                     self._setter = func
 
+        self._compile_accessors()
+
     def __init_owner_instance__(self, owner):
         # called by owner.__init__
         pass
 
     @util.hide_in_traceback
     def __set__(self, owner, value):
-        # First, validate the pythonic types
-        if not self.sets:
-            raise AttributeError(f"{self.__str__()} cannot be set")
-
-        # Validate the pythonic value
-        if value is not None:
-            # cast to self.type and validate
-            value = Trait.to_pythonic(self, value)
-            value = self.validate(value, owner)
-
-            if len(self.only) > 0 and not self.contains(self.only, value):
-                raise ValueError(
-                    f"value '{value}' is not among the allowed values {repr(self.only)}"
-                )
-        elif self.allow_none:
-            value = None
-        else:
-            raise ValueError(f"None value not allowed for trait '{repr(self)}'")
-
-        try:
-            value = self.from_pythonic(value)
-        except BaseException as e:
-            name = owner.__class__.__qualname__ + "." + self.name
-            e.args = (e.args[0] + f" in attempt to set '{name}'",) + e.args[1:]
-            raise e
-
-        if self.role == self.ROLE_VALUE:
-            # apply as a value trait
-            owner.__set_value__(self.name, value)
-
-        elif self.role == self.ROLE_PROPERTY:
-            # convert to the outbound representation
-            if len(self.remap) > 0:
-                value = self.remap.get(value, value)
-
-            # send to the device
-            if self._setter is not None:
-                # from the function decorated by this trait
-                self._setter(owner, value)
-
-            elif self.key is not None:
-                # otherwise, use the owner's set_key
-                owner.set_key(self.key, value, self.name)
-
-            else:
-                objname = owner.__class__.__qualname__ + "." + self.name
-                raise AttributeError(
-                    f"cannot set {objname}: no @{self.__repr__(owner_inst=owner)}."
-                    f"setter and no key argument"
-                )
-
-        else:
-            raise AttributeError(f"data return traits cannot be set")
-
-        owner.__notify__(self.name, value, "set", cache=self.cache)
+        self._set_compiled(owner, value)
 
     @util.hide_in_traceback
     def __get__(self, owner, owner_cls=None):
@@ -406,6 +421,10 @@ class Trait:
             retreived value
         """
 
+        if owner is not None and owner_cls in self._owner_classes:
+            # the fast path for owner classes that were checked on definition
+            return self._get_compiled(owner)
+
         # only continue to get the value if the __get__ was called for an owning
         # instance, and owning class is a match for what we were told in __set_name__.
         # otherwise, someone else is trying to access `self` and we
@@ -416,99 +435,408 @@ class Trait:
             # the __dict__ acrobatics avoids a recursive __get__ loop
             return self
 
-        elif self.role == self.ROLE_DATARETURN:
-            # inject the labbench Trait hooks into the return value
-            @wraps(self._returner)
-            def method(*args, **kws):
-                value = self._returner(owner, *args, **kws)
-                return self.__cast_get__(owner, value)
+        return self._get_compiled(owner)
+
+    @util.hide_in_traceback
+    def __cast_get__(self, owner, value, strict=False):
+        """Examine value and either return a valid pythonic value or raise an exception if it cannot be cast.
+
+        Arguments:
+            owner: the class that owns the trait
+            value: the value we need to validate and notify
+        :return:
+        """
+        return self._cast_get_compiled(owner, value)
+
+    ### Accessor compilation
+    # Until they are compiled, these placeholders compile the accessors and then
+    # dispatch to them. The compiled closures are stored in the instance, which
+    # shadows these methods.
+    @util.hide_in_traceback
+    def _get_compiled(self, owner):
+        self._compile_accessors()
+        return self._get_compiled(owner)
+
+    @util.hide_in_traceback
+    def _set_compiled(self, owner, value):
+        self._compile_accessors()
+        return self._set_compiled(owner, value)
+
+    @util.hide_in_traceback
+    def _cast_get_compiled(self, owner, value):
+        self._compile_accessors()
+        return self._cast_get_compiled(owner, value)
+
+    @util.hide_in_traceback
+    def _outbound_compiled(self, owner, value):
+        self._compile_accessors()
+        return self._outbound_compiled(owner, value)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self._ACCESSOR_PARAMS:
+            self._discard_accessors()
+
+    def _discard_accessors(self):
+        for name in (
+            "_get_compiled",
+            "_set_compiled",
+            "_cast_get_compiled",
+            "_outbound_compiled",
+        ):
+            self.__dict__.pop(name, None)
 
-            return method
+    def _compile_accessors(self):
+        """Build closures that implement __get__, __set__, and __cast_get__ for this trait,
+        and the conversion of set values into their outbound (backend) representation.
+
+        Each closure is specialized on the role and parameters of the trait, so
+        that it only includes the steps that the trait needs.
+        """
+        cast_get = self._build_cast_get()
+        self.__dict__["_cast_get_compiled"] = cast_get
+
+        if type(self).__cast_get__ is not Trait.__cast_get__:
+            # respect a subclass implementation
+            cast_get = self.__cast_get__
+
+        outbound = self._build_outbound()
+        self.__dict__["_outbound_compiled"] = outbound
+        self.__dict__["_get_compiled"] = self._build_get(cast_get)
+        self.__dict__["_set_compiled"] = self._build_set(outbound)
+
+    def _warn_get(self, owner, msg):
+        # give warnings (not errors) if the device value fails further validation
+        if hasattr(owner, "_logger"):
+            owner._logger.warning(msg)
+        else:
+            warn(msg)
+
+    def _build_cast_get(self):
+        name = getattr(self, "name", None)
+        allow_none = self.allow_none
+        to_pythonic = self.to_pythonic
+        contains = self.contains
+        only = self.only if len(self.only) > 0 else None
+        notify_cache = self.cache or (self.role == self.ROLE_VALUE)
+
+        @util.hide_in_traceback
+        def cast_get(owner, value):
+            if allow_none and value is None:
+                pass
+            else:
+                # skip validation if None and None values are allowed
+                try:
+                    value = to_pythonic(value)
+                except BaseException as e:
+                    # name = owner.__class__.__qualname__ + '.' + self.name
+                    e.args = (
+                        e.args[0]
+                        + f" in attempt to get '{self.__repr__(owner_inst=owner)}'",
+                    ) + e.args[1:]
+                    raise e
+
+                # TODO: This broke array-like data. Was it ever necessary?
+                # if value != self.validate(value, owner):
+                #     raise ValueError
+                # except ValueError:
+                #     log(f"'{self.__repr__(owner_inst=owner)}' {self.role} received the value {repr(value)}, " \
+                #         f"which fails {repr(self)}.validate()")
+                if value is None and not allow_none:
+                    self._warn_get(
+                        owner,
+                        f"'{self.__repr__(owner_inst=owner)}' {self.role} received value None, which"
+                        f"is not allowed for {repr(self)}",
+                    )
+                if only is not None and not contains(only, value):
+                    self._warn_get(
+                        owner,
+                        f"'{self.__repr__(owner_inst=owner)}' {self.role} received {repr(value)}, which"
+                        f"is not in the valid value list {repr(only)}",
+                    )
+
+            owner.__notify__(name, value, "get", cache=notify_cache)
+
+            return value
+
+        return cast_get
+
+    def _build_get(self, cast_get):
+        name = getattr(self, "name", None)
+
+        if self.role == self.ROLE_DATARETURN:
+            returner = self._returner
+
+            if self.calibration is not None:
+                calibrate = self._build_calibrate()
+                uncalibrated = returner
+
+                @util.hide_in_traceback
+                def returner(owner, *args, **kws):
+                    return calibrate(owner, uncalibrated(owner, *args, **kws))
+
+            @util.hide_in_traceback
+            def get(owner):
+                # inject the labbench Trait hooks into the return value
+                @wraps(returner)
+                def method(*args, **kws):
+                    value = returner(owner, *args, **kws)
+                    return cast_get(owner, value)
+
+                return method
+
+            return get
 
         elif not self.gets:
-            # stop now if this is not a gets Trait
-            raise AttributeError(f"{self.__repr__(owner_inst=owner)} is not gets")
+
+            @util.hide_in_traceback
+            def get(owner):
+                # stop now if this is not a gets Trait
+                raise AttributeError(f"{self.__repr__(owner_inst=owner)} is not gets")
+
+            return get
 
         elif self.role == self.ROLE_VALUE:
-            return owner.__get_value__(self.name)
 
-        # from here on, operate as a property getter
-        if self.cache and self.name in owner.__cache__:
-            # return the cached value if applicable
-            return owner.__cache__[self.name]
+            @util.hide_in_traceback
+            def get(owner):
+                return owner.__get_value__(name)
+
+            return get
 
-        elif self._getter is not None:
+        # from here on, operate as a property getter
+        if self._getter is not None:
             # get value with the decorator implementation, if available
-            value = self._getter(owner)
+            fetch = self._getter
 
-        else:
+        elif self.key is not None:
             # otherwise, get with owner.get_key, if available
-            if self.key is None:
-                # otherwise, 'get'
+            key = self.key
+
+            @util.hide_in_traceback
+            def fetch(owner):
+                return owner.get_key(key, name)
+
+        else:
+
+            @util.hide_in_traceback
+            def fetch(owner):
                 objname = owner.__class__.__qualname__
-                ownername = self.__repr__(owner_inst=owner)
                 raise AttributeError(
-                    f"to set the property {self.name}, decorate a method in {objname} or use the function key argument"
+                    f"to set the property {name}, decorate a method in {objname} or use the function key argument"
                 )
-            value = owner.get_key(self.key, self.name)
 
         # apply remapping as appropriate for the trait
         if len(self.remap_inbound) > 0:
-            value = self.remap_inbound.get(value, value)
+            remap_inbound = self.remap_inbound
 
-        return self.__cast_get__(owner, value, strict=False)
+            @util.hide_in_traceback
+            def get(owner):
+                value = fetch(owner)
+                return cast_get(owner, remap_inbound.get(value, value))
 
-    @util.hide_in_traceback
-    def __cast_get__(self, owner, value, strict=False):
-        """Examine value and either return a valid pythonic value or raise an exception if it cannot be cast.
+        else:
 
-        Arguments:
-            owner: the class that owns the trait
-            value: the value we need to validate and notify
-        :return:
-        """
-        if self.allow_none and value is None:
-            pass
+            @util.hide_in_traceback
+            def get(owner):
+                return cast_get(owner, fetch(owner))
+
+        if self.ttl is not None:
+            get_uncached = get
+            ttl = self.ttl
+
+            @util.hide_in_traceback
+            def get(owner):
+                # return the cached value until it expires
+                cache = owner.__cache__
+                expiry = owner.__cache_expiry__
+                if name in cache and expiry.get(name, 0) > time.monotonic():
+                    return cache[name]
+                value = get_uncached(owner)
+                expiry[name] = time.monotonic() + ttl
+                return value
+
+        elif self.cache:
+            get_uncached = get
+
+            @util.hide_in_traceback
+            def get(owner):
+                # return the cached value if applicable
+                cache = owner.__cache__
+                if name in cache:
+                    return cache[name]
+                return get_uncached(owner)
+
+        return get
+
+    def _build_outbound(self):
+        name = getattr(self, "name", None)
+
+        # the equivalent of Trait.to_pythonic, which bypasses subclass implementations
+        to_pythonic = self.type
+        validate = self.validate
+        contains = self.contains
+        only = self.only if len(self.only) > 0 else None
+        allow_none = self.allow_none
+        if type(self).from_pythonic is Trait.from_pythonic:
+            from_pythonic = None
         else:
-            # skip validation if None and None values are allowed
-            try:
-                value = self.to_pythonic(value)
-            except BaseException as e:
-                # name = owner.__class__.__qualname__ + '.' + self.name
-                e.args = (
-                    e.args[0]
-                    + f" in attempt to get '{self.__repr__(owner_inst=owner)}'",
-                ) + e.args[1:]
-                raise e
-
-            # Once we have a python value, give warnings (not errors) if the device value fails further validation
-            if hasattr(owner, "_logger"):
-                log = owner._logger.warning
+            from_pythonic = self.from_pythonic
+
+        @util.hide_in_traceback
+        def outbound(owner, value):
+            if value is not None:
+                # cast to self.type and validate
+                value = validate(to_pythonic(value), owner)
+
+                if only is not None and not contains(only, value):
+                    raise ValueError(
+                        f"value '{value}' is not among the allowed values {repr(only)}"
+                    )
+            elif not allow_none:
+                raise ValueError(f"None value not allowed for trait '{repr(self)}'")
+
+            if from_pythonic is not None:
+                try:
+                    value = from_pythonic(value)
+                except BaseException as e:
+                    objname = owner.__class__.__qualname__ + "." + name
+                    e.args = (e.args[0] + f" in attempt to set '{objname}'",) + e.args[1:]
+                    raise e
+
+            return value
+
+        if self.role == self.ROLE_PROPERTY and len(self.remap) > 0:
+            # convert to the outbound representation
+            coerce = outbound
+            remap = self.remap
+
+            @util.hide_in_traceback
+            def outbound(owner, value):
+                value = coerce(owner, value)
+                return remap.get(value, value)
+
+        return outbound
+
+    def _build_calibrate(self):
+        table_trait = self.calibration
+        axis = self.calibration_axis
+
+        @util.hide_in_traceback
+        def calibrate(owner, value):
+            # apply the calibration table to the whole return value in one pass
+            if value is None:
+                return value
+
+            if axis is not None:
+                index = np.asarray(getattr(owner, axis))
+            elif isinstance(value, (pd.Series, pd.DataFrame)):
+                index = value.index.values
             else:
-                log = warn
-
-            # TODO: This broke array-like data. Was it ever necessary?
-            # if value != self.validate(value, owner):
-            #     raise ValueError
-            # except ValueError:
-            #     log(f"'{self.__repr__(owner_inst=owner)}' {self.role} received the value {repr(value)}, " \
-            #         f"which fails {repr(self)}.validate()")
-            if value is None and not self.allow_none:
-                log(
-                    f"'{self.__repr__(owner_inst=owner)}' {self.role} received value None, which"
-                    f"is not allowed for {repr(self)}"
-                )
-            if len(self.only) > 0 and not self.contains(self.only, value):
-                log(
-                    f"'{self.__repr__(owner_inst=owner)}' {self.role} received {repr(value)}, which"
-                    f"is not in the valid value list {repr(self.only)}"
+                raise TypeError(
+                    f"{self.__repr__(owner_inst=owner)} needs calibration_axis to "
+                    f"calibrate {type(value).__qualname__} return values"
                 )
 
-        owner.__notify__(
-            self.name, value, "get", cache=self.cache or (self.role == self.ROLE_VALUE)
-        )
+            if isinstance(value, pd.DataFrame):
+                if index.ndim == 1:
+                    # one index value for each row
+                    index = index[:, np.newaxis]
+                cal = table_trait.lookup_cal_trace(value.values, index, owner)
+                if cal is None:
+                    return value
+                return pd.DataFrame(cal, index=value.index, columns=value.columns)
+
+            cal = table_trait.lookup_cal_trace(value, index, owner)
+            if cal is None:
+                return value
+            elif isinstance(value, pd.Series):
+                return pd.Series(cal, index=value.index, name=value.name)
+            else:
+                return cal
 
-        return value
+        return calibrate
+
+    def _build_set(self, outbound):
+        name = getattr(self, "name", None)
+
+        if not self.sets:
+
+            @util.hide_in_traceback
+            def set_(owner, value):
+                raise AttributeError(f"{self.__str__()} cannot be set")
+
+            return set_
+
+        notify_cache = self.cache
+
+        if self.role == self.ROLE_VALUE:
+            # apply as a value trait
+            @util.hide_in_traceback
+            def set_(owner, value):
+                value = outbound(owner, value)
+                owner.__set_value__(name, value)
+                owner.__notify__(name, value, "set", cache=notify_cache)
+
+        elif self.role == self.ROLE_PROPERTY:
+            # send to the device
+            if self._setter is not None:
+                # from the function decorated by this trait
+                send = self._setter
+
+            elif self.key is not None:
+                # otherwise, use the owner's set_key
+                key = self.key
+
+                @util.hide_in_traceback
+                def send(owner, value):
+                    owner.set_key(key, value, name)
+
+            else:
+
+                @util.hide_in_traceback
+                def send(owner, value):
+                    objname = owner.__class__.__qualname__ + "." + name
+                    raise AttributeError(
+                        f"cannot set {objname}: no @{self.__repr__(owner_inst=owner)}."
+                        f"setter and no key argument"
+                    )
+
+            @util.hide_in_traceback
+            def set_(owner, value):
+                value = outbound(owner, value)
+                send(owner, value)
+                owner.__notify__(name, value, "set", cache=notify_cache)
+
+        else:
+
+            @util.hide_in_traceback
+            def set_(owner, value):
+                outbound(owner, value)
+                raise AttributeError(f"data return traits cannot be set")
+
+        return set_
+
+    def _cache_valid(self, owner):
+        """returns True if a get would return the cached value without interacting
+        with the device"""
+        cache = owner.__cache__
+
+        if self.ttl is not None:
+            expiry = owner.__cache_expiry__.get(self.name, 0)
+            return self.name in cache and expiry > time.monotonic()
+        else:
+            return self.cache and self.name in cache
+
+    def _batch_keyed(self, gets=False, sets=False):
+        """returns True if this is a property trait that can be batched with other
+        keyed traits through get_keys or set_keys"""
+        return (
+            self.role == self.ROLE_PROPERTY
+            and self.key is not None
+            and (not gets or (self.gets and self._getter is None))
+            and (not sets or (self.sets and self._setter is None))
+        )
 
     @util.hide_in_traceback
     def to_pythonic(self, value):
@@ -624,6 +952,7 @@ class Trait:
             )
 
         obj.__dict__.update(attrs)
+        obj._discard_accessors()
         return obj
 
 
@@ -633,10 +962,6 @@ Trait.__init_subclass__()
 @contextmanager
 def hold_trait_notifications(owner):
     def skip_notify(name, value, type, cache):
-        old = owner.__cache__.setdefault(name, Undefined)
-
-        msg = dict(new=value, old=old, owner=owner, name=name, type=type, cache=cache)
-
         owner.__cache__[name] = value
 
     original, owner.__notify__ = owner.__notify__, skip_notify
@@ -644,24 +969,109 @@ def hold_trait_notifications(owner):
     owner.__notify__ = original
 
 
+class TraitMessage(Mapping):
+    """an immutable notification message that is shared by each handler of a trait event.
+
+    Items are accessed by key (`msg["new"]`) or by attribute (`msg.new`).
+    """
+
+    __slots__ = ("new", "old", "owner", "name", "type", "cache")
+
+    def __init__(self, new, old, owner, name, type, cache):
+        # the slot descriptors bypass __setattr__ faster than object.__setattr__
+        _set_msg_new(self, new)
+        _set_msg_old(self, old)
+        _set_msg_owner(self, owner)
+        _set_msg_name(self, name)
+        _set_msg_type(self, type)
+        _set_msg_cache(self, cache)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("trait notification messages are immutable")
+
+    __delattr__ = __setattr__
+
+    def __getitem__(self, key):
+        try:
+            return _msg_getters[key](self)
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        items = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"{type(self).__qualname__}({items})"
+
+
+(
+    _set_msg_new,
+    _set_msg_old,
+    _set_msg_owner,
+    _set_msg_name,
+    _set_msg_type,
+    _set_msg_cache,
+) = (getattr(TraitMessage, k).__set__ for k in TraitMessage.__slots__)
+
+_msg_getters = {k: getattr(TraitMessage, k).__get__ for k in TraitMessage.__slots__}
+
+
+def _invalidating_method(func, names):
+    """wrap the method `func` to invalidate the cached values of the property traits `names`
+    after each call"""
+
+    @wraps(func)
+    def method(self, *args, **kws):
+        try:
+            return func(self, *args, **kws)
+        finally:
+            self.invalidate_cache(*names)
+
+    method._invalidates_cache = names
+    return method
+
+
 class HasTraits(metaclass=HasTraitsMeta):
     __notify_list__ = {}
+    __notify_index__ = {}
+    __notify_quiet_index__ = None
     __cls_namespace__ = {}
 
+    # {trait or method name: (names of property traits it invalidates)}
+    _cache_invalidators = {}
+
+    # {trait name: (names of dependent traits with bounds derived from its bounds)}
+    _bounds_dependents = {}
+
     def __init__(self, **values):
         # who is informed on new get or set values
         self.__notify_list__ = {}
+        self.__notify_index__ = {}
+        self.__notify_quiet_index__ = None
 
         # for cached properties and values in this instance
         self.__cache__ = {}
+        self.__cache_expiry__ = {}
         self._calibrations = {}
 
+        # memoized (min, max) of dependent traits
+        self.__bounds_cache__ = {}
+
         for name, trait in self._traits.items():
             trait.__init_owner_instance__(self)
 
             if trait.default is not Undefined:
                 self.__cache__[name] = trait.default
 
+        # traits that invalidate cached property values when they are set
+        triggers = [n for n in self._cache_invalidators if n in self._traits]
+        if len(triggers) > 0:
+            observe(self, self._on_invalidating_set, name=triggers, type_="set")
+
     @util.hide_in_traceback
     def __init_subclass__(cls):
         cls._traits = dict(getattr(cls, "_traits", {}))
@@ -712,17 +1122,173 @@ class HasTraits(metaclass=HasTraitsMeta):
             elif trait.role == Trait.ROLE_PROPERTY:
                 cls._property_attrs.append(name)
 
+        cls._init_cache_invalidators()
+        cls._init_bounds_dependents()
+
+    @classmethod
+    def _init_cache_invalidators(cls):
+        """index the invalidated_by parameters of property traits, and wrap the methods
+        that invalidate cached values"""
+        invalidators = {}
+
+        for name in cls._property_attrs:
+            for trigger in cls._traits[name].invalidated_by:
+                invalidators.setdefault(trigger, []).append(name)
+
+        cls._cache_invalidators = {k: tuple(v) for k, v in invalidators.items()}
+
+        for trigger, names in cls._cache_invalidators.items():
+            if trigger in cls._traits:
+                # handled on set by each instance
+                continue
+
+            method = getattr(cls, trigger, None)
+            if not callable(method):
+                raise AttributeError(
+                    f"invalidated_by argument of traits {names} refers to '{trigger}', "
+                    f"which is neither a trait nor a method of {cls.__qualname__}"
+                )
+
+            if getattr(method, "_invalidates_cache", None) == names:
+                continue
+
+            if hasattr(method, "_invalidates_cache"):
+                # avoid stacking wrappers from parent classes
+                method = method.__wrapped__
+
+            setattr(cls, trigger, _invalidating_method(method, names))
+
+    @classmethod
+    def _init_bounds_dependents(cls):
+        """index the dependent traits by the name of their base trait"""
+        dependents = {}
+
+        for name, trait in cls._traits.items():
+            if not isinstance(trait, DependentTrait):
+                continue
+            base_name = getattr(trait._trait_dependencies.get("base"), "name", None)
+            if base_name in cls._traits:
+                dependents.setdefault(base_name, []).append(name)
+
+        cls._bounds_dependents = {k: tuple(v) for k, v in dependents.items()}
+
     @util.hide_in_traceback
     def __notify__(self, name, value, type, cache):
-        old = self.__cache__.setdefault(name, Undefined)
+        index = self.__notify_quiet_index__
+        if index is None or self._logger.isEnabledFor(logging.DEBUG):
+            index = self.__notify_index__
+        by_name = index.get(type)
+
+        if by_name is not None:
+            handlers = by_name.get(name) or by_name.get(Any)
+
+            if handlers:
+                if isinstance(value, Trait):
+                    raise TypeError(f"Trait instance returned as a callback value")
 
-        msg = dict(new=value, old=old, owner=self, name=name, type=type, cache=cache)
+                old = self.__cache__.get(name, Undefined)
+                msg = TraitMessage(value, old, self, name, type, cache)
 
-        for handler in self.__notify_list__.values():
-            handler(dict(msg))
+                for handler in handlers:
+                    handler(msg)
 
         self.__cache__[name] = value
 
+    def invalidate_cache(self, *names):
+        """Discard the cached values of property traits, so that the next get
+        interacts with the device.
+
+        Arguments:
+            names: names of the property traits to invalidate (all property traits if empty)
+        """
+        if len(names) == 0:
+            names = self._property_attrs
+        else:
+            for name in names:
+                if name not in self._property_attrs:
+                    raise TypeError(f"'{name}' is not a property trait of {self}")
+
+        for name in names:
+            self.__cache__.pop(name, None)
+            self.__cache_expiry__.pop(name, None)
+
+    def _on_invalidating_set(self, msg):
+        self.invalidate_cache(*self._cache_invalidators[msg["name"]])
+
+    def _invalidate_bounds(self, name):
+        """discard the memoized bounds of the trait `name`, and of the traits derived from it"""
+        self.__bounds_cache__.pop(name, None)
+        for dependent in self._bounds_dependents.get(name, ()):
+            self._invalidate_bounds(dependent)
+
+    def get_many(self, *names):
+        """Get the values of several traits.
+
+        Property traits defined with "key=" are retrieved together in one call to
+        `self.get_keys`, which backends may implement as a single interaction with
+        the device. Other traits, and property traits with valid cached values, are
+        retrieved one at a time.
+
+        Arguments:
+            names: names of the traits to get
+        Returns:
+            dict of {name: value} in the order of `names`
+        """
+        batch = {}
+        for name in names:
+            trait = self._traits.get(name, None)
+            if trait is None:
+                raise AttributeError(f"'{name}' is not a trait of {self}")
+            if trait._batch_keyed(gets=True) and not trait._cache_valid(self):
+                batch[name] = trait
+
+        values = {}
+        if len(batch) > 1:
+            replies = self.get_keys([t.key for t in batch.values()], list(batch))
+            for (name, trait), value in zip(batch.items(), replies):
+                if len(trait.remap_inbound) > 0:
+                    value = trait.remap_inbound.get(value, value)
+                values[name] = trait.__cast_get__(self, value)
+                if trait.ttl is not None:
+                    self.__cache_expiry__[name] = time.monotonic() + trait.ttl
+
+        return {
+            name: values[name] if name in values else getattr(self, name)
+            for name in names
+        }
+
+    def set_many(self, **values):
+        """Set the values of several traits.
+
+        Property traits defined with "key=" are sent together in one call to
+        `self.set_keys`, which backends may implement as a single interaction with
+        the device. The remaining traits are then set one at a time, in the order
+        they are given.
+
+        Arguments:
+            values: {name: value} for each trait to set
+        """
+        batch = {}
+        for name, value in values.items():
+            trait = self._traits.get(name, None)
+            if trait is None:
+                raise AttributeError(f"'{name}' is not a trait of {self}")
+            if trait._batch_keyed(sets=True):
+                # validate all values before sending any
+                batch[name] = trait._outbound_compiled(self, value)
+
+        if len(batch) > 1:
+            traits = [self._traits[name] for name in batch]
+            self.set_keys([t.key for t in traits], list(batch.values()), list(batch))
+            for trait, value in zip(traits, batch.values()):
+                self.__notify__(trait.name, value, "set", cache=trait.cache)
+        else:
+            batch = {}
+
+        for name, value in values.items():
+            if name not in batch:
+                setattr(self, name, value)
+
     def set_key(self, key, value, name=None):
         """implement this in subclasses to use `key` to set a parameter value from the
         Device with self.backend.
@@ -748,6 +1314,40 @@ class HasTraits(metaclass=HasTraitsMeta):
             f"implement {clsname}.get_key for access key/value parameters on the device"
         )
 
+    def get_keys(self, keys, names=None):
+        """implement this in subclasses to retrieve the values of several keys
+        in one interaction with the device.
+
+        `get_many` calls this for batches of property traits defined with "key=".
+        By default, this calls `get_key` for each key.
+
+        Arguments:
+            keys: sequence of keys to retrieve
+            names: sequence of corresponding trait names (or None)
+        Returns:
+            list of values in the order of `keys`
+        """
+        if names is None:
+            names = [None] * len(keys)
+        return [self.get_key(key, name) for key, name in zip(keys, names)]
+
+    def set_keys(self, keys, values, names=None):
+        """implement this in subclasses to set the values of several keys
+        in one interaction with the device.
+
+        `set_many` calls this for batches of property traits defined with "key=".
+        By default, this calls `set_key` for each key.
+
+        Arguments:
+            keys: sequence of keys to set
+            values: sequence of corresponding values
+            names: sequence of corresponding trait names (or None)
+        """
+        if names is None:
+            names = [None] * len(keys)
+        for key, value, name in zip(keys, values, names):
+            self.set_key(key, value, name)
+
     @util.hide_in_traceback
     def __get_value__(self, name):
         """Get value of a trait for this value traits instance
@@ -786,23 +1386,80 @@ class Any(Trait, type=None):
 
 
 Trait.__annotations__["key"] = Any
+Trait.__annotations__["calibration"] = Any
+
+
+def _index_handlers(obj):
+    """rebuild the lookup of handler tuples by event type and trait name in `obj`.
+
+    Handlers that observe any trait name are indexed under `Any`, and are also merged
+    into the tuple for each explicitly observed name, so that handlers are
+    called in the order they were registered.
+    """
+    index = {}
+
+    for handler, (names, types) in obj.__notify_list__.items():
+        for type_ in types:
+            by_name = index.setdefault(type_, {})
+            if names is Any:
+                # also include this handler in any names indexed so far
+                by_name.setdefault(Any, [])
+                for handlers in by_name.values():
+                    handlers.append(handler)
+            else:
+                for name in names:
+                    if name not in by_name:
+                        by_name[name] = list(by_name.get(Any, []))
+                    by_name[name].append(handler)
+
+    obj.__notify_index__ = {
+        type_: {name: tuple(handlers) for name, handlers in by_name.items()}
+        for type_, by_name in index.items()
+    }
+
+    # the index to use while the owner logger is not enabled for DEBUG
+    if any(getattr(h, "_debug_only", False) for h in obj.__notify_list__):
+        obj.__notify_quiet_index__ = {
+            type_: {
+                name: tuple(h for h in handlers if not getattr(h, "_debug_only", False))
+                for name, handlers in by_name.items()
+            }
+            for type_, by_name in obj.__notify_index__.items()
+        }
+    else:
+        obj.__notify_quiet_index__ = None
+
+
+def debug_handler(handler):
+    """mark `handler` as a notification handler that only emits debug log messages.
+
+    Owners skip it, without building a notification message, unless
+    their `_logger` is enabled for DEBUG.
+    """
+    handler._debug_only = True
+    return handler
 
 
 def observe(obj, handler, name=Any, type_=("get", "set")):
     """Register a handler function to be called whenever a trait changes.
 
     The handler function takes a single message argument. This
-    dictionary message has the keys
+    immutable message (a `TraitMessage` mapping) has the keys
 
     * `new`: the updated value
     * `old`: the previous value
     * `owner`: the object that owns the trait
     * `name`: the name of the trait
-    * 'event': 'set' or 'get'
+    * `type`: 'set' or 'get'
+    * `cache`: whether the value is a cached (constant) value
+
+    Handlers are indexed by trait name and event type when they are registered,
+    so that no message is built for events that no handler observes.
 
     Arguments:
         handler: the handler function to call when the value changes
-        names: notify only changes to these trait names (None to disable filtering)
+        name: notify only changes to these trait names (Any to disable filtering)
+        type_: notify only these event types ('get', 'set', or a tuple of both)
     """
 
     def validate_name(n):
@@ -823,26 +1480,18 @@ def observe(obj, handler, name=Any, type_=("get", "set")):
     elif isinstance(name, (tuple, list)):
         for n in name:
             validate_name(n)
+        name = tuple(name)
     elif name is not Any:
         raise ValueError(
             f"name argument {name} has invalid type - must be one of (str, tuple, list), or the value Any"
         )
 
-    if isinstance(type, str):
+    if isinstance(type_, str):
         type_ = (type_,)
 
-    def wrapped(msg):
-        # filter according to name and type
-        if name is not Any and msg["name"] not in name:
-            return
-        elif msg["type"] not in type_:
-            return
-        elif isinstance(msg["new"], Trait):
-            raise TypeError(f"Trait instance returned as a callback value")
-        handler(msg)
-
     if isinstance(obj, HasTraits):
-        obj.__notify_list__[handler] = wrapped
+        obj.__notify_list__[handler] = (name, tuple(type_))
+        _index_handlers(obj)
     else:
         raise TypeError("object to observe must be an instance of Device")
 
@@ -858,6 +1507,7 @@ def unobserve(obj, handler):
             ex = None
         if ex:
             raise ValueError(f"{handler} was not registered to observe {obj}")
+        _index_handlers(obj)
     else:
         raise TypeError("object to unobserve must be an instance of Device")
 
@@ -928,10 +1578,173 @@ class DependentTrait(Trait):
         return obj
 
 
+class CalibrationLookup:
+    """a 1-D lookup table of `y` as a function of `x`, interpolated with `np.searchsorted`
+    on sorted contiguous arrays.
+
+    Scalar lookups return a python float, and array lookups return an array
+    of the same shape, so that a whole trace can be calibrated in one call.
+    Inputs outside of the range of `x` are clipped to the first or last table entry.
+
+    Arguments:
+        x: 1-D vector of lookup points (duplicates after the first and NaN are dropped)
+        y: 1-D vector of the values at each lookup point
+        interpolation: one of "nearest", "linear", or "cubic" (a natural cubic spline)
+    """
+
+    INTERPOLATIONS = ("nearest", "linear", "cubic")
+
+    def __init__(self, x, y, interpolation="nearest"):
+        if interpolation not in self.INTERPOLATIONS:
+            raise ValueError(
+                f"interpolation must be one of {self.INTERPOLATIONS}, not {repr(interpolation)}"
+            )
+
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if x.shape != y.shape:
+            raise ValueError("x and y must have the same length")
+
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if x.size == 0:
+            raise ValueError("calibration lookup needs at least one valid (x, y) pair")
+
+        # sort, keeping only the first of each duplicated x
+        x, first = np.unique(x, return_index=True)
+        self.x = np.ascontiguousarray(x)
+        self.y = np.ascontiguousarray(y[first])
+
+        if interpolation != "nearest" and self.x.size < 2:
+            interpolation = "nearest"
+        elif interpolation == "cubic" and self.x.size < 3:
+            interpolation = "linear"
+        self.interpolation = interpolation
+
+        if interpolation == "cubic":
+            self._d2y = self._spline_second_derivatives(self.x, self.y)
+
+        # python lists for fast scalar lookups with bisect
+        self._x_list = self.x.tolist()
+        self._y_list = self.y.tolist()
+
+    def inverse(self):
+        """returns a lookup of `x` as a function of `y`"""
+        return type(self)(self.y, self.x, self.interpolation)
+
+    def in_range(self, x):
+        """returns True if all of `x` is within the range of the table"""
+        lo, hi = self._x_list[0], self._x_list[-1]
+        if isinstance(x, (float, int, numbers.Real)):
+            return lo <= x <= hi
+        x = np.asarray(x)
+        return bool(np.all((x >= lo) & (x <= hi)))
+
+    @staticmethod
+    def _spline_second_derivatives(x, y):
+        """solve the tridiagonal system for a natural cubic spline (Thomas algorithm)"""
+        h = np.diff(x)
+        slope = np.diff(y) / h
+        n = x.size
+
+        rhs = 6 * np.diff(slope)
+        diag = 2 * (h[:-1] + h[1:])
+        sub = h[1:-1].copy()
+
+        # forward elimination
+        for i in range(1, n - 2):
+            w = sub[i - 1] / diag[i - 1]
+            diag[i] -= w * sub[i - 1]
+            rhs[i] -= w * rhs[i - 1]
+
+        # back substitution
+        d2y = np.zeros(n)
+        d2y[n - 2] = rhs[-1] / diag[-1]
+        for i in range(n - 4, -1, -1):
+            d2y[i + 1] = (rhs[i] - sub[i] * d2y[i + 2]) / diag[i]
+
+        return d2y
+
+    def __call__(self, x):
+        if isinstance(x, (float, int)) or (
+            isinstance(x, numbers.Real) and not isinstance(x, np.ndarray)
+        ):
+            return self._lookup_scalar(float(x))
+        else:
+            return self._lookup_array(np.asarray(x, dtype=float))
+
+    def _lookup_scalar(self, x):
+        xs, ys = self._x_list, self._y_list
+        n = len(xs)
+
+        if x != x:
+            # NaN
+            return x
+        elif x <= xs[0]:
+            return ys[0]
+        elif x >= xs[-1]:
+            return ys[-1]
+
+        i = bisect.bisect_right(xs, x) - 1
+
+        if self.interpolation == "nearest":
+            # ties go to the larger x
+            return ys[i] if x - xs[i] < xs[i + 1] - x else ys[i + 1]
+
+        h = xs[i + 1] - xs[i]
+        b = (x - xs[i]) / h
+        a = 1 - b
+        y = a * ys[i] + b * ys[i + 1]
+
+        if self.interpolation == "cubic":
+            d2y = self._d2y
+            y += ((a**3 - a) * d2y[i] + (b**3 - b) * d2y[i + 1]) * h**2 / 6
+
+        return y
+
+    @staticmethod
+    def nearest_index(xs, x):
+        """returns the index of the nearest entry in the sorted array `xs` for each element
+        of `x` (ties go to the larger entry)"""
+        if xs.size == 1:
+            return np.zeros(np.shape(x), dtype=int)
+        i = np.clip(np.searchsorted(xs, x, side="left"), 1, xs.size - 1)
+        i -= (x - xs[i - 1]) < (xs[i] - x)
+        return i
+
+    @staticmethod
+    def bracket(xs, x):
+        """returns (i, b) for each element of `x` (clipped to the range of the sorted array `xs`),
+        where x == (1 - b) * xs[i] + b * xs[i + 1]"""
+        xc = np.clip(x, xs[0], xs[-1])
+        i = np.clip(np.searchsorted(xs, xc, side="right") - 1, 0, xs.size - 2)
+        return i, (xc - xs[i]) / (xs[i + 1] - xs[i])
+
+    def _lookup_array(self, x):
+        xs, ys = self.x, self.y
+
+        if self.interpolation == "linear":
+            y = np.interp(x, xs, ys)
+
+        elif self.interpolation == "nearest":
+            y = ys[self.nearest_index(xs, x)]
+
+        else:
+            i, b = self.bracket(xs, x)
+            a = 1 - b
+            h = xs[i + 1] - xs[i]
+            d2y = self._d2y
+            y = a * ys[i] + b * ys[i + 1]
+            y += ((a**3 - a) * d2y[i] + (b**3 - b) * d2y[i + 1]) * h**2 / 6
+
+        return np.where(np.isnan(x), np.nan, y)
+
+
 class RemappingCorrectionMixIn(DependentTrait):
     """act as another BoundedNumber trait calibrated with a mapping"""
 
     mapping: Any = None  # really a pandas Series
+    interpolation: str = "nearest"
 
     EMPTY_STORE = dict(by_cal=None, by_uncal=None)
 
@@ -940,14 +1753,14 @@ class RemappingCorrectionMixIn(DependentTrait):
         if by_uncal is None:
             return None
         else:
-            return by_uncal.min()
+            return by_uncal.y.min()
 
     def _max(self, owner):
         by_uncal = owner._calibrations.get(self.name, {}).get("by_uncal", None)
         if by_uncal is None:
             return None
         else:
-            return by_uncal.max()
+            return by_uncal.y.max()
 
     def __init_owner_instance__(self, owner):
         self.set_mapping(self.mapping, owner=owner)
@@ -967,49 +1780,47 @@ class RemappingCorrectionMixIn(DependentTrait):
         )
 
     def lookup_cal(self, uncal, owner):
-        """look up and return the calibrated value, given the uncalibrated value"""
-        owner_cal = owner._calibrations.get(self.name, self.EMPTY_STORE)
-        if owner_cal.get("by_uncal", None) is None:
+        """look up and return the calibrated value, given the uncalibrated value
+        (a scalar, or an array to calibrate each element)"""
+        store = owner._calibrations.get(self.name, self.EMPTY_STORE)
+        by_uncal = store.get("by_uncal")
+        if by_uncal is None or uncal is None:
             return None
 
-        try:
-            return owner_cal["by_uncal"].loc[uncal]
-        except KeyError:
-            # spare us pandas details in the traceback
-            util.logger.warning(
-                f"{self.__repr__(owner_inst=owner)} has no entry at {repr(uncal)} {self.label}"
+        # warn only on the first clipped lookup in each owner
+        if not store.get("clip_warned", False) and not by_uncal.in_range(uncal):
+            store["clip_warned"] = True
+            owner._logger.warning(
+                f"{self.__repr__(owner_inst=owner)} calibration is clipped at {self.label} "
+                f"values outside of the calibration table"
             )
 
-        return None
+        return by_uncal(uncal)
 
     def find_uncal(self, cal, owner):
-        """look up the calibrated value for the given uncalibrated value. In the event of a lookup
-        error, then if `self.allow_none` evaluates as True, triggers return of None, or if
-         `self.allow_none` evaluates False, ValueError is raised.
+        """look up the uncalibrated value that gives the calibrated value `cal`
+        (a scalar, or an array to look up each element), or None if no mapping is set.
         """
-        owner_cal = owner._calibrations.get(self.name, self.EMPTY_STORE)
+        by_cal = owner._calibrations.get(self.name, self.EMPTY_STORE).get("by_cal")
 
-        if owner_cal["by_uncal"] is None:
+        if by_cal is None:
             return None
 
-        i = owner_cal["by_cal"].index.get_loc(cal, method="nearest")
-        return owner_cal["by_cal"].iloc[i]
+        return by_cal(cal)
 
     def set_mapping(self, series_or_uncal, cal=None, owner=None):
         """set the lookup mapping as `set_mapping(series)`, where `series` is a pandas Series (uncalibrated
-        values in the index), or `set_mapping(cal_vector, uncal_vector)`, where both vectors have 1
+        values in the index), or `set_mapping(uncal_vector, cal_vector)`, where both vectors have 1
         dimension of the same length.
         """
 
         if owner is None:
             raise ValueError(f"must pass owner to set_mapping")
 
-        import pandas as pd
-
         if isinstance(series_or_uncal, pd.Series):
-            by_uncal = pd.Series(series_or_uncal).copy()
+            uncal, cal = series_or_uncal.index.values, series_or_uncal.values
         elif cal is not None:
-            by_uncal = pd.Series(cal, index=series_or_uncal)
+            uncal = series_or_uncal
         elif series_or_uncal is None:
             return
         else:
@@ -1017,17 +1828,13 @@ class RemappingCorrectionMixIn(DependentTrait):
                 f"must call set_mapping with None, a Series, or a pair of vector "
                 f"arguments, not {series_or_uncal}"
             )
-        by_uncal = by_uncal[~by_uncal.index.duplicated(keep="first")].sort_index()
-        by_uncal.index.name = "uncal"
-        by_uncal.name = "cal"
 
-        by_cal = pd.Series(by_uncal.index, index=by_uncal.values, name="uncal")
-        by_cal = by_cal[~by_cal.index.duplicated(keep="first")].sort_index()
-        by_cal.index.name = "cal"
+        by_uncal = CalibrationLookup(uncal, cal, self.interpolation)
 
         owner._calibrations.setdefault(self.name, {}).update(
-            by_cal=by_cal, by_uncal=by_uncal
+            by_cal=by_uncal.inverse(), by_uncal=by_uncal
         )
+        owner._invalidate_bounds(self.name)
 
     @util.hide_in_traceback
     def __get__(self, owner, owner_cls=None):
@@ -1090,6 +1897,108 @@ class RemappingCorrectionMixIn(DependentTrait):
             )
 
 
+class CalibrationTableCache:
+    """a process-wide LRU cache of calibration tables parsed from CSV files.
+
+    Entries are keyed on the resolved path, modification time, and size of the file,
+    so that edits to the file are loaded again. The cached tables are shared by
+    every trait that loads the same file, and must be treated as read-only.
+
+    Arguments:
+        maxsize: the maximum number of tables to keep
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._tables = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+    def read(self, path, index_column=None, drop_index=None, binary=False):
+        """returns (table, rows), where `table` is a pandas DataFrame sorted by its index,
+        and `rows` is a `CalibrationLookup` of the nearest row number for each index value.
+
+        Arguments:
+            path: path to the CSV file
+            index_column: the column to use as the index (or None for the row number)
+            drop_index: remove the row with this index value, if present
+            binary: if True, save a memory-mapped `.npy` copy of the parsed table
+                beside the CSV file, and load it in place of the CSV while it is newer
+        """
+        path = os.path.realpath(str(path))
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size, index_column, drop_index)
+
+        with self._lock:
+            if key in self._tables:
+                self._tables.move_to_end(key)
+                return self._tables[key]
+
+        table = self._parse(path, stat, index_column, binary)
+
+        if drop_index is not None and drop_index in table.index:
+            table = table.drop(drop_index, axis=0)
+
+        rows = CalibrationLookup(table.index.values, np.arange(len(table.index)))
+
+        with self._lock:
+            self._tables[key] = table, rows
+            while len(self._tables) > self.maxsize:
+                self._tables.popitem(last=False)
+
+        return table, rows
+
+    @staticmethod
+    def _binary_path(path, index_column):
+        suffix = ".npy" if index_column is None else f".{index_column}.npy"
+        return path + suffix
+
+    def _parse(self, path, stat, index_column, binary):
+        binary_path = self._binary_path(path, index_column)
+
+        if binary:
+            try:
+                if os.stat(binary_path).st_mtime_ns >= stat.st_mtime_ns:
+                    # row 0 holds the columns and column 0 holds the index
+                    packed = np.load(binary_path, mmap_mode="r")
+                    return pd.DataFrame(
+                        packed[1:, 1:],
+                        index=pd.Index(packed[1:, 0], name=index_column),
+                        columns=pd.Index(packed[0, 1:]),
+                    )
+            except (OSError, ValueError):
+                pass
+
+        table = pd.read_csv(path, index_col=index_column, dtype=float)
+        table.columns = table.columns.astype(float)
+        table = table.sort_index().sort_index(axis=1)
+
+        if binary:
+            packed = np.empty((table.shape[0] + 1, table.shape[1] + 1))
+            packed[0, 0] = np.nan
+            packed[0, 1:] = table.columns.values
+            packed[1:, 0] = table.index.values
+            packed[1:, 1:] = table.values
+
+            tmp_path = f"{binary_path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "wb") as fd:
+                    np.save(fd, packed)
+                os.replace(tmp_path, binary_path)
+            except OSError as ex:
+                util.logger.debug(f"could not save calibration table cache: {ex}")
+                with suppress(OSError):
+                    os.remove(tmp_path)
+
+        return table
+
+
+calibration_tables = CalibrationTableCache()
+
+
 class TableCorrectionMixIn(RemappingCorrectionMixIn):
     _CAL_TABLE_KEY = "table"
 
@@ -1098,6 +2007,7 @@ class TableCorrectionMixIn(RemappingCorrectionMixIn):
     index_lookup_trait = None  # a dependent trait
 
     table_index_column: str = None
+    binary_cache: bool = False
 
     def __init_owner_instance__(self, owner):
         super().__init_owner_instance__(owner)
@@ -1145,20 +2055,18 @@ class TableCorrectionMixIn(RemappingCorrectionMixIn):
     def _load_calibration_table(self, owner, path):
         """ stash the calibration table from disk
         """
-        import pandas as pd
-        from pathlib import Path
 
         def read(path):
-            # quick read
-            cal = pd.read_csv(str(path), index_col=self.table_index_column, dtype=float)
-
-            cal.columns = cal.columns.astype(float)
-            if self.index_lookup_trait.max in cal.index:
-                cal.drop(self.index_lookup_trait.max, axis=0, inplace=True)
-            #    self._cal_offset.values[:] = self._cal_offset.values-self._cal_offset.columns.values[np.newaxis,:]
+            # shared between owners that load the same file
+            cal, rows = calibration_tables.read(
+                path,
+                index_column=self.table_index_column,
+                drop_index=self.index_lookup_trait.max,
+                binary=self.binary_cache,
+            )
 
             owner._calibrations.setdefault(self.name, {}).update(
-                {self._CAL_TABLE_KEY: cal}
+                {self._CAL_TABLE_KEY: cal, "table_rows": rows}
             )
 
             owner._logger.debug(f"calibration data read from {path}")
@@ -1188,6 +2096,7 @@ class TableCorrectionMixIn(RemappingCorrectionMixIn):
     def _update_index_value(self, owner, index_value):
         """update the calibration on change of index_value"""
         cal = owner._calibrations.get(self.name, {}).get(self._CAL_TABLE_KEY, None)
+        uncal = None
 
         if cal is None:
             txt = f"index_value change has no effect because calibration_data has not been set"
@@ -1196,11 +2105,61 @@ class TableCorrectionMixIn(RemappingCorrectionMixIn):
             txt = f"set {owner}.{self.index_lookup_trait.name} to enable calibration"
         else:
             # pull in the calibration mapping specific to this index_value
-            i_freq = cal.index.get_loc(index_value, "nearest")
-            cal = cal.iloc[i_freq]
+            rows = owner._calibrations[self.name]["table_rows"]
+            i_freq = int(rows(index_value))
+            uncal, cal = cal.columns.values, cal.values[i_freq]
             txt = f"calibrated at {index_value/1e6:0.3f} MHz"
 
-        self.set_mapping(cal, owner=owner)
+        self.set_mapping(uncal, cal, owner=owner)
+
+    def lookup_cal_trace(self, uncal, index, owner):
+        """look up calibrated values for an array of uncalibrated values in one vectorized pass,
+        each at its own value of the index (such as the frequency of each point in a trace).
+
+        Arguments:
+            uncal: array of uncalibrated values
+            index: index values that broadcast to the shape of `uncal`
+            owner: the owner of the calibration table
+        Returns:
+            array of calibrated values with the shape of `uncal`, or None if there is no calibration table
+        """
+        store = owner._calibrations.get(self.name, {})
+
+        if self._CAL_TABLE_KEY not in store:
+            path = getattr(owner, self.path_trait.name)
+            if path is None:
+                return None
+            self._load_calibration_table(owner, path)
+            store = owner._calibrations[self.name]
+
+        table = store[self._CAL_TABLE_KEY]
+        cols, values = table.columns.values, table.values
+
+        uncal = np.asarray(uncal, dtype=float)
+        index = np.broadcast_to(np.asarray(index, dtype=float), uncal.shape)
+
+        # the nearest table row for each element; rows of NaN indices are
+        # placeholders, masked from the result below
+        missing = np.isnan(index)
+        rows = store["table_rows"](np.where(missing, table.index.values[0], index))
+        rows = rows.astype(int)
+
+        if self.interpolation == "nearest" or cols.size == 1:
+            cal = values[rows, CalibrationLookup.nearest_index(cols, uncal)]
+
+        elif self.interpolation == "linear":
+            i, b = CalibrationLookup.bracket(cols, uncal)
+            cal = (1 - b) * values[rows, i] + b * values[rows, i + 1]
+
+        else:
+            # splines are specific to each row
+            cal = np.empty(uncal.shape)
+            for row in np.unique(rows):
+                match = rows == row
+                lookup = CalibrationLookup(cols, values[row], self.interpolation)
+                cal[match] = lookup(uncal[match])
+
+        return np.where(np.isnan(uncal) | missing, np.nan, cal)
 
     @util.hide_in_traceback
     def __get__(self, owner, owner_cls=None):
@@ -1226,7 +2185,26 @@ class TransformMixIn(DependentTrait):
 
     def __init_owner_instance__(self, owner):
         super().__init_owner_instance__(owner)
-        observe(owner, self.__owner_event__)
+
+        base_name = getattr(self._trait_dependencies["base"], "name", None)
+        if base_name in owner._traits:
+            observe(owner, self.__owner_event__, name=base_name)
+        else:
+            observe(owner, self.__owner_event__)
+
+        # the bounds follow the value of the other trait
+        other_name = getattr(self._trait_dependencies.get("other"), "name", None)
+        if other_name in owner._traits:
+            observe(owner, self._on_other_change, name=other_name)
+
+    def _on_other_change(self, msg):
+        try:
+            changed = bool(msg["new"] != msg["old"])
+        except ValueError:
+            changed = True
+
+        if changed:
+            msg["owner"]._invalidate_bounds(self.name)
 
     def __owner_event__(self, msg):
         # pass on a corresponding notification when self._trait_dependencies['base'] changes
@@ -1242,7 +2220,7 @@ class TransformMixIn(DependentTrait):
 
     def _transformed_extrema(self, owner):
         base_trait = self._trait_dependencies["base"]
-        base_bounds = [base_trait._min(owner), base_trait._max(owner)]
+        base_bounds = base_trait._bounds(owner)
 
         other_trait = self._trait_dependencies.get("other", None)
 
@@ -1274,23 +2252,15 @@ class TransformMixIn(DependentTrait):
 
         return min(trial_bounds), max(trial_bounds)
 
-    def _min(self, owner):
+    def _compute_bounds(self, owner):
         # TODO: ensure this works properly for any reversible self._forward()?
-        lo, hi = self._transformed_extrema(owner)
+        return self._transformed_extrema(owner)
 
-        if lo is None:
-            return None
-        else:
-            return min(lo, hi)
+    def _min(self, owner):
+        return self._bounds(owner)[0]
 
     def _max(self, owner):
-        # TODO: ensure this works properly for any reversible self._forward()?
-        lo, hi = self._transformed_extrema(owner)
-
-        if hi is None:
-            return None
-        else:
-            return max(lo, hi)
+        return self._bounds(owner)[1]
 
     def __get__(self, owner, owner_cls=None):
         if owner is None or owner_cls is not self.__objclass__:
@@ -1356,8 +2326,7 @@ class BoundedNumber(Trait):
             )
 
         # Check bounds once it's a numerical type
-        min = self._min(owner)
-        max = self._max(owner)
+        min, max = self._bounds(owner)
 
         if max is not None and value > max:
             raise ValueError(
@@ -1370,6 +2339,21 @@ class BoundedNumber(Trait):
 
         return value
 
+    def _bounds(self, owner):
+        """returns (min, max). the bounds of dependent traits are memoized in the owner
+        until a change in a dependency invalidates them.
+        """
+        if owner is None or not isinstance(self, DependentTrait):
+            return self._compute_bounds(owner)
+
+        bounds = owner.__bounds_cache__.get(self.name, None)
+        if bounds is None:
+            bounds = owner.__bounds_cache__[self.name] = self._compute_bounds(owner)
+        return bounds
+
+    def _compute_bounds(self, owner):
+        return self._min(owner), self._max(owner)
+
     def _max(self, owner):
         """overload this to dynamically compute max"""
         return self.max
@@ -1390,6 +2374,8 @@ class BoundedNumber(Trait):
         index_lookup_trait,
         *,
         table_index_column: str = None,
+        interpolation: str = "nearest",
+        binary_cache: bool = False,
         help="",
         label=Undefined,
         allow_none=False,
@@ -1400,6 +2386,8 @@ class BoundedNumber(Trait):
         Arguments:
             offset_name: the name of a value trait in the owner containing a numerical offset
             lookup1d: a table containing calibration data, or None to configure later
+            interpolation: "nearest", "linear", or "cubic" lookup between table columns
+            binary_cache: if True, save a memory-mapped `.npy` copy of the parsed table beside the CSV file
         """
 
         if label is Undefined:
@@ -1414,6 +2402,8 @@ class BoundedNumber(Trait):
             gets=self.gets,
             allow_none=allow_none,
             table_index_column=table_index_column,
+            interpolation=interpolation,
+            binary_cache=binary_cache,
         )
 
         return ret
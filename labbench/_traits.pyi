@@ -1,4 +1,5 @@
 import typing
+from collections.abc import Mapping
 from . import util as util
 from contextlib import contextmanager as contextmanager
 from typing import Any as _Any
@@ -23,6 +24,10 @@ class Trait:
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -67,15 +72,35 @@ class Trait:
     def doc_params(self, omit=...): ...
     def update(self, obj: _Any | None = ..., **attrs): ...
 
+class TraitMessage(Mapping):
+    new: _Any
+    old: _Any
+    owner: _Any
+    name: str
+    type: str
+    cache: bool
+    def __init__(self, new, old, owner, name, type, cache) -> None: ...
+    def __getitem__(self, key): ...
+    def __iter__(self): ...
+    def __len__(self): ...
+
 class HasTraits(metaclass=HasTraitsMeta):
     __notify_list__: _Any
+    __notify_index__: _Any
+    __notify_quiet_index__: _Any
     __cls_namespace__: _Any
     __cache__: _Any
+    __cache_expiry__: _Any
     def __init__(self, **values) -> None: ...
     def __init_subclass__(cls) -> None: ...
     def __notify__(self, name, value, type, cache) -> None: ...
+    def invalidate_cache(self, *names) -> None: ...
     def set_key(self, key, value, name: _Any | None = ...) -> None: ...
     def get_key(self, key, name: _Any | None = ...) -> None: ...
+    def get_keys(self, keys, names: _Any | None = ...): ...
+    def set_keys(self, keys, values, names: _Any | None = ...) -> None: ...
+    def get_many(self, *names) -> dict: ...
+    def set_many(self, **values) -> None: ...
     def __get_value__(self, name): ...
     def __set_value__(self, name, value) -> None: ...
 
@@ -89,6 +114,10 @@ class Any(Trait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -98,6 +127,7 @@ class Any(Trait):
 
 def observe(obj, handler, name=..., type_=...) -> None: ...
 def unobserve(obj, handler) -> None: ...
+def debug_handler(handler): ...
 def find_trait_in_mro(cls): ...
 
 class DependentTrait(Trait):
@@ -110,6 +140,10 @@ class DependentTrait(Trait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -120,6 +154,20 @@ class DependentTrait(Trait):
         mixin_cls, template_trait, dependent_traits=..., *init_args, **init_kws
     ): ...
 
+class CalibrationLookup:
+    INTERPOLATIONS: tuple
+    x: _Any
+    y: _Any
+    interpolation: str
+    def __init__(self, x, y, interpolation: str = ...) -> None: ...
+    def inverse(self) -> CalibrationLookup: ...
+    def in_range(self, x) -> bool: ...
+    def __call__(self, x): ...
+    @staticmethod
+    def nearest_index(xs, x): ...
+    @staticmethod
+    def bracket(xs, x): ...
+
 class RemappingCorrectionMixIn(DependentTrait):
     def __init__(
         default=None,
@@ -130,12 +178,18 @@ class RemappingCorrectionMixIn(DependentTrait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
         mapping=None,
+        interpolation: str = "nearest",
     ): ...
     mapping: Any
+    interpolation: str
     EMPTY_STORE: _Any
     def __init_owner_instance__(self, owner) -> None: ...
     def lookup_cal(self, uncal, owner): ...
@@ -146,6 +200,20 @@ class RemappingCorrectionMixIn(DependentTrait):
     def __get__(self, owner, owner_cls: _Any | None = ...): ...
     def __set__(self, owner, cal) -> None: ...
 
+class CalibrationTableCache:
+    maxsize: int
+    def __init__(self, maxsize: int = ...) -> None: ...
+    def clear(self) -> None: ...
+    def read(
+        self,
+        path,
+        index_column: _Any | None = ...,
+        drop_index: _Any | None = ...,
+        binary: bool = ...,
+    ): ...
+
+calibration_tables: CalibrationTableCache
+
 class TableCorrectionMixIn(RemappingCorrectionMixIn):
     def __init__(
         default=None,
@@ -156,16 +224,24 @@ class TableCorrectionMixIn(RemappingCorrectionMixIn):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
         mapping=None,
+        interpolation: str = "nearest",
         table_index_column: str = None,
+        binary_cache: bool = False,
     ): ...
     path_trait: _Any
     index_lookup_trait: _Any
     table_index_column: str
+    binary_cache: bool
     def __init_owner_instance__(self, owner) -> None: ...
+    def lookup_cal_trace(self, uncal, index, owner): ...
 
 class TransformMixIn(DependentTrait):
     def __init__(
@@ -177,6 +253,10 @@ class TransformMixIn(DependentTrait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -196,6 +276,10 @@ class BoundedNumber(Trait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = True,
         remap: dict = {},
@@ -219,6 +303,8 @@ class BoundedNumber(Trait):
         index_lookup_trait,
         *,
         table_index_column: str = ...,
+        interpolation: str = ...,
+        binary_cache: bool = ...,
         help: str = ...,
         label=...,
         allow_none: bool = ...
@@ -258,6 +344,10 @@ class NonScalar(Any):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -274,6 +364,10 @@ class Int(BoundedNumber):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = True,
         remap: dict = {},
@@ -295,6 +389,10 @@ class Float(BoundedNumber):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = True,
         remap: dict = {},
@@ -318,6 +416,10 @@ class Complex(Trait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -334,6 +436,10 @@ class Bool(Trait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -351,6 +457,10 @@ class String(Trait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -369,6 +479,10 @@ class Unicode(String):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -387,6 +501,10 @@ class Bytes(String):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -404,6 +522,10 @@ class Iterable(Trait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -420,6 +542,10 @@ class Dict(Iterable):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -436,6 +562,10 @@ class List(Iterable):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -452,6 +582,10 @@ class Tuple(Iterable):
         sets: bool = False,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -468,6 +602,10 @@ class Path(Trait):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -486,6 +624,10 @@ class PandasDataFrame(NonScalar):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -502,6 +644,10 @@ class PandasSeries(NonScalar):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -518,6 +664,10 @@ class NumpyArray(NonScalar):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -534,6 +684,10 @@ class NetworkAddress(Unicode):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
+        calibration=None,
+        calibration_axis: str = None,
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
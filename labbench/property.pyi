@@ -8,6 +8,8 @@ class bool(_traits.Bool):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -22,6 +24,8 @@ class float(_traits.Float):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = True,
         remap: dict = {},
@@ -42,6 +46,8 @@ class int(_traits.Int):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = True,
         remap: dict = {},
@@ -61,6 +67,8 @@ class complex(_traits.Complex):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -75,6 +83,8 @@ class str(_traits.Unicode):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -90,6 +100,8 @@ class bytes(_traits.Bytes):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -105,6 +117,8 @@ class list(_traits.List):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -119,6 +133,8 @@ class tuple(_traits.Tuple):
         sets: bool = False,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -133,6 +149,8 @@ class dict(_traits.Dict):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -147,6 +165,8 @@ class Path(_traits.Path):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -162,6 +182,8 @@ class DataFrame(_traits.PandasDataFrame):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -176,6 +198,8 @@ class Series(_traits.PandasSeries):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -190,6 +214,8 @@ class ndarray(_traits.NumpyArray):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
@@ -204,6 +230,8 @@ class NetworkAddress(_traits.NetworkAddress):
         sets: bool = True,
         gets: bool = True,
         cache: bool = False,
+        ttl: float = None,
+        invalidated_by: tuple = (),
         only: tuple = (),
         allow_none: bool = False,
         remap: dict = {},
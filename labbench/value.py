@@ -89,5 +89,14 @@ class NetworkAddress(_traits.NetworkAddress):
 
 # mutate these traits into the right role
 _traits.subclass_namespace_traits(
-    locals(), role=_traits.Trait.ROLE_VALUE, omit_trait_attrs=["key", "func"]
+    locals(),
+    role=_traits.Trait.ROLE_VALUE,
+    omit_trait_attrs=[
+        "key",
+        "func",
+        "ttl",
+        "invalidated_by",
+        "calibration",
+        "calibration_axis",
+    ],
 )
@@ -107,6 +107,8 @@ if __name__ == "__main__":
                 "recommonmark",
             ],
             platform=PLATFORM_OPTIONAL_EXTRAS,
+            # codecs for compressed relational data files
+            compression=["zstandard", "lz4"],
         ),
         long_description=longdescription,
         long_description_content_type="text/markdown",
@@ -0,0 +1,124 @@
+""" Micro-benchmark of trait attribute access on a Device.
+
+Run as a script (it is not collected by pytest):
+
+    python benchmark_traits.py [iterations] [--compare PATH] [--rounds N]
+
+Prints the time per access for gets and sets of value and property traits.
+With --compare, the same statements are also timed with labbench imported from
+PATH, a checkout of another revision (such as one made with
+`git worktree add PATH <revision>`), and the ratio of the two is printed
+to show the change in speed. The two trees are timed in alternating
+subprocesses for N rounds (default 5), and the best time of each
+statement is kept, so that background load affects both trees alike.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+STATEMENTS = (
+    "device.v_int",
+    "device.v_int = 4",
+    "device.v_float",
+    "device.v_float = 2.0",
+    "device.p_float",
+    "device.p_float = 2.0",
+    "device.p_remap",
+    "device.p_remap = 'off'",
+    "device.p_cached",
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def define_device(lb):
+    class BenchmarkDevice(lb.Device):
+        v_int = lb.value.int(3)
+        v_float = lb.value.float(1.0, min=0, max=10)
+        p_float = lb.property.float(key="P")
+        p_remap = lb.property.str(key="R", remap={"on": "ON", "off": "OFF"})
+        p_cached = lb.property.str(key="C", cache=True)
+
+        def get_key(self, key, trait_name=None):
+            return {"P": 1.5, "R": "ON", "C": "x"}[key]
+
+        def set_key(self, key, value, trait_name=None):
+            pass
+
+    return BenchmarkDevice
+
+
+def measure(number=100000, repeat=5):
+    """returns {statement: best time per access in ns} for the labbench on sys.path"""
+    import labbench as lb
+
+    BenchmarkDevice = define_device(lb)
+
+    results = {}
+    with BenchmarkDevice() as device:
+        for stmt in STATEMENTS:
+            best = min(
+                timeit.repeat(
+                    stmt, globals=dict(device=device), number=number, repeat=repeat
+                )
+            )
+            results[stmt] = 1e9 * best / number
+
+    return results
+
+
+def measure_in(root, number):
+    """run `measure` in a subprocess that imports labbench from the checkout at `root`"""
+    code = (
+        f"import sys, json; sys.path.insert(0, {repr(root)}); "
+        f"sys.path.insert(0, {repr(HERE)}); import benchmark_traits; "
+        f"print(json.dumps(benchmark_traits.measure({number})))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def best_of(roots, number, rounds):
+    """time each tree in `roots` in alternating subprocesses, and return the best time
+    of each statement for each tree"""
+    best = [{} for root in roots]
+
+    for i in range(rounds):
+        for root, results in zip(roots, best):
+            for stmt, t in measure_in(root, number).items():
+                results[stmt] = min(t, results.get(stmt, t))
+
+    return best
+
+
+def run(number=100000, compare=None, rounds=5):
+    if compare is None:
+        (current,) = best_of([os.path.dirname(HERE)], number, rounds)
+        for stmt, t in current.items():
+            print(f"{stmt:28s} {t:8.0f} ns")
+        return
+
+    current, other = best_of(
+        [os.path.dirname(HERE), os.path.abspath(compare)], number, rounds
+    )
+
+    print(f"{'':28s} {'compare':>10s} {'this tree':>10s} {'speedup':>8s}")
+    for stmt, t in current.items():
+        print(f"{stmt:28s} {other[stmt]:7.0f} ns {t:7.0f} ns {other[stmt]/t:7.2f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {}
+    for flag, cast in (("--compare", str), ("--rounds", int)):
+        if flag in args:
+            i = args.index(flag)
+            options[flag[2:]] = cast(args[i + 1])
+            del args[i : i + 2]
+
+    run(*[int(arg) for arg in args[:1]], **options)
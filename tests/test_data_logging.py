@@ -34,6 +34,11 @@ import pandas as pd
 import numpy as np
 from emulate import EmulatedVISADevice
 import hashlib
+import json
+import logging
+import threading
+import tempfile
+from pathlib import Path
 
 lb._force_full_traceback(True)
 
@@ -85,6 +90,539 @@ class EmulatedInstrument(EmulatedVISADevice):
         return series
 
 
+class LoggedDevice(lb.Device):
+    param = lb.value.int(0)
+
+
+class PolledDevice(lb.Device):
+    """ Records the thread that performs each property get
+    """
+
+    voltage = lb.property.float(key="VOLT")
+    current = lb.property.float(key="CURR")
+
+    def open(self):
+        self.get_threads = []
+
+    def get_key(self, key, name=None):
+        self.get_threads.append(threading.current_thread())
+        return dict(VOLT=1.5, CURR=0.25)[key] * (1 + self.resource.count("b"))
+
+
+class SerialPolledDevice(PolledDevice, concurrency=False):
+    pass
+
+
+class TestCSVLogger(unittest.TestCase):
+    def test_streaming_new_columns(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with LoggedDevice() as dev, lb.CSVLogger(path) as db:
+                db.observe(dev)
+
+                for i in range(3):
+                    dev.param = i
+                    db.new_row(x=i)
+                    db.write()
+
+                db.new_row(x=3, extra="new column")
+
+            outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+
+            self.assertEqual(list(outputs["x"]), [0, 1, 2, 3])
+            self.assertEqual(list(outputs["dev_param"]), [0, 1, 2, 2])
+            self.assertTrue(outputs["extra"].iloc[:3].isnull().all())
+            self.assertEqual(outputs["extra"].iloc[3], "new column")
+
+            inputs = pd.read_csv(path / lb.CSVLogger.INPUT_FILE_NAME)
+            self.assertEqual(len(inputs), 4)
+
+            # reopen and append
+            with LoggedDevice() as dev, lb.CSVLogger(path, append=True) as db:
+                db.observe(dev)
+                db.new_row(x=4)
+
+            outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+            self.assertEqual(list(outputs["x"]), [0, 1, 2, 3, 4])
+
+    def test_background_writer(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with LoggedDevice() as dev, lb.CSVLogger(path, background=True) as db:
+                db.observe(dev)
+
+                for i in range(10):
+                    dev.param = i
+                    db.new_row(x=i, trace=np.arange(10) * i)
+                    db.write()
+
+            outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+            self.assertEqual(list(outputs["x"]), list(range(10)))
+            self.assertEqual(list(outputs["dev_param"]), list(range(10)))
+
+            trace = pd.read_csv(path / outputs["trace"].iloc[-1], index_col=0)
+            self.assertEqual(list(trace.iloc[:, 0]), list(np.arange(10) * 9))
+
+    def test_background_writer_exception(self):
+        class FailingLogger(lb.CSVLogger):
+            def _write_root(self, index, outputs, inputs):
+                raise IOError("write failed")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with FailingLogger(path, background=True) as db:
+                db.new_row(x=0)
+                db.write()
+                db._writer_queue.join()
+
+                # the exception in the writer thread is raised on the next write
+                with self.assertRaisesRegex(OSError, "write failed"):
+                    db.write()
+
+    def test_auto_flush(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with lb.CSVLogger(path, flush_rows=3, flush_bytes=1000) as db:
+                for i in range(6):
+                    db.new_row(x=i)
+                    self.assertEqual(len(db.pending_output), (i + 1) % 3)
+
+                # 2 rows of 100 float64 values cross the threshold at 1000 bytes
+                db.new_row(x=6, trace=np.zeros(100))
+                self.assertEqual(len(db.pending_output), 1)
+                db.new_row(x=7, trace=np.zeros(100))
+                self.assertEqual(len(db.pending_output), 0)
+
+                self.assertEqual(db.flush_counts, dict(rows=2, bytes=1, seconds=0))
+
+            outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+            self.assertEqual(list(outputs["x"]), list(range(8)))
+
+    def test_snapshot_rows(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with lb.CSVLogger(path) as db:
+                trace = np.arange(10.0)
+                view = trace[::2]
+                items = [1, 2]
+
+                db.new_row(trace=trace, view=view, items=items, copy="snapshot")
+                row = db.pending_output[-1]
+
+                # the array is referenced, not copied, and frozen
+                self.assertIs(row["trace"], trace)
+                with self.assertRaises(ValueError):
+                    trace[0] = 5
+
+                # views and containers are copied
+                self.assertIsNot(row["view"], view)
+                items.append(3)
+                self.assertEqual(row["items"], [1, 2])
+
+                # the limitation: views that existed before the snapshot are not frozen
+                self.assertTrue(view.flags.writeable)
+                view[1] = 7
+                self.assertEqual(row["trace"][2], 7)
+
+    def test_concurrent_gets(self):
+        def log_rows(concurrent_gets):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = Path(tmpdir) / "db"
+
+                with PolledDevice(resource="a") as dev1, \
+                     PolledDevice(resource="b") as dev2, \
+                     SerialPolledDevice(resource="bb") as dev3, \
+                     lb.CSVLogger(path, concurrent_gets=concurrent_gets) as db:
+                    db.observe(
+                        {dev1: "dev1", dev2: "dev2", dev3: "dev3"},
+                        always=["voltage", "current"],
+                    )
+
+                    for i in range(2):
+                        db.new_row(x=i)
+
+                    threads = {
+                        dev.resource: set(dev.get_threads) for dev in (dev1, dev2, dev3)
+                    }
+
+                return pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME), threads
+
+        serial, serial_threads = log_rows(False)
+        concurrent, concurrent_threads = log_rows(True)
+
+        pd.testing.assert_frame_equal(
+            serial.drop(columns=["host_time", "host_log"], errors="ignore"),
+            concurrent.drop(columns=["host_time", "host_log"], errors="ignore"),
+        )
+        self.assertEqual(list(concurrent["dev2_voltage"]), [3.0, 3.0])
+
+        main = threading.main_thread()
+        self.assertEqual(serial_threads["a"], {main})
+        self.assertNotIn(main, concurrent_threads["a"])
+        self.assertNotIn(main, concurrent_threads["b"])
+
+        # devices that do not support concurrency are polled in the calling thread
+        self.assertEqual(concurrent_threads["bb"], {main})
+
+    def test_relational_workers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with lb.CSVLogger(path, relational_workers=4) as db:
+                for i in range(5):
+                    db.new_row(x=i, trace=np.arange(10) * i, items=[i, i + 1])
+                db.write()
+
+            outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+
+            for i, row in outputs.iterrows():
+                self.assertTrue(row["trace"].startswith(f"{i} "))
+                self.assertTrue(row["trace"].endswith("trace.csv"))
+                trace = pd.read_csv(path / row["trace"], index_col=0)
+                self.assertEqual(list(trace.iloc[:, 0]), list(np.arange(10) * i))
+
+    def test_binary_relational_formats(self):
+        for fmt in ("npy", "arrow"):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = Path(tmpdir) / "db"
+
+                with lb.CSVLogger(path, nonscalar_file_type=fmt) as db:
+                    for i in range(3):
+                        db.new_row(x=i, trace=np.arange(10.0) * i)
+                    db.write()
+
+                outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+
+                for i, row in outputs.iterrows():
+                    self.assertTrue(row["trace"].endswith(f"trace.{fmt}"))
+                    trace = lb.read(path / row["trace"])
+                    self.assertEqual(list(trace.iloc[:, 0]), list(np.arange(10.0) * i))
+
+    def test_tar(self):
+        import tarfile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with lb.CSVLogger(path, tar=True, relational_workers=2) as db:
+                for i in range(5):
+                    db.new_row(x=i, trace=np.arange(10) * i, text=str(i) * 2000)
+                db.write()
+
+            with tarfile.open(path / "data.tar") as tar:
+                names = tar.getnames()
+            self.assertEqual(len(names), len(set(names)))
+
+            outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+            reader = lb._data.MungeReader(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+
+            for i, row in outputs.iterrows():
+                trace = reader(row["trace"], index_col=0)
+                self.assertEqual(list(trace.iloc[:, 0]), list(np.arange(10) * i))
+                self.assertIn(row["text"], names)
+
+            # members are read through the sidecar index, without opening the tarfile
+            self.assertIsNotNone(reader.members)
+            self.assertIsNone(reader._tarfile)
+            reader.close()
+
+            # the index is extended by appended runs
+            with lb.CSVLogger(path, tar=True, append=True) as db:
+                db.new_row(x=5, trace=np.arange(10) * 5)
+
+            with open(path / ("data.tar" + lb._data.MungeToTar.index_suffix)) as f:
+                index = json.load(f)
+            with tarfile.open(path / "data.tar") as tar:
+                scanned = {
+                    info.name: [info.offset_data, info.size]
+                    for info in tar
+                    if info.isfile()
+                }
+            self.assertEqual(index["members"], scanned)
+
+            with lb._data.MungeReader(path / lb.CSVLogger.OUTPUT_FILE_NAME) as reader:
+                outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+                trace = reader(outputs["trace"].iloc[-1], index_col=0)
+                self.assertEqual(list(trace.iloc[:, 0]), list(np.arange(10) * 5))
+            self.assertIsNone(reader._mmap)
+
+    def test_dedup(self):
+        import tarfile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for tar in (False, True):
+                path = Path(tmpdir) / f"db_tar{tar}"
+
+                for run in range(2):
+                    with lb.CSVLogger(
+                        path, dedup=True, tar=tar, append=run > 0, relational_workers=2
+                    ) as db:
+                        for i in range(4):
+                            db.new_row(
+                                freqs=np.arange(10.0),
+                                table=pd.DataFrame({"a": np.arange(3) * (i % 2)}),
+                                config=["a", "b"],
+                                text="x" * 2000,
+                            )
+                        db.write()
+
+                    outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+                    self.assertEqual(len(outputs), 4 * (run + 1))
+
+                    # one file for each unique value, shared across rows and runs
+                    for name, count in dict(freqs=1, table=2, config=1, text=1).items():
+                        self.assertEqual(outputs[name].nunique(), count)
+                        self.assertTrue(outputs[name].str.startswith("objects").all())
+
+                    if tar:
+                        with tarfile.open(path / "data.tar") as f:
+                            names = [n for n in f.getnames() if n.startswith("objects/")]
+                        self.assertEqual(len(names), len(set(names)))
+                        self.assertTrue((path / "data.tar.objects.json").exists())
+                    else:
+                        names = [
+                            str(p.relative_to(path).as_posix())
+                            for p in (path / "objects").rglob("*.*")
+                        ]
+                        self.assertIn("objects/index.json", names)
+
+                    for name in ("freqs", "table", "config", "text"):
+                        for key in outputs[name].unique():
+                            self.assertIn(Path(key).as_posix(), names)
+
+                reader = lb._data.MungeReader(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+                table = reader(outputs["table"].iloc[1], index_col=0)
+                self.assertEqual(list(table["a"]), [0, 1, 2])
+
+    def test_relational_compression(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for compression, tar in (("gzip", False), ("bz2", True), ("xz", False)):
+                path = Path(tmpdir) / f"db_{compression}"
+
+                with lb.CSVLogger(
+                    path, tar=tar, relational_compression=compression
+                ) as db:
+                    for i in range(3):
+                        db.new_row(
+                            trace=pd.Series(np.arange(10) * i, name="v"),
+                            config=["a", str(i)],
+                            text=str(i) * 2000,
+                        )
+
+                outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+                suffix = lb._data.COMPRESSION_SUFFIXES[compression]
+                self.assertTrue(outputs["trace"].str.endswith(".csv" + suffix).all())
+                self.assertTrue(outputs["config"].str.endswith(".json" + suffix).all())
+
+                if not tar:
+                    with open(path / outputs["text"].iloc[2], "rb") as f:
+                        self.assertLess(len(f.read()), 2000)
+
+                reader = lb._data.MungeReader(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+                trace = reader(outputs["trace"].iloc[2], index_col=0)
+                self.assertEqual(list(trace["v"]), list(np.arange(10) * 2))
+
+                expanded = lb.read_relational(
+                    path / lb.CSVLogger.OUTPUT_FILE_NAME, "trace", ["config"]
+                )
+                self.assertEqual(
+                    list(expanded["trace_v"]),
+                    list(np.concatenate([np.arange(10) * i for i in range(3)])),
+                )
+
+    def test_host_log(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with LoggedDevice() as dev, lb.CSVLogger(path) as db:
+                db.observe(dev)
+                for i in range(3):
+                    dev._logger.warning(f"row {i}")
+                    db.new_row(x=i)
+
+            outputs = pd.read_csv(path / lb.CSVLogger.OUTPUT_FILE_NAME)
+            self.assertTrue(outputs["host_log"].str.endswith(".ndjson").all())
+
+            log = lb.read(path / outputs["host_log"].iloc[2])
+            self.assertIn("row 2", list(log["message"]))
+            self.assertNotIn("row 1", list(log["message"]))
+
+        # the ring holds only the most recent records, and counts those it discarded
+        ring = lb._host.LogRecordRing(maxlen=3)
+        logger = logging.getLogger("test_host_log")
+        logger.addHandler(ring)
+        try:
+            for i in range(5):
+                logger.warning(f"record {i}")
+        finally:
+            logger.removeHandler(ring)
+
+        records = ring.read()
+        self.assertEqual(len(records), 4)
+        self.assertIn("discarded 2", records[0].message)
+        self.assertEqual([r.message for r in records[1:]], ["record 2", "record 3", "record 4"])
+        self.assertEqual(len(ring.read()), 0)
+
+    def test_read_relational(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with lb.CSVLogger(path) as db:
+                for i in range(6):
+                    if i == 3:
+                        # no relational data to expand in this row
+                        db.new_row(x=i)
+                    else:
+                        db.new_row(x=i, trace=np.arange(4) * i)
+                db.write()
+
+            root_path = path / lb.CSVLogger.OUTPUT_FILE_NAME
+            expanded = lb.read_relational(root_path, "trace", root_cols=["x"])
+
+            self.assertEqual(len(expanded), 5 * 4)
+            self.assertEqual(list(expanded["x"]), list(np.repeat([0, 1, 2, 4, 5], 4)))
+            self.assertEqual(list(expanded["trace_id"]), 5 * list(range(4)))
+            self.assertEqual(
+                list(expanded["trace_0"]),
+                list(np.concatenate([np.arange(4) * i for i in (0, 1, 2, 4, 5)])),
+            )
+
+            threaded = lb.read_relational(root_path, "trace", root_cols=["x"], workers=2)
+            pd.testing.assert_frame_equal(threaded, expanded)
+
+            chunks = list(
+                lb.read_relational(root_path, "trace", root_cols=["x"], chunksize=2)
+            )
+            self.assertEqual([len(c) for c in chunks], [8, 8, 4])
+            pd.testing.assert_frame_equal(
+                pd.concat(chunks, ignore_index=True), expanded
+            )
+
+
+class TestSQLiteLogger(unittest.TestCase):
+    def test_insert_new_columns(self):
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with LoggedDevice() as dev, lb.SQLiteLogger(path) as db:
+                db.observe(dev)
+
+                for i in range(3):
+                    dev.param = i
+                    db.new_row(x=np.int64(i))
+                    db.write()
+
+                db.new_row(x=3, extra="new column")
+
+            with LoggedDevice() as dev, lb.SQLiteLogger(path, append=True) as db:
+                db.observe(dev)
+                db.new_row(x=4)
+
+            with sqlite3.connect(path / lb.SQLiteLogger.ROOT_FILE_NAME) as con:
+                query = f"select * from {lb.SQLiteLogger.OUTPUT_TABLE_NAME}"
+                outputs = pd.read_sql_query(query, con, index_col="id")
+
+            self.assertEqual(list(outputs.index), [0, 1, 2, 3, 4])
+            self.assertEqual(list(outputs["x"]), [0, 1, 2, 3, 4])
+            self.assertEqual(list(outputs["dev_param"].iloc[:4]), [0, 1, 2, 2])
+            self.assertTrue(outputs["extra"].iloc[:3].isnull().all())
+            self.assertEqual(outputs["extra"].iloc[3], "new column")
+
+    def test_case_insensitive_columns(self):
+        import sqlite3
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            with lb.SQLiteLogger(path) as db:
+                db.new_row(power=1.0)
+                db.write()
+                db.new_row(Power=2.0)
+                db.new_row(POWER=3.0)
+                db.write()
+
+                db.new_row(power=4.0, Power=5.0)
+                with self.assertRaises(ValueError):
+                    db.write()
+                db.clear()
+
+            with sqlite3.connect(path / lb.SQLiteLogger.ROOT_FILE_NAME) as con:
+                query = f"select * from {lb.SQLiteLogger.OUTPUT_TABLE_NAME}"
+                outputs = pd.read_sql_query(query, con, index_col="id")
+
+            self.assertEqual([c for c in outputs.columns if c.lower() == "power"], ["power"])
+            self.assertEqual(list(outputs["power"]), [1.0, 2.0, 3.0])
+
+
+class TestParquetLogger(unittest.TestCase):
+    def test_partitions_and_filters(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db"
+
+            for run in range(2):
+                with lb.ParquetLogger(path, partition_cols="dut", append=run > 0) as db:
+                    for i in range(4):
+                        db.new_row(dut=f"DUT{i % 2}", x=i, trace=np.arange(5.0) * i)
+                        db.write()
+
+            root_path = path / lb.ParquetLogger.OUTPUT_FILE_NAME
+            self.assertTrue((root_path / "dut=DUT0").is_dir())
+            self.assertTrue((root_path / "dut=DUT1").is_dir())
+
+            outputs = lb.read(root_path).sort_values("id")
+            self.assertEqual(list(outputs["id"]), list(range(8)))
+            self.assertEqual(list(outputs["x"]), 2 * list(range(4)))
+
+            # 1-D arrays are stored inline as list columns
+            for x, trace in zip(outputs["x"], outputs["trace"]):
+                self.assertEqual(list(trace), list(np.arange(5.0) * x))
+
+            selected = lb.read(
+                root_path, columns=["id", "x"], filters=[("dut", "=", "DUT1"), ("x", ">", 1)]
+            )
+            self.assertEqual(list(selected.columns), ["id", "x"])
+            self.assertEqual(sorted(selected["id"]), [3, 7])
+
+
+class TestHDFLogger(unittest.TestCase):
+    def test_append_rows(self):
+        import h5py
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "db.h5"
+
+            with lb.HDFLogger(path) as db:
+                for i in range(4):
+                    row = dict(x=i, trace=np.arange(5.0) * i)
+                    if i >= 2:
+                        # a new column, and a value that needs a wider type
+                        row.update(x=i + 0.5, y="new")
+                    db.new_row(**row)
+                    db.write()
+
+                    # readable while the file is still open for writing
+                    self.assertEqual(len(lb.read(path)), i + 1)
+
+            outputs = lb.read(path)
+            self.assertEqual(list(outputs["id"]), list(range(4)))
+            self.assertEqual(list(outputs["x"]), [0, 1, 2.5, 3.5])
+            self.assertEqual(list(outputs["y"]), ["", "", "new", "new"])
+
+            with h5py.File(path, "r") as f:
+                # matching 1-D arrays are stacked into one resizable dataset
+                traces = f["arrays/trace"][()]
+            self.assertEqual(traces.shape, (4, 5))
+            self.assertEqual(list(outputs["trace"]), [f"/arrays/trace[{i}]" for i in range(4)])
+            np.testing.assert_array_equal(traces[3], np.arange(5.0) * 3)
+
+
 class TestDB(unittest.TestCase):
     def test_state_wrapper_type(self):
         with EmulatedInstrument() as m, lb.SQLiteLogger(path) as db:
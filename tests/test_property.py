@@ -27,6 +27,7 @@
 import unittest
 import importlib
 import sys
+import time
 
 if ".." not in sys.path:
     sys.path.insert(0, "..")
@@ -312,6 +313,199 @@ class TestKeyedProperty(unittest.TestCase, TestProperty):
     TestDevice = MockDecoratedProperty
 
 
+class MockCachePolicy(MockBase):
+    PYTHONIC_VALUE_DEFAULT = {"atten": 0.0, "ref_level": -10.0, "span": 1e6}
+
+    atten = lb.property.float(key="atten")
+    ref_level = lb.property.float(
+        key="ref_level", cache=True, invalidated_by=("atten", "preset")
+    )
+    span = lb.property.float(key="span", ttl=0.05)
+
+    def get_key(self, key, name=None):
+        self.add_get_count(key)
+        return self.remote_values[key]
+
+    def set_key(self, key, value, name=None):
+        self.remote_values[key] = value
+
+    def preset(self):
+        self.remote_values.update(self.PYTHONIC_VALUE_DEFAULT)
+
+
+class TestCachePolicy(unittest.TestCase):
+    def test_invalidated_by_trait(self):
+        with MockCachePolicy() as m:
+            m.ref_level
+            m.ref_level
+            self.assertEqual(m.get_get_count("ref_level"), 1)
+
+            m.atten = 10
+            m.remote_values["ref_level"] = 0.0
+            self.assertEqual(m.ref_level, 0.0)
+            self.assertEqual(m.get_get_count("ref_level"), 2)
+
+    def test_invalidated_by_method(self):
+        with MockCachePolicy() as m:
+            m.ref_level = 5.0
+            self.assertEqual(m.ref_level, 5.0)
+            self.assertEqual(m.get_get_count("ref_level"), 0)
+
+            m.preset()
+            self.assertEqual(m.ref_level, -10.0)
+            self.assertEqual(m.get_get_count("ref_level"), 1)
+
+    def test_ttl(self):
+        with MockCachePolicy() as m:
+            m.span
+            m.span
+            self.assertEqual(m.get_get_count("span"), 1)
+
+            time.sleep(0.1)
+            m.span
+            self.assertEqual(m.get_get_count("span"), 2)
+
+    def test_invalidate_cache(self):
+        with MockCachePolicy() as m:
+            m.ref_level
+            m.span
+            m.invalidate_cache("span")
+            m.ref_level
+            m.span
+            self.assertEqual(m.get_get_count("ref_level"), 1)
+            self.assertEqual(m.get_get_count("span"), 2)
+
+            m.invalidate_cache()
+            m.ref_level
+            self.assertEqual(m.get_get_count("ref_level"), 2)
+
+            with self.assertRaises(TypeError):
+                m.invalidate_cache("concurrency")
+
+    def test_invalid_trigger(self):
+        with self.assertRaises(AttributeError):
+
+            class BadTrigger(lb.Device):
+                level = lb.property.float(key="level", invalidated_by="missing")
+
+
+class MockBatchedKeys(MockKeyedProperty):
+    def open(self):
+        self.batches = []
+
+    def get_keys(self, keys, names=None):
+        self.batches.append(("get", list(keys)))
+        return [self.remote_values[key] for key in keys]
+
+    def set_keys(self, keys, values, names=None):
+        self.batches.append(("set", list(keys)))
+        for key, value, name in zip(keys, values, names):
+            self.set_key(key, value, name)
+
+
+class MockSCPIBackend:
+    def __init__(self, replies):
+        self.replies = replies
+        self.messages = []
+
+    def query(self, msg):
+        self.messages.append(msg)
+        if msg == "*OPC?":
+            return "1\n"
+        return ";".join(self.replies[key[:-1]] for key in msg.split(";")) + "\n"
+
+    def write(self, msg):
+        self.messages.append(msg)
+
+    def open_resource(self, resource, **kws):
+        return self
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MockBatchedVISA(lb.VISADevice):
+    level = lb.property.float(key="LEV")
+    enabled = lb.property.bool(key="ENAB", remap={True: "ON", False: "OFF"})
+    mode = lb.property.str(key="MODE", only=("AUTO", "MAN"))
+    power = lb.property.float(key="POW", cache=True)
+
+    def _release_remote_control(self):
+        pass
+
+    @classmethod
+    def _get_rm(cls):
+        cls.__imports__()
+        return MockSCPIBackend({"LEV": "-10.5", "ENAB": "ON", "MODE": "AUTO", "POW": "0.0"})
+
+
+class TestBatch(unittest.TestCase):
+    def test_get_many(self):
+        with MockBatchedKeys() as m:
+            values = m.get_many("int0", "bool0", "str2", "str0")
+            self.assertEqual(values, {k: m.PYTHONIC_VALUE_DEFAULT[k] for k in values})
+            self.assertEqual(m.batches, [("get", ["int0", "bool0", "str2", "str0"])])
+
+            # cached values are not fetched again
+            m.get_many("int0", "str0")
+            self.assertEqual(m.get_get_count("str0"), 0)
+
+    def test_set_many(self):
+        with MockBatchedKeys() as m:
+            values = dict(m.PYTHONIC_VALUE_UPDATE)
+            del values["str2"]
+            m.set_many(**values)
+            self.assertEqual(m.batches, [("set", ["int0", "bool0", "str0", "str1"])])
+            self.assertEqual(m.remote_values["bool0"], "ON")
+            self.assertEqual(m.str0, "hi")
+
+            with self.assertRaises(ValueError):
+                m.set_many(int0=11, bool0=False)
+            self.assertEqual(len(m.batches), 1)
+
+    def test_visa_compound_message(self):
+        with MockBatchedVISA("MOCK::INSTR") as m:
+            values = m.get_many("level", "enabled", "mode")
+            self.assertEqual(values, dict(level=-10.5, enabled=True, mode="AUTO"))
+
+            m.set_many(level=3, enabled=False)
+            self.assertEqual(
+                m.backend.messages, ["LEV?;ENAB?;MODE?", "LEV 3.0;ENAB OFF"]
+            )
+
+    def test_visa_deferred_writes(self):
+        with MockBatchedVISA("MOCK::INSTR") as m:
+            with m.deferred_writes():
+                m.level = 1
+                m.enabled = True
+                m.level = 2
+                self.assertEqual(m.backend.messages, [])
+            self.assertEqual(m.backend.messages, ["ENAB ON;LEV 2.0"])
+
+            # queries flush pending writes to keep their order
+            m.backend.messages = []
+            with m.deferred_writes(opc=True):
+                m.mode = "MAN"
+                m.level
+                m.level = 4
+            self.assertEqual(
+                m.backend.messages, ["MODE MAN", "LEV?", "LEV 4.0;*OPC", "*OPC?"]
+            )
+
+            # discarded writes do not leave unsent values in the cache
+            m.backend.messages = []
+            with self.assertRaises(ZeroDivisionError):
+                with m.deferred_writes():
+                    m.power = 7
+                    1 / 0
+            self.assertEqual(m.backend.messages, [])
+            self.assertEqual(m.power, 0.0)
+            self.assertEqual(m.backend.messages, ["POW?"])
+
+
 class TestReturner(unittest.TestCase):
     def test_returner_type(self):
         with MockReturner() as m:
@@ -26,6 +26,8 @@
 
 import unittest
 import importlib
+import os
+import tempfile
 import sys
 import pandas as pd
 import numpy as np
@@ -203,6 +205,276 @@ class TestValueTraits(unittest.TestCase):
             self.assertEqual(m.float0, 7.0)
         self.assertEqual(UpdateTrialDevice.float1, 63.0)
 
+    def test_parameter_change(self):
+        class ChangeDevice(lb.Device):
+            value = lb.value.int(3, allow_none=True)
+
+        with ChangeDevice() as m:
+            m.value = None
+            self.assertIsNone(m.value)
+
+            ChangeDevice.value.allow_none = False
+            with self.assertRaises(ValueError):
+                m.value = None
+
+    def test_observe_filters(self):
+        with TrialDevice() as m:
+            msgs = {"all": [], "int0": [], "set": []}
+
+            lb.observe(m, msgs["all"].append)
+            lb.observe(m, msgs["int0"].append, name="int0")
+            lb.observe(m, msgs["set"].append, name=["int0", "float0"], type_="set")
+
+            m.int0 = 5
+            m.float1 = 3
+
+            self.assertEqual([msg["name"] for msg in msgs["all"]], ["int0", "float1"])
+            self.assertEqual([msg["type"] for msg in msgs["int0"]], ["set"])
+            self.assertEqual([msg["name"] for msg in msgs["set"]], ["int0"])
+
+            msg = msgs["int0"][0]
+            self.assertIs(msg, msgs["all"][0])
+            self.assertEqual(dict(msg)["new"], 5)
+            with self.assertRaises(AttributeError):
+                msg.new = 6
+
+            for handler_list in msgs.values():
+                lb.unobserve(m, handler_list.append)
+            m.int0 = 6
+            self.assertEqual(len(msgs["all"]), 2)
+
+    def test_memoized_bounds(self):
+        class OffsetDevice(lb.Device):
+            level = lb.value.float(0.0, min=-10, max=10)
+            offset = lb.property.float(key="OFFS")
+            corrected = level + offset
+
+            queries = 0
+
+            def get_key(self, key, trait_name=None):
+                self.queries += 1
+                return self.remote_offset
+
+            def set_key(self, key, value, trait_name=None):
+                self.remote_offset = value
+
+        with OffsetDevice() as m:
+            m.remote_offset = 1.0
+            self.assertEqual(lb._device.trait_info(m, "corrected")["max"], 11)
+            queries = m.queries
+
+            # the bounds are reused without querying the offset
+            self.assertEqual(lb._device.trait_info(m, "corrected")["min"], -9)
+            self.assertEqual(m.queries, queries)
+
+            # a change in the offset invalidates them
+            m.offset = 3.0
+            self.assertEqual(lb._device.trait_info(m, "corrected")["max"], 13)
+
+    def test_debug_notifications(self):
+        class KeyDevice(lb.Device):
+            level = lb.property.float(key="LEVEL")
+
+            def get_key(self, key, trait_name=None):
+                return 1.0
+
+        built = []
+
+        class CountingMessage(lb._traits.TraitMessage):
+            __slots__ = ()
+
+            def __init__(self, *args):
+                built.append(args)
+                super().__init__(*args)
+
+        base_logger = lb.util.logger.logger
+        level = base_logger.level
+        TraitMessage = lb._traits.TraitMessage
+        lb._traits.TraitMessage = CountingMessage
+        try:
+            # with DEBUG off, the device's debug log handler is skipped
+            base_logger.setLevel("INFO")
+            with KeyDevice() as m:
+                m.level
+                self.assertEqual(built, [])
+
+                base_logger.setLevel("DEBUG")
+                m.level
+                self.assertEqual(len(built), 1)
+        finally:
+            lb._traits.TraitMessage = TraitMessage
+            base_logger.setLevel(level)
+
+
+class TestCalibration(unittest.TestCase):
+    def test_lookup_interpolation(self):
+        x = np.array([0.0, 1, 2, 3, 4, 6])
+        y = np.sin(x)
+
+        nearest = lb._traits.CalibrationLookup(x, y, "nearest")
+        self.assertEqual(nearest(0.4), y[0])
+        self.assertEqual(nearest(0.5), y[1])
+        self.assertEqual(nearest(100), y[-1])
+
+        linear = lb._traits.CalibrationLookup(x, y, "linear")
+        self.assertAlmostEqual(linear(2.5), (y[2] + y[3]) / 2)
+
+        cubic = lb._traits.CalibrationLookup(x, y, "cubic")
+        np.testing.assert_allclose(cubic(x), y)
+
+        # arrays are looked up element-wise, and match the scalar lookups
+        trace = np.array([-1, 0.4, 2.5, 5.9, np.nan])
+        for lookup in nearest, linear, cubic:
+            np.testing.assert_allclose(
+                lookup(trace), [lookup(v) for v in trace], equal_nan=True
+            )
+
+        with self.assertRaises(ValueError):
+            lb._traits.CalibrationLookup(x, y, "quadratic")
+
+    def test_calibrate_from_table(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cal.csv")
+            table = pd.DataFrame(
+                {"frequency": [3e9, 1e9, 2e9], "0": [0.5, 0.1, 0.3], "10": [10.5, 10.1, 10.3]}
+            )
+            table.to_csv(path, index=False)
+
+            class CalibratedDevice(lb.Device):
+                cal_path = lb.value.str(path)
+                frequency = lb.value.float(1e9, min=0, max=10e9)
+                atten = lb.value.float(0.0, min=0, max=10)
+                atten_cal = atten.calibrate_from_table(
+                    cal_path, frequency, table_index_column="frequency"
+                )
+
+            with CalibratedDevice() as m:
+                m.frequency = 2.2e9
+                self.assertEqual(m.atten_cal, 0.3)
+
+                m.atten_cal = 10.4
+                self.assertEqual(m.atten, 10)
+
+                m.frequency = 2.9e9
+                self.assertEqual(m.atten_cal, 10.5)
+
+                trait = m._traits["atten_cal"]
+                np.testing.assert_allclose(
+                    trait.lookup_cal(np.array([0.0, 10.0]), m), [0.5, 10.5]
+                )
+
+    def test_calibration_clip_warning(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cal.csv")
+            table = pd.DataFrame({"frequency": [1e9, 2e9], "0": [0.1, 0.2], "5": [5.1, 5.2]})
+            table.to_csv(path, index=False)
+
+            class ClippedDevice(lb.Device):
+                cal_path = lb.value.str(path)
+                frequency = lb.value.float(1e9, min=0, max=10e9)
+                atten = lb.value.float(8.0, min=0, max=10)
+                atten_cal = atten.calibrate_from_table(
+                    cal_path, frequency, table_index_column="frequency"
+                )
+
+            with ClippedDevice() as m1, ClippedDevice() as m2:
+                with self.assertLogs(lb.util.logger.logger, "WARNING") as logs:
+                    # only the first clipped lookup in each owner is logged
+                    for frequency in (1e9, 2e9, 1e9):
+                        m1.frequency = frequency
+                        m1.atten_cal
+                    m1._traits["atten_cal"].lookup_cal(np.array([-1.0, 8.0]), m1)
+                    self.assertEqual(m2.atten_cal, 5.1)
+
+                self.assertEqual(len(logs.records), 2)
+                self.assertIn("clipped", logs.output[0])
+
+    def test_calibration_table_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cal.csv")
+            table = pd.DataFrame({"frequency": [1e9, 2e9], "0": [0.1, 0.2]})
+            table.to_csv(path, index=False)
+
+            class CachedCalDevice(lb.Device):
+                cal_path = lb.value.str(path)
+                frequency = lb.value.float(1e9, min=0, max=10e9)
+                atten = lb.value.float(0.0, min=0, max=10)
+                atten_cal = atten.calibrate_from_table(
+                    cal_path, frequency, table_index_column="frequency", binary_cache=True
+                )
+
+            lb._traits.calibration_tables.clear()
+
+            with CachedCalDevice() as m1, CachedCalDevice() as m2:
+                self.assertEqual(m1.atten_cal, 0.1)
+                self.assertEqual(m2.atten_cal, 0.1)
+                self.assertIs(
+                    m1._calibrations["atten_cal"]["table"],
+                    m2._calibrations["atten_cal"]["table"],
+                )
+                self.assertTrue(os.path.exists(path + ".frequency.npy"))
+
+            # a modified file is loaded again
+            table["0"] = [0.3, 0.4]
+            table.to_csv(path, index=False)
+            os.utime(path, ns=(0, os.stat(path + ".frequency.npy").st_mtime_ns + 1))
+            with CachedCalDevice() as m:
+                self.assertEqual(m.atten_cal, 0.3)
+
+            # from the memory-mapped binary copy
+            lb._traits.calibration_tables.clear()
+            with CachedCalDevice() as m:
+                self.assertEqual(m.atten_cal, 0.3)
+
+    def test_calibrated_datareturn(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cal.csv")
+            table = pd.DataFrame(
+                {"frequency": [1e9, 2e9, 3e9], "0": [0.5, 0.1, 0.3], "10": [10.5, 10.1, 10.3]}
+            )
+            table.to_csv(path, index=False)
+
+            class TraceDevice(lb.Device):
+                cal_path = lb.value.str(path)
+                frequency = lb.value.float(1e9, min=0, max=10e9)
+                level = lb.value.float(0.0, min=0, max=10)
+                level_cal = level.calibrate_from_table(
+                    cal_path, frequency, table_index_column="frequency", interpolation="linear"
+                )
+                trace_frequencies = lb.value.ndarray(np.array([1e9, 2e9, 2.9e9]))
+
+                @lb.datareturn.ndarray(
+                    calibration=level_cal, calibration_axis="trace_frequencies"
+                )
+                def fetch_trace(self):
+                    return np.array([0, 5, 10.0])
+
+                @lb.datareturn.Series(calibration=level_cal)
+                def fetch_series(self):
+                    return pd.Series([0, 5, 10.0], index=[1e9, 2e9, 2.9e9], name="power")
+
+                @lb.datareturn.Series(calibration=level_cal)
+                def fetch_gapped_series(self):
+                    return pd.Series([0, 5, 10.0], index=[1e9, np.nan, 2.9e9])
+
+            with TraceDevice() as m:
+                np.testing.assert_allclose(m.fetch_trace(), [0.5, 5.1, 10.3])
+
+                series = m.fetch_series()
+                np.testing.assert_allclose(series.values, [0.5, 5.1, 10.3])
+                self.assertEqual(series.name, "power")
+
+                # trace points without a frequency are not calibrated
+                series = m.fetch_gapped_series()
+                np.testing.assert_allclose(series.values, [0.5, np.nan, 10.3])
+
+        with self.assertRaises(TypeError):
+
+            class BadTraceDevice(lb.Device):
+                @lb.datareturn.ndarray(calibration=lb.value.float(1.0))
+                def fetch_trace(self):
+                    pass
+
 
 if __name__ == "__main__":
     lb.show_messages("debug")